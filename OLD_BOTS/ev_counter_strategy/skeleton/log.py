@@ -0,0 +1,34 @@
+'''
+Leveled logging for pokerbots, called like print. Disabled levels are bound to a function which does nothing,
+so a disabled call costs one attribute lookup and an empty call, and its arguments are never formatted.
+Guard work that only feeds the log with log.level, as in "if log.level <= DEBUG:".
+'''
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+
+def ignore(*args, **kwargs):
+    pass
+
+
+class Logger():
+    '''
+    Prints messages at or above its level to sys.stdout.
+    '''
+
+    def __init__(self, level=WARNING):
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = level
+        self.debug = print if level <= DEBUG else ignore
+        self.info = print if level <= INFO else ignore
+        self.warning = print if level <= WARNING else ignore
+        self.error = print if level <= ERROR else ignore
+
+
+# the pokerbot's logger, WARNING and above by default
+log = Logger()
@@ -6,14 +6,12 @@ from skeleton.states import GameState, TerminalState, RoundState, BoardState
 from skeleton.states import NUM_ROUNDS, STARTING_STACK, BIG_BLIND, SMALL_BLIND, NUM_BOARDS
 from skeleton.bot import Bot
 from skeleton.runner import parse_args, run_bot
+from skeleton.log import log, DEBUG, WARNING
 
 import eval7
 import random
 import time
 
-import sys
-import os
-
 
 class Player(Bot):
     '''
@@ -35,18 +33,9 @@ class Player(Bot):
         # better representation of our hole strengths (win probability!)
         self.hole_strengths = [0, 0, 0]
         self.sampling_duration_total = 0
-        self.blockPrint()
+        log.set_level(WARNING)
         # random.seed(10)
 
-    # Disable
-
-    def blockPrint(self):
-        sys.stdout = open(os.devnull, 'w')
-
-    # Restore
-    def enablePrint(self):
-        sys.stdout = sys.__stdout__
-
     def allocate_cards(self, my_cards):
         '''
         Method that allocates our cards at the beginning of a round. Method
@@ -58,8 +47,8 @@ class Player(Bot):
         my_cards: a list of the 6 cards given to us at round start
         '''
 
-        print("Allocating cards")
-        print()
+        log.debug("Allocating cards")
+        log.debug()
 
         ranks = {}
 
@@ -209,8 +198,8 @@ class Player(Bot):
         Returns:
         Nothing.
         '''
-        print("New round!")
-        print()
+        log.debug("New round!")
+        log.debug()
         # the total number of chips you've gained or lost from the beginning of the game to the start of this round
         my_bankroll = game_state.bankroll
         opp_bankroll = game_state.opp_bankroll  # ^but for your opponent
@@ -242,8 +231,8 @@ class Player(Bot):
         Returns:
         Nothing.
         '''
-        print("Round over!")
-        print()
+        log.debug("Round over!")
+        log.debug()
         # your bankroll change from this round
         my_delta = terminal_state.deltas[active]
         # your opponent's bankroll change from this round
@@ -251,39 +240,40 @@ class Player(Bot):
         previous_state = terminal_state.previous_state  # RoundState before payoffs
         street = previous_state.street  # 0, 3, 4, or 5 representing when this round ended
         i = 1
-        for terminal_board_state in previous_state.board_states:
-            print("Board", i)
-            previous_board_state = terminal_board_state.previous_state
-            my_cards = previous_board_state.hands[active]  # your cards
-            # opponent's cards or [] if not revealed
-            opp_cards = previous_board_state.hands[1-active]
-            community_cards = previous_board_state.deck
-            my_cards = [card for card in my_cards if card]
-            opp_cards = [card for card in opp_cards if card]
-            community_cards = [card for card in community_cards if card]
-            print("My cards are", my_cards)
-            print("Opp cards are", opp_cards)
-            print("Comm cards are", community_cards)
-            if not opp_cards:
-                print("Opp folded, so I win", previous_board_state.pot)
-            # how do i know if i folded
-            else:
-                print("Did I fold? Assuming not:")
-                my_cards = [eval7.Card(card) for card in my_cards if card]
-                opp_cards = [eval7.Card(card) for card in opp_cards if card]
-                community_cards = [eval7.Card(card)
-                                   for card in community_cards if card]
-
-                my_hand = eval7.evaluate(my_cards + community_cards)
-                opp_hand = eval7.evaluate(opp_cards + community_cards)
-
-                if my_hand > opp_hand:
-                    print("I win", previous_board_state.pot)
-                elif opp_hand > my_hand:
-                    print("Opp wins", previous_board_state.pot)
+        if log.level <= DEBUG:  # the walk over the boards, showdown evaluations included, only feeds the debug output
+            for terminal_board_state in previous_state.board_states:
+                log.debug("Board", i)
+                previous_board_state = terminal_board_state.previous_state
+                my_cards = previous_board_state.hands[active]  # your cards
+                # opponent's cards or [] if not revealed
+                opp_cards = previous_board_state.hands[1-active]
+                community_cards = previous_board_state.deck
+                my_cards = [card for card in my_cards if card]
+                opp_cards = [card for card in opp_cards if card]
+                community_cards = [card for card in community_cards if card]
+                log.debug("My cards are", my_cards)
+                log.debug("Opp cards are", opp_cards)
+                log.debug("Comm cards are", community_cards)
+                if not opp_cards:
+                    log.debug("Opp folded, so I win", previous_board_state.pot)
+                # how do i know if i folded
                 else:
-                    print("Tie")
-            i += 1
+                    log.debug("Did I fold? Assuming not:")
+                    my_cards = [eval7.Card(card) for card in my_cards if card]
+                    opp_cards = [eval7.Card(card) for card in opp_cards if card]
+                    community_cards = [eval7.Card(card)
+                                       for card in community_cards if card]
+
+                    my_hand = eval7.evaluate(my_cards + community_cards)
+                    opp_hand = eval7.evaluate(opp_cards + community_cards)
+
+                    if my_hand > opp_hand:
+                        log.debug("I win", previous_board_state.pot)
+                    elif opp_hand > my_hand:
+                        log.debug("Opp wins", previous_board_state.pot)
+                    else:
+                        log.debug("Tie")
+                i += 1
 
         # reset our variables at the end of every round!
         self.board_allocations = [[], [], []]
@@ -295,8 +285,8 @@ class Player(Bot):
         round_num = game_state.round_num
 
         if round_num == NUM_ROUNDS:
-            print("Time remaining after all rounds:", game_clock)
-            print("Total sampling duration:", self.sampling_duration_total)
+            log.info("Time remaining after all rounds:", game_clock)
+            log.info("Total sampling duration:", self.sampling_duration_total)
 
     def get_actions(self, game_state, round_state, active):
         '''
@@ -312,8 +302,8 @@ class Player(Bot):
         Your actions.
         '''
 
-        print("get_actions called")
-        print()
+        log.debug("get_actions called")
+        log.debug()
         # the actions you are allowed to take
         legal_actions = round_state.legal_actions()
         # 0, 3, 4, or 5 representing pre-flop, flop, turn, or river respectively
@@ -334,8 +324,8 @@ class Player(Bot):
         # the number of chips your opponent has remaining
         opp_stack = round_state.stacks[1-active]
         stacks = [my_stack, opp_stack]
-        print("Before choosing board actions, my stack is", my_stack)
-        print()
+        log.debug("Before choosing board actions, my stack is", my_stack)
+        log.debug()
         # max raise across 3 boards
         net_upper_raise_bound = round_state.raise_bounds()[1]
         net_cost = 0  # keep track of the net additional amount you are spending across boards this round
@@ -346,50 +336,50 @@ class Player(Bot):
         order = [i[0]
                  for i in sorted(enumerate(strengths), key=lambda x:-x[1])]
         for i in order:
-            print("Currently solving board", i+1)
+            log.debug("Currently solving board", i+1)
             if isinstance(round_state.board_states[i], TerminalState):
-                print("This board is Terminal.")
-                print("!!!!")
+                log.debug("This board is Terminal.")
+                log.debug("!!!!")
             elif round_state.board_states[i].settled:
-                print("This board is settled, can only check.")
-                print("!!!!")
+                log.debug("This board is settled, can only check.")
+                log.debug("!!!!")
 
             hole_cards = self.board_allocations[i]
-            print("Hole cards on this board are", hole_cards)
-            print("Visible community cards are", [
-                  card for card in board_cards[i] if card])
+            log.debug("Hole cards on this board are", hole_cards)
+            if log.level <= DEBUG:
+                log.debug("Visible community cards are", [card for card in board_cards[i] if card])
 
             if AssignAction in legal_actions[i]:
-                print("Assigning preferred hole cards")
+                log.debug("Assigning preferred hole cards")
                 my_actions[i] = AssignAction(hole_cards)  # add to our actions
 
             # make sure the game isn't over at this board
             elif isinstance(round_state.board_states[i], TerminalState):
-                print("At a terminal state")
+                log.debug("At a terminal state")
                 my_actions[i] = CheckAction()  # check if it is
 
             # round of active play
             else:  # do we add more resources?
-                print("Round of active play")
-                print("Our stack has", my_stack - net_cost)
+                log.debug("Round of active play")
+                log.debug("Our stack has", my_stack - net_cost)
                 # we need to pay this to keep playing
                 board_cont_cost = continue_cost[i]
                 # amount before we started betting
                 board_total = round_state.board_states[i].pot
                 # total money in the pot right now
                 pot_total = my_pips[i] + opp_pips[i] + board_total
-                print("Old pot has", round_state.board_states[i].pot,
-                      ", my pips are", my_pips[i], ", opponent pips are", opp_pips[i])
-                print("Pot total is", pot_total)
-                print("Continue cost is", board_cont_cost)
+                log.debug("Old pot has", round_state.board_states[i].pot,
+                          ", my pips are", my_pips[i], ", opponent pips are", opp_pips[i])
+                log.debug("Pot total is", pot_total)
+                log.debug("Continue cost is", board_cont_cost)
                 min_raise, max_raise = round_state.board_states[i].raise_bounds(
                     active, round_state.stacks)
-                print("Min raise is", min_raise, ", max raise is", max_raise)
+                log.debug("Min raise is", min_raise, ", max raise is", max_raise)
                 # strength = self.hole_strengths[i]
                 visible_community_cards = [
                     card for card in board_cards[i] if card]
                 strength = strengths[i]
-                print("Calculated strength of hole cards and board is", strength)
+                log.debug("Calculated strength of hole cards and board is", strength)
 
                 # raise_amount = my_stack - net_cost
 
@@ -397,56 +387,56 @@ class Player(Bot):
                     # play a little conservatively pre-flop
                     raise_amount = int(
                         my_pips[i] + board_cont_cost + 0.4 * (pot_total + board_cont_cost))
-                    print("Desired pre-flop raise amount is", raise_amount)
+                    log.debug("Desired pre-flop raise amount is", raise_amount)
                 else:
                     # raise the stakes deeper into the game
                     raise_amount = int(
                         my_pips[i] + board_cont_cost + 0.75 * (pot_total + board_cont_cost))
-                    print("Desired post-flop raise amount is", raise_amount)
+                    log.debug("Desired post-flop raise amount is", raise_amount)
 
                 # make sure we have a valid raise
                 raise_amount = max([min_raise, raise_amount])
                 raise_amount = min([max_raise, raise_amount])
 
-                print(
+                log.debug(
                     "After bounding raise_amount, desired raise amount is", raise_amount)
 
                 # how much it costs to make that raise
                 raise_cost = raise_amount - my_pips[i]
 
-                print("This raise will cost", raise_cost)
+                log.debug("This raise will cost", raise_cost)
 
-                print()
-                print("Picking commit action now")
+                log.debug()
+                log.debug("Picking commit action now")
                 # raise if we can and if we can afford it
                 if RaiseAction in legal_actions[i] and (raise_cost <= my_stack - net_cost):
-                    print("Commit action is Raise because we can afford the full desired raise, raising to",
-                          raise_amount, ", costing", raise_cost)
+                    log.debug("Commit action is Raise because we can afford the full desired raise, raising to",
+                              raise_amount, ", costing", raise_cost)
                     commit_action = RaiseAction(raise_amount)
                     commit_cost = raise_cost
 
                 # call if we can afford it!:
                 elif CallAction in legal_actions[i] and (board_cont_cost <= my_stack - net_cost):
-                    print(
+                    log.debug(
                         "Commit action is Call, can't afford full raise, paying", board_cont_cost)
                     commit_action = CallAction()
                     commit_cost = board_cont_cost  # the cost to call is board_cont_cost
 
                 elif CheckAction in legal_actions[i]:  # try to check if we can
-                    print("Commit action is Check")
+                    log.debug("Commit action is Check")
                     commit_action = CheckAction()
                     commit_cost = 0
 
                 else:  # we have to fold
-                    print("Commit action is Fold")
+                    log.debug("Commit action is Fold")
                     commit_action = FoldAction()
                     commit_cost = 0
 
-                print("Done picking commit action")
-                print()
+                log.debug("Done picking commit action")
+                log.debug()
 
                 if board_cont_cost > 0:  # our opp raised!!! we must respond
-                    print(
+                    log.debug(
                         "Opponent has raised. We must respond. Continue cost is", board_cont_cost)
                     # if board_cont_cost > 5: #<--- parameters to tweak.
                     #     print("Continue cost > 5 so we are intimidated.")
@@ -455,16 +445,16 @@ class Player(Bot):
                     #     print("New strength is", strength)
 
                     pot_odds = board_cont_cost / (pot_total + board_cont_cost)
-                    print("Pot odds are", pot_odds)
-                    print("Strength is", strength)
+                    log.debug("Pot odds are", pot_odds)
+                    log.debug("Strength is", strength)
 
                     if strength >= pot_odds:  # Positive Expected Value!! at least call!!
-                        print("Positive EV because strength >= pot odds")
+                        log.debug("Positive EV because strength >= pot odds")
 
                         if strength > 0.9:  # raise sometimes, more likely if our hand is strong
-                            print(
+                            log.debug(
                                 "High strength, so we then CommitAction with probability strength, costing", commit_cost)
-                            print("CommitActioning")
+                            log.debug("CommitActioning")
                             my_actions[i] = commit_action
                             net_cost += commit_cost
                             continue
@@ -475,32 +465,32 @@ class Player(Bot):
                                 continue
 
                         else:  # try to call if we don't raise
-                            print(
+                            log.debug(
                                 "We'll just call because because not that high strength and outside of probability strength")
                             # we call because we can afford it and it's +EV
                             if (board_cont_cost <= my_stack - net_cost):
-                                print("Calling, costing", board_cont_cost)
+                                log.debug("Calling, costing", board_cont_cost)
                                 my_actions[i] = CallAction()
                                 net_cost += board_cont_cost
 
                             # we can't afford to call :(  should have managed our stack better
                             else:
-                                print("Wanted to call but can't, Folding")
+                                log.debug("Wanted to call but can't, Folding")
                                 my_actions[i] = FoldAction()
                                 net_cost += 0
 
                     else:  # Negative Expected Value!!! FOLD!!!
-                        print("Negative EV, so folding")
+                        log.debug("Negative EV, so folding")
                         my_actions[i] = FoldAction()
                         net_cost += 0
 
                 else:  # board_cont_cost == 0, we control the action
-                    print("We control the action.")
+                    log.debug("We control the action.")
 
                     if strength > 0.9:  # raise sometimes, more likely if our hand is strong
-                        print(
+                        log.debug(
                             "We CommitAction with probability strength, costing", commit_cost)
-                        print("CommitActioning")
+                        log.debug("CommitActioning")
                         my_actions[i] = commit_action
                         net_cost += commit_cost
                         continue
@@ -514,17 +504,17 @@ class Player(Bot):
                             continue
 
                     else:  # just check otherwise
-                        print("Outside probability strength, so just Checking")
+                        log.debug("Outside probability strength, so just Checking")
                         my_actions[i] = CheckAction()
                         net_cost += 0
 
-            print("Done with this board")
-            print()
+            log.debug("Done with this board")
+            log.debug()
 
-        print("At end of action, stack size is", my_stack - net_cost)
-        print("Done with this action")
-        print()
-        print()
+        log.debug("At end of action, stack size is", my_stack - net_cost)
+        log.debug("Done with this action")
+        log.debug()
+        log.debug()
 
         return my_actions
 
@@ -6,6 +6,7 @@ from skeleton.states import GameState, TerminalState, RoundState, BoardState
 from skeleton.states import NUM_ROUNDS, STARTING_STACK, BIG_BLIND, SMALL_BLIND, NUM_BOARDS
 from skeleton.bot import Bot
 from skeleton.runner import parse_args, run_bot
+from skeleton.log import log, DEBUG
 
 import eval7
 import random
@@ -13,9 +14,6 @@ import time
 import itertools
 import pandas as pd
 
-import sys
-import os
-
 
 class Game:
     def __init__(self):
@@ -62,8 +60,8 @@ class Player(Bot):
         # whether to randomize ordering of holes to avoid deterministic exploitation
         self.RANDOMIZATION_ON = False
 
-        self.enablePrint()
-        # self.blockPrint()
+        log.set_level(DEBUG)
+        # log.set_level(WARNING)
 
         # random.seed(10)
 
@@ -88,15 +86,6 @@ class Player(Bot):
 
         self.evs_descending = sorted(
             self.ev_to_eval7hands.keys(), reverse=True)
-    # Disable
-
-    def blockPrint(self):
-        sys.stdout = open(os.devnull, 'w')
-
-    # Restore
-    def enablePrint(self):
-        sys.stdout = sys.__stdout__
-
     # EVs https://www.tightpoker.com/poker_hands.html
     def hole_to_key(self, hole):
         '''
@@ -133,8 +122,8 @@ class Player(Bot):
         my_cards: a list of the 6 cards given to us at round start
         '''
 
-        print("Allocating cards")
-        print()
+        log.debug("Allocating cards")
+        log.debug()
 
         ranks = {}
 
@@ -183,9 +172,9 @@ class Player(Bot):
             cards = [allocation[2*i], allocation[2*i + 1]]
             self.board_allocations[i] = cards  # record our allocations
 
-        print("Calculating strength")
-        print("Calculating strength")
-        print("Calculating strength")
+        log.debug("Calculating strength")
+        log.debug("Calculating strength")
+        log.debug("Calculating strength")
 
         board_strengths = {}
 
@@ -310,8 +299,8 @@ class Player(Bot):
         Returns:
         Nothing.
         '''
-        print("New round!")
-        print()
+        log.debug("New round!")
+        log.debug()
         # the total number of chips you've gained or lost from the beginning of the game to the start of this round
         my_bankroll = game_state.bankroll
         opp_bankroll = game_state.opp_bankroll  # ^but for your opponent
@@ -338,8 +327,8 @@ class Player(Bot):
         Returns:
         Nothing.
         '''
-        print("Round over!")
-        print()
+        log.debug("Round over!")
+        log.debug()
         # your bankroll change from this round
         my_delta = terminal_state.deltas[active]
         # your opponent's bankroll change from this round
@@ -347,54 +336,55 @@ class Player(Bot):
         previous_state = terminal_state.previous_state  # RoundState before payoffs
         street = previous_state.street  # 0, 3, 4, or 5 representing when this round ended
         i = 1
-        print("My remaining stack is", previous_state.stacks[active])
-        print()
-
-        for terminal_board_state in previous_state.board_states:
-            print("Board", i)
-            previous_board_state = terminal_board_state.previous_state
-            my_cards = previous_board_state.hands[active]  # your cards
-            # opponent's cards or [] if not revealed
-            opp_cards = previous_board_state.hands[1-active]
-            community_cards = previous_board_state.deck
-            my_cards = [card for card in my_cards if card]
-            opp_cards = [card for card in opp_cards if card]
-            community_cards = [card for card in community_cards if card]
-            print("My cards are", my_cards)
-            print("Opp cards are", opp_cards)
-            print("Comm cards are", community_cards)
-
-            # someone folded before showdown
-            if not opp_cards or not my_cards:
-                if terminal_board_state.deltas[active] > terminal_board_state.deltas[1 - active]:
-                    print("Opponent folded, so I win on this board",
-                          terminal_board_state.deltas[active])
+        log.debug("My remaining stack is", previous_state.stacks[active])
+        log.debug()
+
+        if log.level <= DEBUG:  # the walk over the boards, showdown evaluations included, only feeds the debug output
+            for terminal_board_state in previous_state.board_states:
+                log.debug("Board", i)
+                previous_board_state = terminal_board_state.previous_state
+                my_cards = previous_board_state.hands[active]  # your cards
+                # opponent's cards or [] if not revealed
+                opp_cards = previous_board_state.hands[1-active]
+                community_cards = previous_board_state.deck
+                my_cards = [card for card in my_cards if card]
+                opp_cards = [card for card in opp_cards if card]
+                community_cards = [card for card in community_cards if card]
+                log.debug("My cards are", my_cards)
+                log.debug("Opp cards are", opp_cards)
+                log.debug("Comm cards are", community_cards)
+
+                # someone folded before showdown
+                if not opp_cards or not my_cards:
+                    if terminal_board_state.deltas[active] > terminal_board_state.deltas[1 - active]:
+                        log.debug("Opponent folded, so I win on this board",
+                                  terminal_board_state.deltas[active])
+                    else:
+                        log.debug("I folded, so I gain nothing on this board")
+                # showdown winner
                 else:
-                    print("I folded, so I gain nothing on this board")
-            # showdown winner
-            else:
-                my_cards = [eval7.Card(card) for card in my_cards if card]
-                opp_cards = [eval7.Card(card) for card in opp_cards if card]
-                community_cards = [eval7.Card(card)
-                                   for card in community_cards if card]
-
-                my_hand = eval7.evaluate(my_cards + community_cards)
-                opp_hand = eval7.evaluate(opp_cards + community_cards)
-
-                if my_hand > opp_hand:
-                    print("I win on this showdown board",
-                          previous_board_state.pot)
-                elif opp_hand > my_hand:
-                    print(
-                        "I lost on this showdown board, so I gain nothing on this showdown board")
-                else:
-                    print("Tie, so I gain on this showdown board",
-                          previous_board_state.pot // 2)
-            print()
-            i += 1
-
-        print("I win on this round total:", my_delta)
-        print()
+                    my_cards = [eval7.Card(card) for card in my_cards if card]
+                    opp_cards = [eval7.Card(card) for card in opp_cards if card]
+                    community_cards = [eval7.Card(card)
+                                       for card in community_cards if card]
+
+                    my_hand = eval7.evaluate(my_cards + community_cards)
+                    opp_hand = eval7.evaluate(opp_cards + community_cards)
+
+                    if my_hand > opp_hand:
+                        log.debug("I win on this showdown board",
+                                  previous_board_state.pot)
+                    elif opp_hand > my_hand:
+                        log.debug(
+                            "I lost on this showdown board, so I gain nothing on this showdown board")
+                    else:
+                        log.debug("Tie, so I gain on this showdown board",
+                                  previous_board_state.pot // 2)
+                log.debug()
+                i += 1
+
+        log.debug("I win on this round total:", my_delta)
+        log.debug()
 
         # reset our variables at the end of every round!
         self.board_allocations = [[], [], []]
@@ -406,8 +396,8 @@ class Player(Bot):
         round_num = game_state.round_num
 
         if round_num == NUM_ROUNDS:
-            print("Time remaining after all rounds:", game_clock)
-            print("Total sampling duration:", self.sampling_duration_total)
+            log.info("Time remaining after all rounds:", game_clock)
+            log.info("Total sampling duration:", self.sampling_duration_total)
 
     def get_actions(self, game_state, round_state, active):
         '''
@@ -423,8 +413,8 @@ class Player(Bot):
         Your actions.
         '''
 
-        print("*** get_actions called ***")
-        print()
+        log.debug("*** get_actions called ***")
+        log.debug()
         # the actions you are allowed to take
         legal_actions = round_state.legal_actions()
         # 0, 3, 4, or 5 representing pre-flop, flop, turn, or river respectively
@@ -445,78 +435,78 @@ class Player(Bot):
         # the number of chips your opponent has remaining
         opp_stack = round_state.stacks[1-active]
         stacks = [my_stack, opp_stack]
-        print("Before choosing board actions, my stack is", my_stack)
-        print()
+        log.debug("Before choosing board actions, my stack is", my_stack)
+        log.debug()
         # max raise across 3 boards
         net_upper_raise_bound = round_state.raise_bounds()[1]
         net_cost = 0  # keep track of the net additional amount you are spending across boards this round
 
         round = self.round
         if street != round.current_street:
-            print("New street")
+            log.debug("New street")
             # do stuff on new betting round? setup?
             round.current_street = street
 
         my_actions = [None] * NUM_BOARDS
         for i in range(NUM_BOARDS):
-            print("~ Currently solving board", i+1, " ~")
+            log.debug("~ Currently solving board", i+1, " ~")
             if isinstance(round_state.board_states[i], TerminalState):
-                print("This board is Terminal.")
-                print("!!!!")
+                log.debug("This board is Terminal.")
+                log.debug("!!!!")
             elif round_state.board_states[i].settled:
-                print("This board is settled, can only check.")
-                print("!!!!")
+                log.debug("This board is settled, can only check.")
+                log.debug("!!!!")
 
             board = round.boards[i+1]
 
             hole_cards = self.board_allocations[i]
 
             if AssignAction in legal_actions[i]:
-                print("Assigning preferred hole cards")
+                log.debug("Assigning preferred hole cards")
                 my_actions[i] = AssignAction(hole_cards)  # add to our actions
 
             # make sure the game isn't over at this board
             elif isinstance(round_state.board_states[i], TerminalState):
-                print("At a terminal state")
+                log.debug("At a terminal state")
                 my_actions[i] = CheckAction()  # check if it is
 
             # round of active play
             else:  # do we add more resources?
 
-                print("Hole cards on this board are", hole_cards)
-                print("Visible community cards are", [
-                      card for card in board_cards[i] if card])
-                print()
+                log.debug("Hole cards on this board are", hole_cards)
+                if log.level <= DEBUG:
+                    log.debug("Visible community cards are", [card for card in board_cards[i] if card])
+                log.debug()
                 visible_community_cards = [
                     card for card in board_cards[i] if card]
 
                 if board.strength_per_street[round.current_street]:
-                    print("Avoided recalculating")
+                    log.debug("Avoided recalculating")
                     strength = board.strength_per_street[round.current_street]
                 else:
-                    print("Calculating strength")
+                    log.debug("Calculating strength")
                     strength = self.calculate_strength(
                         self.board_allocations[i], my_cards, visible_community_cards, self._MONTE_CARLO_ITERS)
                     board.strength_per_street[round.current_street] = strength
 
-                print("Calculated strength of hole cards and board is", strength)
-                print()
+                log.debug("Calculated strength of hole cards and board is", strength)
+                log.debug()
 
-                print("Round of active play")
-                print("Our stack has", my_stack - net_cost)
+                log.debug("Round of active play")
+                log.debug("Our stack has", my_stack - net_cost)
                 # we need to pay this to keep playing
                 board_cont_cost = continue_cost[i]
                 # amount before we started betting
                 board_total = round_state.board_states[i].pot
                 # total money in the pot right now
                 pot_total = my_pips[i] + opp_pips[i] + board_total
-                print("Old pot has", round_state.board_states[i].pot,
-                      ", my pips are", my_pips[i], ", opponent pips are", opp_pips[i])
-                print("Pot total is", pot_total)
-                print("Continue cost is", board_cont_cost)
+                log.debug("Old pot has", round_state.board_states[i].pot,
+                          ", my pips are", my_pips[i], ", opponent pips are", opp_pips[i])
+                log.debug("Pot total is", pot_total)
+                log.debug("Continue cost is", board_cont_cost)
                 min_raise, max_raise = round_state.board_states[i].raise_bounds(
                     active, round_state.stacks)
-                print("Min raise is", min_raise, ", max raise is", max_raise)
+                log.debug("Min raise is", min_raise, ", max raise is", max_raise)
                 # strength = self.hole_strengths[i]
                 # print("Current street is", street)
 
@@ -524,56 +514,56 @@ class Player(Bot):
                     # play a little conservatively pre-flop
                     raise_amount = int(
                         my_pips[i] + board_cont_cost + 0.4 * (pot_total + board_cont_cost))
-                    print("Desired pre-flop raise amount is", raise_amount)
+                    log.debug("Desired pre-flop raise amount is", raise_amount)
                 else:
                     # raise the stakes deeper into the game
                     raise_amount = int(
                         my_pips[i] + board_cont_cost + 0.75 * (pot_total + board_cont_cost))
-                    print("Desired post-flop raise amount is", raise_amount)
+                    log.debug("Desired post-flop raise amount is", raise_amount)
 
                 # make sure we have a valid raise
                 raise_amount = max([min_raise, raise_amount])
                 raise_amount = min([max_raise, raise_amount])
 
-                print(
+                log.debug(
                     "After bounding raise_amount, desired raise amount is", raise_amount)
 
                 # how much it costs to make that raise
                 raise_cost = raise_amount - my_pips[i]
 
-                print("This raise will cost", raise_cost)
+                log.debug("This raise will cost", raise_cost)
 
-                print()
+                log.debug()
 
                 # raise if we can and if we can afford it
                 if RaiseAction in legal_actions[i] and (raise_cost <= my_stack - net_cost):
-                    print("Commit action is Raise because we can afford the full desired raise, raising to",
-                          raise_amount, ", costing", raise_cost)
+                    log.debug("Commit action is Raise because we can afford the full desired raise, raising to",
+                              raise_amount, ", costing", raise_cost)
                     commit_action = RaiseAction(raise_amount)
                     commit_cost = raise_cost
 
                 # call if we can afford it!:
                 elif CallAction in legal_actions[i] and (board_cont_cost <= my_stack - net_cost):
-                    print(
+                    log.debug(
                         "Commit action is Call, can't afford full raise, paying", board_cont_cost)
                     commit_action = CallAction()
                     commit_cost = board_cont_cost  # the cost to call is board_cont_cost
 
                 elif CheckAction in legal_actions[i]:  # try to check if we can
-                    print("Commit action is Check")
+                    log.debug("Commit action is Check")
                     commit_action = CheckAction()
                     commit_cost = 0
 
                 else:  # we have to fold
-                    print("Commit action is Fold")
+                    log.debug("Commit action is Fold")
                     commit_action = FoldAction()
                     commit_cost = 0
 
-                print()
+                log.debug()
 
-                print("###########")
+                log.debug("###########")
                 if board_cont_cost > 0:  # our opp raised!!! we must respond
-                    print(
+                    log.debug(
                         "Opponent has raised. We must respond. Continue cost is", board_cont_cost)
                     # if board_cont_cost > 5:  # <--- parameters to tweak.
                     #     print("Continue cost > 5 so we are intimidated.")
@@ -583,16 +573,16 @@ class Player(Bot):
                     #     print("New strength is", strength)
 
                     pot_odds = board_cont_cost / (pot_total + board_cont_cost)
-                    print("Pot odds are", pot_odds)
-                    print("Strength is", strength)
+                    log.debug("Pot odds are", pot_odds)
+                    log.debug("Strength is", strength)
 
                     if strength >= pot_odds:  # Positive Expected Value!! at least call!!
-                        print("Positive EV because strength >= pot odds")
+                        log.debug("Positive EV because strength >= pot odds")
 
                         if strength > 0.9:  # raise sometimes, more likely if our hand is strong
-                            print(
+                            log.debug(
                                 "High strength, so we then CommitAction with probability strength, costing", commit_cost)
-                            print("CommitActioning")
+                            log.debug("CommitActioning")
                             my_actions[i] = commit_action
                             net_cost += commit_cost
                             continue
@@ -603,32 +593,32 @@ class Player(Bot):
                                 continue
 
                         else:  # try to call if we don't raise
-                            print(
+                            log.debug(
                                 "We'll just call because because not that high strength and outside of probability strength")
                             # we call because we can afford it and it's +EV
                             if (board_cont_cost <= my_stack - net_cost):
-                                print("Calling, costing", board_cont_cost)
+                                log.debug("Calling, costing", board_cont_cost)
                                 my_actions[i] = CallAction()
                                 net_cost += board_cont_cost
 
                             # we can't afford to call :(  should have managed our stack better
                             else:
-                                print("Wanted to call but can't, Folding")
+                                log.debug("Wanted to call but can't, Folding")
                                 my_actions[i] = FoldAction()
                                 net_cost += 0
 
                     else:  # Negative Expected Value!!! FOLD!!!
-                        print("Negative EV, so folding")
+                        log.debug("Negative EV, so folding")
                         my_actions[i] = FoldAction()
                         net_cost += 0
 
                 else:  # board_cont_cost == 0, we control the action
-                    print("We control the action.")
+                    log.debug("We control the action.")
 
                     if strength > 0.9:  # raise sometimes, more likely if our hand is strong
-                        print(
+                        log.debug(
                             "We CommitAction with probability strength, costing", commit_cost)
-                        print("CommitActioning")
+                        log.debug("CommitActioning")
                         my_actions[i] = commit_action
                         net_cost += commit_cost
                         continue
@@ -646,19 +636,19 @@ class Player(Bot):
                                 continue
 
                     else:  # just check otherwise
-                        print("Outside probability strength, so just Checking")
+                        log.debug("Outside probability strength, so just Checking")
                         my_actions[i] = CheckAction()
                         net_cost += 0
-                print("###########")
+                log.debug("###########")
 
-            print()
-            print("Done with this board")
-            print()
+            log.debug()
+            log.debug("Done with this board")
+            log.debug()
 
-        print("At end of action, stack size is", my_stack - net_cost)
-        print("Done with this action")
-        print()
-        print()
+        log.debug("At end of action, stack size is", my_stack - net_cost)
+        log.debug("Done with this action")
+        log.debug()
+        log.debug()
 
         return my_actions
 
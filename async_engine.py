@@ -0,0 +1,384 @@
+'''
+Plays many games between the two pokerbots in config.py at once, multiplexed on one asyncio event loop.
+Every game runs its own pokerbot processes and writes its logs to its own directory, like engine_multi_games.py,
+but a single engine process drives all of them over non-blocking streams.
+'''
+from contextlib import redirect_stdout
+import asyncio
+import argparse
+import shutil
+import socket
+import time
+import sys
+import os
+
+sys.path.append(os.getcwd())
+import engine
+import zygote
+from engine import RoundState, TerminalState, BoundedWriter, FramedFile, STATUS, PROTOCOL_VERSION, DEFAULT_CONFIG
+from engine_multi_games import make_tasks, print_summary
+from config import *
+
+
+class AsyncZygoteChild():
+    '''
+    Stands in for the asyncio subprocess of a pokerbot forked by a zygote, with its output pipe read on the event loop.
+    '''
+
+    def __init__(self, child, stdout):
+        self.child = child
+        self.pid = child.pid
+        self.stdout = stdout
+
+    async def wait(self):
+        while self.child.poll() is None:
+            await asyncio.sleep(0.01)
+        return 0
+
+    def kill(self):
+        self.child.kill()
+
+
+class AsyncPlayer(engine.Player):
+    '''
+    Handles asyncio subprocess and stream interactions with one player's pokerbot.
+    Response times are measured on the event loop, so they include time spent driving other games,
+    which GAME_CLOCK_MODE 'cpu' leaves out of the game clock. A response times out once it has taken
+    the pokerbot's whole game clock left, in CPU time with GAME_CLOCK_MODE 'cpu'. Pokerbots are started and spoken to as TRANSPORT, FRAMING and ZYGOTE say.
+    '''
+
+    def __init__(self, name, path, log_dir, commands=None, config=DEFAULT_CONFIG):
+        super().__init__(name, path, config)
+        self.log_dir = log_dir
+        self.commands = commands
+        self.stream_reader = None
+        self.stream_writer = None
+
+    def open_log(self):
+        '''
+        Points the pokerbot's output at its log file in this game's directory.
+        '''
+        if self.output is None:
+            self.output = BoundedWriter(os.path.join(self.log_dir, self.name + '.txt'))
+
+    async def run(self):
+        '''
+        Runs the pokerbot and waits for it to connect.
+        '''
+        self.open_log()
+        if self.commands is None or len(self.commands['run']) == 0:
+            return
+        connected = asyncio.get_event_loop().create_future()
+        def on_connect(stream_reader, stream_writer):
+            if not connected.done():
+                connected.set_result((stream_reader, stream_writer))
+        server_socket = None
+        try:
+            server_socket, address = engine.open_server()
+            if server_socket.family == socket.AF_UNIX:
+                server = await asyncio.start_unix_server(on_connect, sock=server_socket)
+            else:
+                server = await asyncio.start_server(on_connect, sock=server_socket)
+            try:
+                self.bot_subprocess = await self.start_process(address)
+                self.reader = asyncio.ensure_future(self.stream_output(self.bot_subprocess.stdout))
+                self.stream_reader, self.stream_writer = await asyncio.wait_for(connected, CONNECT_TIMEOUT)
+            finally:
+                server.close()
+            await self.negotiate()
+        except (TypeError, ValueError):
+            print(self.name, 'run command misformatted')
+        except OSError:
+            print(self.name, 'run failed - check "run" in commands.json')
+        except asyncio.TimeoutError:
+            print('Timed out waiting for', self.name, 'to connect')
+            self.print_tail()
+        finally:
+            if server_socket is not None and server_socket.family == socket.AF_UNIX:
+                shutil.rmtree(os.path.dirname(address[1]), ignore_errors=True)
+
+    async def start_process(self, address):
+        '''
+        Starts the pokerbot, forking it from a zygote if ZYGOTE is set and it is a standard Python pokerbot.
+        '''
+        if ZYGOTE and zygote.can_fork(self.commands):
+            try:
+                # blocks the event loop only while the zygote forks, or while it starts on first use
+                child = zygote.spawn(self.path, self.commands, address, CONNECT_TIMEOUT)
+            except OSError as error:
+                print(self.name, str(error) + ', starting it directly')
+            else:
+                stdout = asyncio.StreamReader()
+                await asyncio.get_event_loop().connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stdout), child.stdout)
+                return AsyncZygoteChild(child, stdout)
+        return await asyncio.create_subprocess_exec(
+            *(self.commands['run'] + address), stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT, cwd=self.path)
+
+    async def stream_output(self, out):
+        '''
+        Copies the pokerbot's output to its log file as it arrives.
+        '''
+        while True:
+            output = await out.read(65536)
+            if not output:
+                break
+            self.output.write(output)
+
+    def write_message(self, message):
+        '''
+        Sends message, one or more newline-terminated lines, using FRAMING.
+        '''
+        if FRAMING == 'length':
+            frames = [line.encode() for line in message.splitlines()]
+            self.stream_writer.write(b''.join([FramedFile.HEADER.pack(len(frame)) + frame for frame in frames]))
+        else:
+            self.stream_writer.write(message.encode())
+
+    async def receive_line(self):
+        if FRAMING == 'length':
+            try:
+                header = await self.stream_reader.readexactly(FramedFile.HEADER.size)
+                line = await self.stream_reader.readexactly(FramedFile.HEADER.unpack(header)[0])
+            except asyncio.IncompleteReadError:
+                return ''
+        else:
+            line = await self.stream_reader.readline()
+        return line.decode().strip()
+
+    async def read_line(self, timeout):
+        '''
+        Returns the pokerbot's next message, raising asyncio.TimeoutError if it takes more than timeout seconds.
+        '''
+        return await asyncio.wait_for(self.receive_line(), timeout)
+
+    async def read_response(self, start_time, start_cpu_time):
+        '''
+        Returns the pokerbot's response, raising asyncio.TimeoutError once it has taken the pokerbot's whole game clock left.
+        With GAME_CLOCK_MODE 'cpu' that is counted in the CPU time the pokerbot used, like engine.Player.charge does,
+        so time spent driving other games is not held against it. A pokerbot using no CPU, e.g. a hung one,
+        is still given up on after CONNECT_TIMEOUT seconds, or its game clock left if that is longer.
+        '''
+        if start_cpu_time is None:
+            return await self.read_line(self.game_clock)
+        receive = asyncio.ensure_future(self.receive_line())
+        give_up_time = start_time + max(self.game_clock, CONNECT_TIMEOUT)
+        try:
+            while True:
+                now = time.perf_counter()
+                used = engine.cpu_elapsed(start_cpu_time, self.cpu_time())
+                if used is None:  # charged its response time instead
+                    used = now - start_time
+                # the pokerbot cannot use more CPU time than wall time on one thread, so this waits no longer than needed
+                timeout = min(self.game_clock - used, give_up_time - now)
+                if timeout <= 0.:
+                    raise asyncio.TimeoutError
+                done, _ = await asyncio.wait([receive], timeout=timeout)
+                if done:
+                    return receive.result()
+        finally:
+            receive.cancel()
+
+    async def negotiate(self):
+        '''
+        Agrees on a protocol version with the pokerbot, which older pokerbots answer with an ack.
+        '''
+        try:
+            self.write_message('V' + str(PROTOCOL_VERSION) + '\n')
+            await self.stream_writer.drain()
+            reply = await self.read_line(CONNECT_TIMEOUT)
+            self.protocol = int(reply[1:]) if reply.startswith('V') else 1
+        except asyncio.TimeoutError:
+            print('Timed out waiting for', self.name, 'to negotiate a protocol version')
+        except OSError:
+            print(self.name, 'disconnected while negotiating a protocol version')
+        except ValueError:
+            print(self.name, 'sent a misformatted protocol version')
+
+    async def stop(self):
+        '''
+        Closes the connection, stops the pokerbot and closes its log file.
+        '''
+        if self.stream_writer is not None:
+            try:
+                self.write_message('Q\n')
+                self.stream_writer.close()
+            except OSError:
+                print('Could not close socket connection with', self.name)
+        if self.bot_subprocess is not None:
+            try:
+                await asyncio.wait_for(self.bot_subprocess.wait(), CONNECT_TIMEOUT)
+            except asyncio.TimeoutError:
+                print('Timed out waiting for', self.name, 'to quit')
+                self.bot_subprocess.kill()
+                await self.bot_subprocess.wait()
+            try:
+                await asyncio.wait_for(self.reader, CONNECT_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+        if self.output is not None:
+            self.output.close()
+
+    async def query(self, round_state, player_message, game_log):
+        '''
+        Requests NUM_BOARDS actions from the pokerbot without blocking the other games.
+        '''
+        active = round_state.button % 2 if isinstance(round_state, RoundState) else None
+        if self.stream_writer is not None and self.game_clock > 0.:
+            clauses = ''
+            try:
+                player_message[0] = 'T{:.3f}'.format(self.game_clock)
+                message = ' '.join(player_message) + '\n'
+                del player_message[1:]  # do not send redundant action history
+                start_cpu_time = self.cpu_time()
+                start_time = time.perf_counter()
+                self.write_message(message)
+                await self.stream_writer.drain()
+                clauses = await self.read_response(start_time, start_cpu_time)
+                end_time = time.perf_counter()
+                cpu_seconds = engine.cpu_elapsed(start_cpu_time, self.cpu_time())
+                return self.parse_response(round_state, clauses, end_time - start_time, game_log, active, cpu_seconds)
+            except (socket.timeout, asyncio.TimeoutError):
+                error_message = self.name + ' ran out of time'
+                game_log.append(error_message)
+                print(error_message)
+                self.game_clock = 0.
+            except AssertionError:
+                error_message = self.name + ' did not submit ' + str(self.config.num_boards) + ' actions'
+                game_log.append(error_message)
+            except OSError:
+                error_message = self.name + ' disconnected'
+                game_log.append(error_message)
+                print(error_message)
+                self.print_tail()
+                self.game_clock = 0.
+            except (IndexError, KeyError, ValueError):
+                error_message = self.name + ' response misformatted: ' + str(clauses)
+                game_log.append(error_message)
+            except TypeError:
+                error_message = self.name + ' attempted an action after the round has ended'
+                game_log.append(error_message)
+        return self.default_actions(round_state)
+
+
+class AsyncGame(engine.Game):
+    '''
+    Runs one game of poker as a coroutine, with its logs in match_dir.
+    '''
+
+    def __init__(self, match_dir, seed=SEED, swap_seats=False, config=DEFAULT_CONFIG):
+        super().__init__(seed, swap_seats, os.path.join(match_dir, GAME_LOG_FILENAME), config)
+        self.match_dir = match_dir
+
+    async def run_round(self, players, round_num):
+        '''
+        Runs one round of poker, collecting both end-of-round acknowledgements at once.
+        '''
+        round_state = self.deal_round(players, round_num)
+        while not isinstance(round_state, TerminalState):
+            self.log_round_state(players, round_state)
+            active = round_state.button % 2
+            actions = self.forced_actions(round_state)
+            if actions is None:
+                actions = await players[active].query(round_state, self.player_messages[active], self.log)
+            round_state = self.proceed(players, round_state, actions)
+        self.log_terminal_state(players, round_state)
+        await asyncio.gather(*[player.query(round_state, player_message, self.log)
+                               for player, player_message in zip(players, self.player_messages) if self.needs_ack(player, round_num)])
+        self.settle_round(players, round_state)
+
+    async def run(self, commands):
+        '''
+        Starts both pokerbots, using the commands of their already built copies, and plays one game.
+        Returns each player's final bankroll, keyed by name.
+        '''
+        players = [
+            AsyncPlayer(PLAYER_1_NAME, os.path.abspath(PLAYER_1_PATH), self.match_dir, commands[0], self.config),
+            AsyncPlayer(PLAYER_2_NAME, os.path.abspath(PLAYER_2_PATH), self.match_dir, commands[1], self.config)
+        ]
+        await asyncio.gather(*[player.run() for player in players])
+        if self.swap_seats:  # the other player receives the first seat's cards
+            players = players[::-1]
+        self.open_logs()
+        try:
+            for round_num in range(self.first_round, self.first_round + self.config.num_rounds):
+                self.log_round_start(players, round_num)
+                await self.run_round(players, round_num)
+                players = players[::-1]
+            self.log.append('')
+            self.log.append('Final' + STATUS(players))
+            if GAME_CLOCK_MODE == 'cpu':
+                self.log_clocks(players)
+        finally:
+            self.close_logs()
+        await asyncio.gather(*[player.stop() for player in players])
+        if LOG_LATENCY:
+            self.write_latencies(players)
+        return {player.name: player.bankroll for player in players}
+
+
+async def run_games(tasks, concurrency, commands, progress):
+    '''
+    Plays every task's game, at most concurrency at a time, printing each result to progress as it finishes.
+    Returns the results and duplicate pairs.
+    '''
+    semaphore = asyncio.Semaphore(concurrency)
+    async def play_game(task):
+        _, match_dir, seed, swap_seats = task
+        async with semaphore:
+            os.makedirs(match_dir, exist_ok=True)
+            return task, await AsyncGame(match_dir, seed, swap_seats).run(commands)
+    results = []
+    pairs = {}
+    for game in asyncio.as_completed([play_game(task) for task in tasks]):
+        task, bankrolls = await game
+        results.append(bankrolls)
+        pairs.setdefault(task[0], []).append(bankrolls)
+        print('Game', os.path.basename(task[1])[5:], 'finished' + ''.join([engine.PVALUE(name, bankrolls[name]) for name in (PLAYER_1_NAME, PLAYER_2_NAME)]), file=progress)
+    return results, pairs
+
+
+def build_players(out_dir):
+    '''
+    Builds each pokerbot once for every game, writing the build output to out_dir. Returns their commands.
+    '''
+    commands = []
+    for name, path in [(PLAYER_1_NAME, PLAYER_1_PATH), (PLAYER_2_NAME, PLAYER_2_PATH)]:
+        player = AsyncPlayer(name, os.path.abspath(path), out_dir)
+        player.build()
+        player.output.close()
+        commands.append(player.commands)
+    return commands
+
+
+def run_async(game_num, concurrency, out_dir, seed=SEED, duplicate=False):
+    '''
+    Plays game_num games, or game_num duplicate pairs, with up to concurrency games at once and prints a summary of the results.
+    '''
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    commands = build_players(out_dir)
+    tasks = make_tasks(game_num, out_dir, seed, duplicate)
+    # the engine messages of all games share one file, since they run in one process
+    progress = sys.stdout
+    with open(os.path.join(out_dir, 'engine_output.txt'), 'w') as output, redirect_stdout(output):
+        results, pairs = asyncio.run(run_games(tasks, concurrency, commands, progress))
+    return print_summary(results, pairs, duplicate)
+
+
+def parse_args():
+    '''
+    Parses arguments controlling the number of games and how many run at once.
+    '''
+    parser = argparse.ArgumentParser(prog='python3 async_engine.py')
+    parser.add_argument('--games', type=int, default=10, help='Number of games to play, defaults to 10')
+    parser.add_argument('--concurrency', type=int, default=32, help='Number of games to run at once, defaults to 32')
+    parser.add_argument('--out-dir', type=str, default='matches', help='Directory holding one subdirectory per game, defaults to matches')
+    parser.add_argument('--seed', type=int, default=SEED, help='Base seed for reproducible deals, defaults to SEED in config.py')
+    parser.add_argument('--duplicate', action='store_true', help='Play every deal twice with the seats swapped and report the paired difference')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    run_async(args.games, args.concurrency, args.out_dir, args.seed, args.duplicate)
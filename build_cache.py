@@ -0,0 +1,110 @@
+'''
+Build cache used by the engine to skip rebuilding pokerbots whose sources have not changed.
+A build's artifacts are the files it creates or modifies in the bot directory. They are copied into the cache
+under a hash of the bot's sources and build command, and copied back instead of building again.
+Build output is told apart from sources by name alone, so the hash of a bot does not depend on what was built before.
+'''
+import hashlib
+import shutil
+import json
+import os
+
+SKIPPED_DIRECTORIES = {'.git', '__pycache__'}
+# files left out of the hash as build output, along with those listed under "artifacts" in the bot's commands.json
+ARTIFACT_DIRECTORIES = {'build', 'target'}
+ARTIFACT_SUFFIXES = ('.class', '.o', '.obj', '.a', '.so', '.dylib', '.dll', '.exe', '.rlib', '.pyc')
+
+
+def walk(path):
+    '''
+    Yields the path of every file in a bot directory relative to it, in a fixed order.
+    '''
+    for directory, directories, files in os.walk(path):
+        directories[:] = sorted(d for d in directories if d not in SKIPPED_DIRECTORIES)
+        for name in sorted(files):
+            yield os.path.relpath(os.path.join(directory, name), path)
+
+
+def snapshot(path):
+    '''
+    Returns the size and modification time of every file in a bot directory.
+    '''
+    result = {}
+    for name in walk(path):
+        stat = os.stat(os.path.join(path, name))
+        result[name] = (stat.st_size, stat.st_mtime_ns)
+    return result
+
+
+def is_artifact(name, declared=()):
+    '''
+    Returns whether a file, named relative to its bot directory, is build output: it is inside an ARTIFACT_DIRECTORIES
+    directory, ends with one of ARTIFACT_SUFFIXES, or is or is inside one of the declared paths.
+    '''
+    parts = name.split(os.sep)
+    if name.endswith(ARTIFACT_SUFFIXES) or not ARTIFACT_DIRECTORIES.isdisjoint(parts[:-1]):
+        return True
+    return any(parts[:len(declared_parts)] == declared_parts for declared_parts in
+               [os.path.normpath(declared_name).split(os.sep) for declared_name in declared])
+
+
+def source_hash(path, commands):
+    '''
+    Hashes the build command, the bot directory's location and every file in it which is not a build artifact.
+    The location is included because build systems such as CMake record absolute paths in their artifacts.
+    '''
+    digest = hashlib.sha256(json.dumps([commands['build'], os.path.abspath(path)]).encode())
+    hash_files(digest, path, commands.get('artifacts', ()))
+    return digest.hexdigest()
+
+
+def hash_files(digest, path, declared=()):
+    '''
+    Adds the name and contents of every file in a bot directory, other than build artifacts, to a hashlib digest.
+    '''
+    for name in walk(path):
+        if is_artifact(name, declared):
+            continue
+        digest.update(name.encode() + b'\0')
+        with open(os.path.join(path, name), 'rb') as source_file:
+            for chunk in iter(lambda: source_file.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+
+
+def restore(cache_dir, key, path):
+    '''
+    Copies the cached artifacts of key into the bot directory. Returns whether the cache held them.
+    '''
+    entry = os.path.join(cache_dir, key)
+    try:
+        with open(os.path.join(entry, 'manifest.json')) as manifest_file:
+            artifacts = json.load(manifest_file)
+    except (OSError, ValueError):
+        return False
+    for name in artifacts:
+        destination = os.path.join(path, name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy2(os.path.join(entry, 'files', name), destination)
+    return True
+
+
+def store(cache_dir, key, path, before):
+    '''
+    Copies the files which a build changed since the snapshot before into the cache under key.
+    '''
+    after = snapshot(path)
+    artifacts = sorted(name for name, stat in after.items() if before.get(name) != stat)
+    entry = os.path.join(cache_dir, key)
+    staging = entry + '.' + str(os.getpid())
+    for name in artifacts:
+        destination = os.path.join(staging, 'files', name)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copy2(os.path.join(path, name), destination)
+    os.makedirs(staging, exist_ok=True)
+    with open(os.path.join(staging, 'manifest.json'), 'w') as manifest_file:
+        json.dump(artifacts, manifest_file)
+    try:
+        os.rename(staging, entry)  # another engine process may have stored the same build first
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,141 @@
+'''
+Checks the Python skeleton's CompactRoundState against the engine's RoundState. Plays seeded random rounds
+through both, compares legal actions, raise bounds, stacks, pips, pots and payoffs after every action, then
+unmakes each round back to its deal and compares every earlier state again.
+'''
+import argparse
+import random
+import sys
+import os
+
+sys.path.append(os.getcwd())
+import engine
+import engine_benchmark
+from engine import BoardState, RoundState, TerminalState, FoldAction, CallAction, CheckAction, RaiseAction, AssignAction
+
+sys.path.insert(0, engine_benchmark.SKELETON_PATH)
+from skeleton import actions as compact_actions
+from skeleton.compact_states import CompactRoundState
+from skeleton.states import MatchConfig
+
+COMPACT_ACTIONS = {name: getattr(compact_actions, name) for name in ['FoldAction', 'CallAction', 'CheckAction', 'RaiseAction', 'AssignAction']}
+
+
+def deal(rng, config):
+    '''
+    Returns the engine's initial RoundState for a random deal, and the five cards of each board.
+    '''
+    deck = engine.eval7.Deck()
+    rng.shuffle(deck.cards)
+    hands = [deck.deal(2*config.num_boards), deck.deal(2*config.num_boards)]
+    decks = [engine.SmallDeck(deck) for i in range(config.num_boards)]
+    for board_deck in decks:
+        rng.shuffle(board_deck.cards)
+    stacks = [config.starting_stack - config.num_boards*config.small_blind, config.starting_stack - config.num_boards*config.big_blind]
+    board_states = [BoardState((i+1)*config.big_blind, [config.small_blind, config.big_blind], None, decks[i], None, config=config) for i in range(config.num_boards)]
+    return RoundState(-2, 0, stacks, hands, board_states, None, config), [board_deck.peek(5) for board_deck in decks]
+
+
+def random_actions(rng, round_state):
+    '''
+    Returns a random legal list of actions for the active player, favoring minimum raises and all-ins.
+    '''
+    active = round_state.button % 2
+    legal_actions = round_state.legal_actions()
+    if AssignAction in legal_actions[0]:
+        cards = list(round_state.hands[active])
+        rng.shuffle(cards)
+        return [AssignAction(cards[2*i:2*i+2]) for i in range(len(legal_actions))]
+    for attempt in range(5):
+        actions = []
+        contribution = opp_continue_cost = 0
+        for board_state, legal in zip(round_state.board_states, legal_actions):
+            action_type = rng.choice(sorted(legal, key=lambda action: action.__name__))
+            if action_type is RaiseAction:
+                min_raise, max_raise = board_state.raise_bounds(round_state.button, round_state.stacks)
+                amount = rng.choice([min_raise, max_raise, rng.randint(min_raise, max_raise)])
+                contribution += amount - board_state.pips[active]
+                opp_continue_cost += amount - board_state.pips[1-active]
+                actions.append(RaiseAction(amount))
+            else:
+                if action_type is CallAction:
+                    contribution += board_state.pips[1-active] - board_state.pips[active]
+                actions.append(action_type())
+        if contribution <= round_state.stacks[active] and opp_continue_cost <= round_state.stacks[1-active]:
+            return actions
+    return [CheckAction() if CheckAction in legal else FoldAction() for legal in legal_actions]
+
+
+def compare(round_state, compact):
+    '''
+    Raises AssertionError where the compact state disagrees with the engine's.
+    '''
+    if isinstance(round_state, TerminalState):
+        assert compact.is_terminal, 'compact round is not over'
+        assert compact.deltas == round_state.deltas, 'deltas {} != {}'.format(compact.deltas, round_state.deltas)
+        round_state = round_state.previous_state
+        for i, board_state in enumerate(round_state.board_states):
+            assert list(compact.winnings[2*i:2*i+2]) == board_state.deltas, 'winnings on board {}'.format(i+1)
+        return
+    assert not compact.is_terminal, 'compact round is over'
+    assert (compact.button, compact.street) == (round_state.button, round_state.street), 'button or street'
+    assert list(compact.stacks) == round_state.stacks, 'stacks {} != {}'.format(list(compact.stacks), round_state.stacks)
+    for i, board_state in enumerate(round_state.board_states):
+        if isinstance(board_state, TerminalState):
+            assert compact.folded[i], 'board {} not folded'.format(i+1)
+            assert list(compact.winnings[2*i:2*i+2]) == board_state.deltas, 'winnings on board {}'.format(i+1)
+            assert compact.pots[i] == board_state.previous_state.pot, 'pot on board {}'.format(i+1)
+            continue
+        assert not compact.folded[i], 'board {} folded'.format(i+1)
+        assert compact.pots[i] == board_state.pot, 'pot on board {}'.format(i+1)
+        assert list(compact.pips[2*i:2*i+2]) == list(board_state.pips), 'pips on board {}'.format(i+1)
+    legal_actions = round_state.legal_actions()
+    compact_legal_actions = compact.legal_actions()
+    for i, board_state in enumerate(round_state.board_states):
+        names = sorted(action.__name__ for action in legal_actions[i])
+        assert sorted(action.__name__ for action in compact_legal_actions[i]) == names, 'legal actions on board {}'.format(i+1)
+        if RaiseAction in legal_actions[i]:
+            bounds = board_state.raise_bounds(round_state.button, round_state.stacks)
+            assert compact.board_raise_bounds(i) == bounds, 'raise bounds on board {}'.format(i+1)
+
+
+def check_round(rng, config, compact_config):
+    '''
+    Plays one random round through both states. Returns the number of actions played.
+    '''
+    round_state, boards = deal(rng, config)
+    compact = CompactRoundState(boards, config=compact_config)
+    states = [round_state]
+    compare(round_state, compact)
+    while not isinstance(round_state, TerminalState):
+        actions = random_actions(rng, round_state)
+        round_state = round_state.proceed(actions)
+        compact.make([COMPACT_ACTIONS[type(action).__name__](*action) for action in actions])
+        compare(round_state, compact)
+        states.append(round_state)
+    for round_state in reversed(states[:-1]):
+        compact.unmake()
+        compare(round_state, compact)
+    return len(states) - 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python3 compact_states_check.py')
+    parser.add_argument('--rounds', type=int, default=20000, help='Number of random rounds to check, defaults to 20000')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the random rounds, defaults to 1')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    rng = random.Random(args.seed)
+    config = engine.DEFAULT_CONFIG
+    compact_config = MatchConfig(config.num_boards, config.num_rounds, config.starting_stack, config.big_blind, config.small_blind)
+    actions = 0
+    for round_num in range(args.rounds):
+        try:
+            actions += check_round(rng, config, compact_config)
+        except AssertionError as error:
+            print('Round {} of seed {}: {}'.format(round_num + 1, args.seed, error))
+            sys.exit(1)
+    print('{} rounds and {} actions: CompactRoundState matches RoundState'.format(args.rounds, actions))
@@ -7,14 +7,41 @@ PLAYER_2_NAME = 'Villain'
 PLAYER_2_PATH = './smarter_sim'
 # GAME PROGRESS IS RECORDED HERE
 GAME_LOG_FILENAME = 'game_log'
+# GAME_LOG_COMPRESSION MAY BE None, 'gzip' OR 'lzma'
+GAME_LOG_COMPRESSION = None
+# GAME_LOG_ROTATE NUMBERS EACH GAME'S LOGS GAME_LOG_FILENAME_1, GAME_LOG_FILENAME_2, ... INSTEAD OF OVERWRITING THE LAST GAME'S
+GAME_LOG_ROTATE = False
+# EVENT_JOURNAL ALSO RECORDS THE GAME AS FIXED SIZE BINARY EVENTS IN GAME_LOG_FILENAME.journal, SEE journal.py
+EVENT_JOURNAL = False
+# LOG_LATENCY ALSO RECORDS EVERY RESPONSE TIME IN GAME_LOG_FILENAME_latency.csv, WITH A SUMMARY
+LOG_LATENCY = False
 # PLAYER_LOG_SIZE_LIMIT IS IN BYTES
 # PLAYER_LOG_SIZE_LIMIT = 524288
 PLAYER_LOG_SIZE_LIMIT = 52428800
+# THE LAST PLAYER_LOG_TAIL_SIZE BYTES OF OUTPUT ARE KEPT IN MEMORY AND PRINTED IF A PLAYER FAILS
+PLAYER_LOG_TAIL_SIZE = 2048
 # STARTING_GAME_CLOCK AND TIMEOUTS ARE IN SECONDS_
 ENFORCE_GAME_CLOCK = True
+# GAME_CLOCK_MODE 'wall' CHARGES BOTS THEIR RESPONSE TIME, 'cpu' ONLY THE CPU TIME THEIR PROCESS USED WHILE THE ENGINE WAITED
+# 'cpu' NEEDS /proc AND KEEPS PARALLEL MATCHES FROM CHARGING BOTS FOR SCHEDULING DELAYS
+GAME_CLOCK_MODE = 'wall'
 STARTING_GAME_CLOCK = 30.
 BUILD_TIMEOUT = 10.
+# SET BUILD_CACHE_DIR TO A DIRECTORY TO SKIP BUILDS WHOSE SOURCES AND BUILD COMMAND ARE UNCHANGED, SEE build_cache.py
+BUILD_CACHE_DIR = None
 CONNECT_TIMEOUT = 10.
+# TRANSPORT MAY BE 'tcp' OR 'unix', AND FRAMING 'line' OR 'length' (4 BYTE LENGTH PREFIXES)
+# ONLY THE PYTHON SKELETON SUPPORTS 'unix' AND 'length', THE JAVA AND C++ SKELETONS NEED 'tcp' AND 'line'
+TRANSPORT = 'tcp'
+FRAMING = 'line'
+# ZYGOTE FORKS PYTHON BOTS FROM A PROCESS WHICH HAS ALREADY IMPORTED AND CONSTRUCTED THEIR PLAYER, ONE PER BOT DIRECTORY
+ZYGOTE = False
+# SET SEED TO REPRODUCE THE SAME DEALS IN EVERY GAME, OR None FOR FRESH DEALS
+SEED = None
+# HEADLESS RUNS PYTHON BOTS INSIDE THE ENGINE PROCESS, WITHOUT SUBPROCESSES OR SOCKETS
+HEADLESS = False
+# AUTO_ADVANCE SKIPS QUERYING A PLAYER WHO CAN ONLY CHECK ON EVERY BOARD, E.G. WHEN ALL-IN
+AUTO_ADVANCE = True
 # THE GAME VARIANT FIXES THE PARAMETERS BELOW
 # CHANGE ONLY FOR TRAINING OR EXPERIMENTATION
 NUM_BOARDS = 3
@@ -0,0 +1,125 @@
+'''
+Measures how long the Python skeleton's Runner takes to decode one engine message and rebuild its states.
+Engine traffic is recorded once from a seeded game between random pokerbots, then replayed into the Runner
+of a pokerbot which answers instantly, so nearly all of the time measured is decoding.
+'''
+import tempfile
+import argparse
+import shutil
+import json
+import time
+import sys
+import os
+
+sys.path.append(os.getcwd())
+import engine
+import engine_benchmark
+
+sys.path.insert(0, engine_benchmark.SKELETON_PATH)
+from skeleton.actions import CheckAction
+from skeleton.bot import Bot
+from skeleton.runner import Runner
+from skeleton.states import NUM_BOARDS
+
+
+class ReplayFile():
+    '''
+    Socket file which reads recorded messages and discards the replies.
+    '''
+
+    def __init__(self, lines):
+        self.lines = iter(lines)
+
+    def readline(self):
+        return next(self.lines, '')
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+class InstantBot(Bot):
+    def handle_new_round(self, game_state, round_state, active):
+        pass
+
+    def handle_round_over(self, game_state, terminal_state, active):
+        pass
+
+    def get_actions(self, game_state, round_state, active):
+        return [CheckAction()] * NUM_BOARDS
+
+
+def record(path, rounds, seed):
+    '''
+    Plays a seeded game between random pokerbots and saves every message the engine sent to each of them.
+    '''
+    directory = tempfile.mkdtemp(prefix='pokerbots')
+    working_directory = os.getcwd()
+    streams = []
+    open_socketfile = engine.open_socketfile
+    def recording_socketfile(client_socket):
+        socketfile = open_socketfile(client_socket)
+        stream = []
+        streams.append(stream)
+        write = socketfile.write
+        def write_and_record(message):
+            stream.append(message)
+            return write(message)
+        socketfile.write = write_and_record
+        return socketfile
+    try:
+        paths = engine_benchmark.make_bots(directory)
+        os.chdir(directory)
+        engine.open_socketfile = recording_socketfile
+        engine.PLAYER_1_PATH = engine.PLAYER_2_PATH = paths['random']
+        engine.HEADLESS = False
+        config = engine.DEFAULT_CONFIG._replace(num_rounds=rounds, starting_game_clock=1e6)
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                engine.Game(seed, log_filename=os.path.join(directory, 'game_log'), config=config).run()
+            finally:
+                sys.stdout = stdout
+    finally:
+        engine.open_socketfile = open_socketfile
+        os.chdir(working_directory)
+        shutil.rmtree(directory, ignore_errors=True)
+    with open(path, 'w') as traffic_file:
+        json.dump(streams, traffic_file)
+
+
+def replay(streams, repeats):
+    '''
+    Replays every recorded stream into a fresh Runner. Returns the fastest time per message in seconds, and the number of messages.
+    '''
+    messages = sum(len(stream) for stream in streams)
+    best = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        for stream in streams:
+            Runner(InstantBot(), ReplayFile(stream)).run()
+        seconds = time.perf_counter() - start_time
+        best = seconds if best is None else min(best, seconds)
+    return best / messages, messages
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python3 decoder_benchmark.py')
+    parser.add_argument('--traffic', type=str, default=None, help='JSON file of recorded engine messages, recorded first if it does not exist')
+    parser.add_argument('--rounds', type=int, default=1000, help='Number of rounds to record, defaults to 1000')
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the recorded game, defaults to 1')
+    parser.add_argument('--repeats', type=int, default=5, help='Number of replays, of which the fastest is reported, defaults to 5')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    traffic = args.traffic or os.path.join(tempfile.gettempdir(), 'pokerbots_traffic_{}_{}.json'.format(args.rounds, args.seed))
+    if not os.path.exists(traffic):
+        record(traffic, args.rounds, args.seed)
+    with open(traffic) as traffic_file:
+        streams = json.load(traffic_file)
+    seconds, messages = replay(streams, args.repeats)
+    print('{} messages from {}: {:.2f} us per message'.format(messages, traffic, 1e6 * seconds))
@@ -3,19 +3,28 @@
 DO NOT REMOVE, RENAME, OR EDIT THIS FILE
 '''
 from collections import namedtuple
-from threading import Thread
-from queue import Queue
+from threading import Thread, Lock
 import time
 import json
 import subprocess
 import socket
+import struct
+import tempfile
+import shutil
 import eval7
 import sys
 import os
 import random
+import importlib.util
+import traceback
+import gzip
+import lzma
 
 sys.path.append(os.getcwd())
 from config import *
+import journal
+import build_cache
+import zygote
 
 FoldAction = namedtuple('FoldAction', [])
 CallAction = namedtuple('CallAction', [])
@@ -26,15 +35,16 @@ AssignAction = namedtuple('AssignAction', ['cards'])
 TerminalState = namedtuple('TerminalState', ['deltas', 'previous_state'])
 
 STREET_NAMES = ['Flop', 'Turn', 'River']
+LATENCY_PHASES = ['Assign', 'Preflop'] + STREET_NAMES + ['Ack']
 DECODE = {'F': FoldAction, 'C': CallAction, 'K': CheckAction, 'R': RaiseAction, 'A': AssignAction}
+LOCAL_DECODE = {action.__name__: action for action in DECODE.values()}
+ENCODE = {action.__name__: code for code, action in DECODE.items()}
 CCARDS = lambda cards: ','.join(map(str, cards))
 PCARDS = lambda cards: '[{}]'.format(' '.join(map(str, cards)))
 PVALUE = lambda name, value: ', {} ({})'.format(name, value)
 STATUS = lambda players: ''.join([PVALUE(p.name, p.bankroll) for p in players])
 POTVAL = lambda value: ', ({})'.format(value)
 
-# random.seed(10)
-
 # Socket encoding scheme:
 #
 # T#.### the player's game clock
@@ -48,6 +58,8 @@ POTVAL = lambda value: ', ({})'.format(value)
 # #O**,** the opponent's hand in common format for each board
 # D###;D## the player's, followed by opponent's, bankroll delta from the round
 # Q game over
+# V# the highest protocol version the engine speaks, sent once on connecting
+# N a new game starts on the same connection (protocol version 2)
 #
 # Board clauses are separated by semicolons
 # Clauses are separated by spaces
@@ -55,6 +67,49 @@ POTVAL = lambda value: ', ({})'.format(value)
 # The engine expects a response of #K for each board at the end of the round as an ack,
 # otherwise a response which encodes the player's action
 # Action history is sent once, including the player's actions
+# Players reply to V# with V# for the version they will speak; older players just ack, meaning version 1
+# From protocol version 3, the #O and D clauses are sent with the next round's H clause instead of being acked,
+# except in the last round of the game
+
+PROTOCOL_VERSION = 3
+
+
+GAME_LOG_OPENERS = {None: (open, '.txt'), 'gzip': (gzip.open, '.txt.gz'), 'lzma': (lzma.open, '.txt.xz')}
+
+
+class GameLog():
+    '''
+    Streams game log lines to disk as they are produced, optionally compressed, so memory use stays constant.
+    '''
+
+    def __init__(self, filename, compression=None):
+        opener, extension = GAME_LOG_OPENERS[compression]
+        self.name = filename + extension
+        self.file = opener(self.name, 'wt')
+        self.separator = ''
+
+    def append(self, line):
+        self.file.write(self.separator + line)
+        self.separator = '\n'
+
+    def close(self):
+        self.file.close()
+
+
+def rotated_log_filename(filename, compression=None):
+    '''
+    Returns filename with the first suffix _1, _2, ... that no game log has been written to yet.
+    '''
+    extension = GAME_LOG_OPENERS[compression][1]
+    game_num = 1
+    while os.path.exists('{}_{}{}'.format(filename, game_num, extension)):
+        game_num += 1
+    return '{}_{}'.format(filename, game_num)
+
+
+MatchConfig = namedtuple('MatchConfig', ['num_boards', 'num_rounds', 'starting_stack', 'big_blind', 'small_blind', 'starting_game_clock'])
+# the game variant set in config.py
+DEFAULT_CONFIG = MatchConfig(NUM_BOARDS, NUM_ROUNDS, STARTING_STACK, BIG_BLIND, SMALL_BLIND, STARTING_GAME_CLOCK)
 
 
 class SmallDeck(eval7.Deck):
@@ -65,7 +120,7 @@ class SmallDeck(eval7.Deck):
         self.cards = [eval7.Card(str(card)) for card in existing_deck.cards]
 
 
-class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'previous_state', 'settled', 'reveal'], defaults=[False, True])):
+class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'previous_state', 'settled', 'reveal', 'config'], defaults=[False, True, DEFAULT_CONFIG])):
     '''
     Encodes the game tree for one board within a round.
     '''
@@ -110,7 +165,7 @@ class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'pre
         active = button % 2
         continue_cost = self.pips[1-active] - self.pips[active]
         max_contribution = min(stacks[active], stacks[1-active] + continue_cost)
-        min_contribution = min(max_contribution, continue_cost + max(continue_cost, BIG_BLIND))
+        min_contribution = min(max_contribution, continue_cost + max(continue_cost, self.config.big_blind))
         return (self.pips[active] + min_contribution, self.pips[active] + max_contribution)
 
     def proceed(self, action, button, street):
@@ -124,32 +179,32 @@ class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'pre
             if self.hands is not None:
                 opp_hands = self.hands[1-active]
                 new_hands[1-active] = opp_hands
-            return BoardState(self.pot, self.pips, new_hands, self.deck, self)
+            return BoardState(self.pot, self.pips, new_hands, self.deck, self, config=self.config)
         if isinstance(action, FoldAction):
             new_pot = self.pot + sum(self.pips)
             winnings = [0, new_pot] if active == 0 else [new_pot, 0]
-            return TerminalState(winnings, BoardState(new_pot, [0, 0], self.hands, self.deck, self, True, False))
+            return TerminalState(winnings, BoardState(new_pot, [0, 0], self.hands, self.deck, self, True, False, self.config))
         if isinstance(action, CallAction):
             if button == 0: # sb calls bb
-                return BoardState(self.pot, [BIG_BLIND] * 2, self.hands, self.deck, self)
+                return BoardState(self.pot, [self.config.big_blind] * 2, self.hands, self.deck, self, config=self.config)
             # both players acted
             new_pips = list(self.pips)
             contribution = new_pips[1-active] - new_pips[active]
             new_pips[active] += contribution
-            return BoardState(self.pot, new_pips, self.hands, self.deck, self, True)
+            return BoardState(self.pot, new_pips, self.hands, self.deck, self, True, config=self.config)
         if isinstance(action, CheckAction):
             if (street == 0 and button > 0) or button > 1:  # both players acted
-                return BoardState(self.pot, self.pips, self.hands, self.deck, self, True, self.reveal)
+                return BoardState(self.pot, self.pips, self.hands, self.deck, self, True, self.reveal, self.config)
             # let opponent act
-            return BoardState(self.pot, self.pips, self.hands, self.deck, self, self.settled, self.reveal)
+            return BoardState(self.pot, self.pips, self.hands, self.deck, self, self.settled, self.reveal, self.config)
         # isinstance(action, RaiseAction)
         new_pips = list(self.pips)
         contribution = action.amount - new_pips[active]
         new_pips[active] += contribution
-        return BoardState(self.pot, new_pips, self.hands, self.deck, self)
+        return BoardState(self.pot, new_pips, self.hands, self.deck, self, config=self.config)
 
 
-class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands', 'board_states', 'previous_state'])):
+class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands', 'board_states', 'previous_state', 'config'], defaults=[DEFAULT_CONFIG])):
     '''
     Encodes the game tree for one round of poker.
     '''
@@ -163,8 +218,8 @@ class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands
             net_winnings[0] += board_state.deltas[0]
             net_winnings[1] += board_state.deltas[1]
         end_stacks = [self.stacks[0] + net_winnings[0], self.stacks[1] + net_winnings[1]]
-        deltas = [end_stacks[0] - STARTING_STACK, end_stacks[1] - STARTING_STACK]
-        return TerminalState(deltas, RoundState(self.button, self.street, self.stacks, self.hands, terminal_board_states, self))
+        deltas = [end_stacks[0] - self.config.starting_stack, end_stacks[1] - self.config.starting_stack]
+        return TerminalState(deltas, RoundState(self.button, self.street, self.stacks, self.hands, terminal_board_states, self, self.config))
 
     def legal_actions(self):
         '''
@@ -176,53 +231,146 @@ class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands
         '''
         Resets the players' pips on each board and advances the game tree to the next round of betting.
         '''
-        new_pots = [0]*NUM_BOARDS
-        for i in range(NUM_BOARDS):
+        new_pots = [0]*self.config.num_boards
+        for i in range(self.config.num_boards):
             if isinstance(self.board_states[i], BoardState):
                 new_pots[i] = self.board_states[i].pot + sum(self.board_states[i].pips)
-        new_board_states = [BoardState(new_pots[i], [0, 0], self.board_states[i].hands, self.board_states[i].deck, self.board_states[i]) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(NUM_BOARDS)]
+        new_board_states = [BoardState(new_pots[i], [0, 0], self.board_states[i].hands, self.board_states[i].deck, self.board_states[i], config=self.config) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(self.config.num_boards)]
         all_terminal = [isinstance(board_state, TerminalState) for board_state in new_board_states]
         if self.street == 5 or all(all_terminal):
-            return RoundState(self.button, 5, self.stacks, self.hands, new_board_states, self).showdown()
+            return RoundState(self.button, 5, self.stacks, self.hands, new_board_states, self, self.config).showdown()
         new_street = 3 if self.street == 0 else self.street + 1
-        return RoundState(1, new_street, self.stacks, self.hands, new_board_states, self)
+        return RoundState(1, new_street, self.stacks, self.hands, new_board_states, self, self.config)
 
     def proceed(self, actions):
         '''
         Advances the game tree by one tuple of actions performed by the active player across all boards.
         '''
-        new_board_states = [self.board_states[i].proceed(actions[i], self.button, self.street) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(NUM_BOARDS)]
+        new_board_states = [self.board_states[i].proceed(actions[i], self.button, self.street) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(self.config.num_boards)]
         active = self.button % 2
         new_stacks = list(self.stacks)
         contribution = 0
-        for i in range(NUM_BOARDS):
+        for i in range(self.config.num_boards):
             if isinstance(new_board_states[i], BoardState) and isinstance(self.board_states[i], BoardState):
                 contribution += new_board_states[i].pips[active] - self.board_states[i].pips[active]
         new_stacks[active] -= contribution
         settled = [(isinstance(board_state, TerminalState) or board_state.settled) for board_state in new_board_states]
-        state = RoundState(self.button + 1, self.street, new_stacks, self.hands, new_board_states, self)
+        state = RoundState(self.button + 1, self.street, new_stacks, self.hands, new_board_states, self, self.config)
         return state.proceed_street() if all(settled) else state
 
 
+class FramedFile():
+    '''
+    Socket file which sends each message as a 4 byte length followed by the message, instead of ending it with a newline.
+    Messages are written and read as text lines, like a socket.makefile('rw').
+    '''
+    HEADER = struct.Struct('>I')
+
+    def __init__(self, sock):
+        self.file = sock.makefile('rwb')
+        self.buffer = []
+
+    def write(self, text):
+        self.buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        frames = [message.encode() for message in ''.join(self.buffer).splitlines()]
+        self.buffer = []
+        self.file.write(b''.join([self.HEADER.pack(len(frame)) + frame for frame in frames]))
+        self.file.flush()
+
+    def readline(self):
+        header = self.file.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            return ''
+        return self.file.read(self.HEADER.unpack(header)[0]).decode() + '\n'
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.file.close()
+
+
+def open_server():
+    '''
+    Opens a socket for a pokerbot to connect to, using TRANSPORT.
+    Returns the socket and the arguments telling the pokerbot where to connect and which FRAMING to use.
+    '''
+    if TRANSPORT == 'unix':
+        path = os.path.join(tempfile.mkdtemp(prefix='pokerbots'), 'engine.sock')
+        server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server_socket.bind(path)
+        address = ['--unix', path]
+    else:
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_socket.bind(('', 0))
+        address = [str(server_socket.getsockname()[1])]
+    if FRAMING == 'length':
+        address += ['--framing', 'length']
+    return server_socket, address
+
+
+def open_socketfile(client_socket):
+    '''
+    Wraps a connected socket in a file using FRAMING, with Nagle's algorithm turned off for TCP.
+    '''
+    if client_socket.family == socket.AF_INET:
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return FramedFile(client_socket) if FRAMING == 'length' else client_socket.makefile('rw')
+
+
+def process_cpu_time(pid):
+    '''
+    Returns the CPU time in seconds used so far by every thread of a running process, read from /proc,
+    or None if it cannot be read.
+    '''
+    try:
+        nanoseconds = 0
+        for thread in os.listdir('/proc/{}/task'.format(pid)):
+            with open('/proc/{}/task/{}/schedstat'.format(pid, thread), 'rb') as schedstat:
+                nanoseconds += int(schedstat.read().split()[0])
+        return nanoseconds / 1e9
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def cpu_elapsed(start, end):
+    '''
+    Returns the CPU time used between two readings of process_cpu_time, or None if either failed
+    or a thread exited in between, in which case the pokerbot is charged its response time instead.
+    '''
+    if start is None or end is None or end < start:
+        return None
+    return end - start
+
+
 class Player():
     '''
     Handles subprocess and socket interactions with one player's pokerbot.
     '''
 
-    def __init__(self, name, path):
+    def __init__(self, name, path, config=DEFAULT_CONFIG):
         self.name = name
         self.path = path
-        self.game_clock = STARTING_GAME_CLOCK
+        self.config = config
+        self.game_clock = config.starting_game_clock
         self.bankroll = 0
         self.commands = None
         self.bot_subprocess = None
         self.socketfile = None
-        self.bytes_queue = Queue()
+        self.output = None
+        self.reader = None
+        self.protocol = 1
+        self.round_num = 1
+        self.response_times = []
 
     def build(self):
         '''
         Loads the commands file and builds the pokerbot.
         '''
+        self.open_log()
         try:
             with open(self.path + '/commands.json', 'r') as json_file:
                 commands = json.load(json_file)
@@ -238,15 +386,26 @@ class Player():
             print(self.name, 'commands.json misformatted')
         if self.commands is not None and len(self.commands['build']) > 0:
             try:
+                if BUILD_CACHE_DIR is not None:
+                    os.makedirs(BUILD_CACHE_DIR, exist_ok=True)
+                    key = build_cache.source_hash(self.path, self.commands)
+                    if build_cache.restore(BUILD_CACHE_DIR, key, self.path):
+                        print(self.name, 'build cache hit')
+                        self.output.write(('Build cache hit ' + key + '\n').encode())
+                        return
+                    print(self.name, 'build cache miss')
+                    before = build_cache.snapshot(self.path)
                 proc = subprocess.run(self.commands['build'],
                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
                                       cwd=self.path, timeout=BUILD_TIMEOUT, check=False)
-                self.bytes_queue.put(proc.stdout)
+                self.output.write(proc.stdout)
+                if BUILD_CACHE_DIR is not None and proc.returncode == 0:
+                    build_cache.store(BUILD_CACHE_DIR, key, self.path, before)
             except subprocess.TimeoutExpired as timeout_expired:
                 error_message = 'Timed out waiting for ' + self.name + ' to build'
                 print(error_message)
-                self.bytes_queue.put(timeout_expired.stdout)
-                self.bytes_queue.put(error_message.encode())
+                self.output.write(timeout_expired.stdout or b'')
+                self.output.write(error_message.encode())
             except (TypeError, ValueError):
                 print(self.name, 'build command misformatted')
             except OSError:
@@ -257,43 +416,120 @@ class Player():
         Runs the pokerbot and establishes the socket connection.
         '''
         if self.commands is not None and len(self.commands['run']) > 0:
+            server_socket = None
             try:
-                server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                server_socket, address = open_server()
                 with server_socket:
-                    server_socket.bind(('', 0))
                     server_socket.settimeout(CONNECT_TIMEOUT)
                     server_socket.listen()
-                    port = server_socket.getsockname()[1]
-                    proc = subprocess.Popen(self.commands['run'] + [str(port)],
-                                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                            cwd=self.path)
+                    proc = self.start_process(address)
                     self.bot_subprocess = proc
-                    # function for bot listening
-                    def enqueue_output(out, queue):
-                        try:
-                            for line in out:
-                                queue.put(line)
-                        except ValueError:
-                            pass
                     # start a separate bot listening thread which dies with the program
-                    Thread(target=enqueue_output, args=(proc.stdout, self.bytes_queue), daemon=True).start()
+                    self.reader = Thread(target=self.stream_output, args=(proc.stdout,), daemon=True)
+                    self.reader.start()
                     # block until we timeout or the player connects
                     client_socket, _ = server_socket.accept()
                     with client_socket:
                         client_socket.settimeout(CONNECT_TIMEOUT)
-                        sock = client_socket.makefile('rw')
+                        sock = open_socketfile(client_socket)
                         self.socketfile = sock
                         print(self.name, 'connected successfully')
+                        self.negotiate()
             except (TypeError, ValueError):
                 print(self.name, 'run command misformatted')
             except OSError:
                 print(self.name, 'run failed - check "run" in commands.json')
             except socket.timeout:
                 print('Timed out waiting for', self.name, 'to connect')
+                self.print_tail()
+            finally:
+                if server_socket is not None and server_socket.family == socket.AF_UNIX:
+                    shutil.rmtree(os.path.dirname(address[1]), ignore_errors=True)
+
+    def start_process(self, address):
+        '''
+        Starts the pokerbot, forking it from a zygote if ZYGOTE is set and it is a standard Python pokerbot.
+        '''
+        if ZYGOTE and zygote.can_fork(self.commands):
+            try:
+                return zygote.spawn(self.path, self.commands, address, CONNECT_TIMEOUT)
+            except OSError as error:
+                print(self.name, str(error) + ', starting it directly')
+        return subprocess.Popen(self.commands['run'] + address,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                cwd=self.path)
+
+    def open_log(self):
+        '''
+        Points the pokerbot's output at its log file in the current directory, continuing if that file is already open.
+        '''
+        log_path = os.path.abspath(self.name + '.txt')
+        if self.output is None or self.output.name != log_path:
+            if self.output is not None:
+                self.output.close()
+            self.output = BoundedWriter(log_path)
+
+    def stream_output(self, out):
+        '''
+        Copies the pokerbot's output to its log file line by line as it arrives.
+        '''
+        try:
+            for line in out:
+                self.output.write(line)
+        except ValueError:
+            pass
+
+    def print_tail(self):
+        '''
+        Prints the last few lines the pokerbot wrote, to help explain a failure.
+        '''
+        tail = self.output.tail() if self.output is not None else ''
+        if tail:
+            print(self.name, 'output ended with:')
+            print(tail)
+
+    def negotiate(self):
+        '''
+        Agrees on a protocol version with the pokerbot, which older pokerbots answer with an ack.
+        '''
+        try:
+            self.socketfile.write('V' + str(PROTOCOL_VERSION) + '\n')
+            self.socketfile.flush()
+            reply = self.socketfile.readline().strip()
+            self.protocol = int(reply[1:]) if reply.startswith('V') else 1
+        except socket.timeout:
+            print('Timed out waiting for', self.name, 'to negotiate a protocol version')
+        except OSError:
+            print(self.name, 'disconnected while negotiating a protocol version')
+        except ValueError:
+            print(self.name, 'sent a misformatted protocol version')
+
+    def new_game(self, config=None):
+        '''
+        Asks the running pokerbot to start a new game, keeping its process and imports.
+        The new game may be played with a different config.
+        Returns False if the pokerbot cannot be reused, in which case it must be restarted.
+        '''
+        if self.socketfile is None or self.protocol < 2 or self.game_clock <= 0.:
+            return False
+        try:
+            self.socketfile.write('N\n')
+            self.socketfile.flush()
+            if not self.socketfile.readline():
+                return False
+        except OSError:
+            return False
+        self.open_log()
+        self.config = config or self.config
+        self.game_clock = self.config.starting_game_clock
+        self.bankroll = 0
+        self.round_num = 1
+        self.response_times = []
+        return True
 
     def stop(self):
         '''
-        Closes the socket connection and stops the pokerbot.
+        Closes the socket connection, stops the pokerbot and closes its log file.
         '''
         if self.socketfile is not None:
             try:
@@ -305,22 +541,22 @@ class Player():
                 print('Could not close socket connection with', self.name)
         if self.bot_subprocess is not None:
             try:
-                outs, _ = self.bot_subprocess.communicate(timeout=CONNECT_TIMEOUT)
-                self.bytes_queue.put(outs)
+                self.bot_subprocess.wait(timeout=CONNECT_TIMEOUT)
             except subprocess.TimeoutExpired:
                 print('Timed out waiting for', self.name, 'to quit')
                 self.bot_subprocess.kill()
-                outs, _ = self.bot_subprocess.communicate()
-                self.bytes_queue.put(outs)
-        with open(self.name + '.txt', 'wb') as log_file:
-            bytes_written = 0
-            for output in self.bytes_queue.queue:
-                try:
-                    bytes_written += log_file.write(output)
-                    if bytes_written >= PLAYER_LOG_SIZE_LIMIT:
-                        break
-                except TypeError:
-                    pass
+                self.bot_subprocess.wait()
+            if self.reader is not None:
+                self.reader.join(timeout=CONNECT_TIMEOUT)  # the reader finishes once the pokerbot's output is drained
+        if self.output is not None:
+            self.output.close()
+
+    def write_log(self):
+        '''
+        Flushes the pokerbot's output so far to its log file.
+        '''
+        if self.output is not None:
+            self.output.flush()
 
     def query(self, round_state, player_message, game_log):
         '''
@@ -334,80 +570,27 @@ class Player():
                 player_message[0] = 'T{:.3f}'.format(self.game_clock)
                 message = ' '.join(player_message) + '\n'
                 del player_message[1:]  # do not send redundant action history
+                start_cpu_time = self.cpu_time()
                 start_time = time.perf_counter()
                 self.socketfile.write(message)
                 self.socketfile.flush()
                 clauses = self.socketfile.readline().strip()
                 end_time = time.perf_counter()
-                if ENFORCE_GAME_CLOCK:
-                    self.game_clock -= end_time - start_time
-                if self.game_clock <= 0.:
-                    raise socket.timeout
-                assert_flag = (';' in clauses)
-                clauses = clauses.split(';')
-                if assert_flag:
-                    assert (len(clauses) == NUM_BOARDS)
-                actions = [self.query_board(round_state.board_states[i], clauses[i], game_log, active, round_state.stacks)
-                    if isinstance(round_state, RoundState) else self.query_board(round_state.previous_state.board_states[i], clauses[i],
-                    game_log, active, round_state.previous_state.stacks) for i in range(NUM_BOARDS)]
-                if all(isinstance(a, AssignAction) for a in actions):
-                    if set().union(*[set(a.cards) for a in actions]) == set(round_state.hands[active]):
-                        return actions
-                    #else: (assigned cards not in hand or some cards unassigned)
-                    game_log.append(self.name + ' attempted illegal assignment')
-                else:
-                    contribution = 0
-                    opp_continue_cost = 0
-                    for i in range(NUM_BOARDS):
-                        if isinstance(actions[i], RaiseAction):
-                            contribution += actions[i].amount - round_state.board_states[i].pips[active]
-                            opp_continue_cost += actions[i].amount - round_state.board_states[i].pips[1-active]
-                        elif isinstance(actions[i], CallAction):
-                            contribution += round_state.board_states[i].pips[1-active] - round_state.board_states[i].pips[active]
-                    max_contribution = round_state.stacks[active] if isinstance(round_state, RoundState) else 0
-                    opp_stack = round_state.stacks[1-active] if isinstance(round_state, RoundState) else 0
-                    all_in_flag = (contribution == max_contribution)
-                    if 0 <= contribution <= max_contribution:
-                        if not all_in_flag:
-                            for i in range(NUM_BOARDS):
-                                if not isinstance(actions[i], RaiseAction):
-                                    continue
-                                min_raise = round_state.board_states[i].raise_bounds(active, round_state.stacks)[0]
-                                legal_actions = round_state.board_states[i].legal_actions(active, round_state.stacks)
-                                if actions[i].amount < min_raise:
-                                    game_log.append(self.name + ' did not meet minimum raise amount on board {}'.format(i+1))
-                                    actions[i] = CallAction() if CallAction in legal_actions else CheckAction()
-                        if opp_continue_cost <= opp_stack:
-                            return actions
-                        else:
-                            game_log.append(self.name + " attempted net RaiseAction's which opponent cannot match")
-                            effective_stack = round_state.stacks[1-active]
-                            mod_actions = actions[:]
-                            for i in range(NUM_BOARDS):
-                                if isinstance(actions[i], RaiseAction):
-                                    raise_delta = actions[i].amount - round_state.board_states[i].pips[1-active]
-                                    if effective_stack == 0:
-                                        mod_actions[i] = CallAction()
-                                    elif raise_delta > effective_stack:
-                                        mod_actions[i] = RaiseAction(round_state.board_states[i].pips[1-active] + effective_stack)
-                                        effective_stack = 0
-                                    else:
-                                        effective_stack -= raise_delta
-                            return mod_actions
-                    else: # (attempted negative net raise or net raise larger than bankroll)
-                        game_log.append(self.name + " attempted an illegal combination of RaiseAction's and/or CallAction's")
+                cpu_seconds = cpu_elapsed(start_cpu_time, self.cpu_time())
+                return self.parse_response(round_state, clauses, end_time - start_time, game_log, active, cpu_seconds)
             except socket.timeout:
                 error_message = self.name + ' ran out of time'
                 game_log.append(error_message)
                 print(error_message)
                 self.game_clock = 0.
             except AssertionError:
-                error_message = self.name + ' did not submit ' + str(NUM_BOARDS) + ' actions'
+                error_message = self.name + ' did not submit ' + str(self.config.num_boards) + ' actions'
                 game_log.append(error_message)
             except OSError:
                 error_message = self.name + ' disconnected'
                 game_log.append(error_message)
                 print(error_message)
+                self.print_tail()
                 self.game_clock = 0.
             except (IndexError, KeyError, ValueError):
                 error_message = self.name + ' response misformatted: ' + str(clauses)
@@ -415,56 +598,471 @@ class Player():
             except TypeError:
                 error_message = self.name + ' attempted an action after the round has ended'
                 game_log.append(error_message)
-        default_actions = round_state.legal_actions() if isinstance(round_state, RoundState) else [{CheckAction} for i in range(NUM_BOARDS)]
+        return self.default_actions(round_state)
+
+    def cpu_time(self):
+        '''
+        Returns the CPU time used so far by the pokerbot process if GAME_CLOCK_MODE is 'cpu', otherwise None.
+        '''
+        if GAME_CLOCK_MODE == 'cpu' and self.bot_subprocess is not None:
+            return process_cpu_time(self.bot_subprocess.pid)
+        return None
+
+    def charge(self, seconds, cpu_seconds=None):
+        '''
+        Subtracts the pokerbot's response time from its game clock, or its CPU time if GAME_CLOCK_MODE is 'cpu'.
+        Raises socket.timeout if the pokerbot ran out of time.
+        '''
+        if ENFORCE_GAME_CLOCK:
+            self.game_clock -= seconds if cpu_seconds is None else cpu_seconds
+        if self.game_clock <= 0.:
+            raise socket.timeout
+
+    def parse_response(self, round_state, clauses, seconds, game_log, active, cpu_seconds=None):
+        '''
+        Charges the pokerbot for its response time and parses its NUM_BOARDS actions.
+        Raises socket.timeout if the pokerbot ran out of time, or an AssertionError, IndexError, KeyError or ValueError
+        if the response is misformatted.
+        '''
+        self.record_response(round_state, ''.join(clause[1:2] for clause in clauses.split(';')), seconds, cpu_seconds)
+        self.charge(seconds, cpu_seconds)
+        assert_flag = (';' in clauses)
+        clauses = clauses.split(';')
+        if assert_flag:
+            assert (len(clauses) == self.config.num_boards)
+        actions = [self.query_board(round_state.board_states[i], clauses[i], game_log, active, round_state.stacks)
+            if isinstance(round_state, RoundState) else self.query_board(round_state.previous_state.board_states[i], clauses[i],
+            game_log, active, round_state.previous_state.stacks) for i in range(self.config.num_boards)]
+        return self.check_actions(round_state, actions, game_log, active)
+
+    def record_response(self, round_state, codes, seconds, cpu_seconds=None):
+        '''
+        Records how long the pokerbot took to respond, and the CPU time it used if measured,
+        tagged with the round, street, number of live boards and action codes.
+        '''
+        if isinstance(round_state, TerminalState):
+            phase, boards = 'Ack', 0
+        else:
+            if round_state.street > 0:
+                phase = STREET_NAMES[round_state.street - 3]
+            else:
+                phase = 'Assign' if round_state.button < 0 else 'Preflop'
+            boards = sum(isinstance(board_state, BoardState) for board_state in round_state.board_states)
+        self.response_times.append((self.round_num, phase, boards, codes, seconds, cpu_seconds))
+
+    def default_actions(self, round_state):
+        '''
+        Returns the actions taken on the pokerbot's behalf when it fails to respond legally.
+        '''
+        default_actions = round_state.legal_actions() if isinstance(round_state, RoundState) else [{CheckAction} for i in range(self.config.num_boards)]
         return [CheckAction() if CheckAction in default else FoldAction() for default in default_actions]
 
+    def check_actions(self, round_state, actions, game_log, active):
+        '''
+        Enforces the constraints between the pokerbot's actions across all boards.
+        Returns the actions to apply, which are the defaults if the combination is illegal.
+        '''
+        if all(isinstance(a, AssignAction) for a in actions):
+            if set().union(*[set(a.cards) for a in actions]) == set(round_state.hands[active]):
+                return actions
+            #else: (assigned cards not in hand or some cards unassigned)
+            game_log.append(self.name + ' attempted illegal assignment')
+        else:
+            contribution = 0
+            opp_continue_cost = 0
+            for i in range(self.config.num_boards):
+                if isinstance(actions[i], RaiseAction):
+                    contribution += actions[i].amount - round_state.board_states[i].pips[active]
+                    opp_continue_cost += actions[i].amount - round_state.board_states[i].pips[1-active]
+                elif isinstance(actions[i], CallAction):
+                    contribution += round_state.board_states[i].pips[1-active] - round_state.board_states[i].pips[active]
+            max_contribution = round_state.stacks[active] if isinstance(round_state, RoundState) else 0
+            opp_stack = round_state.stacks[1-active] if isinstance(round_state, RoundState) else 0
+            all_in_flag = (contribution == max_contribution)
+            if 0 <= contribution <= max_contribution:
+                if not all_in_flag:
+                    for i in range(self.config.num_boards):
+                        if not isinstance(actions[i], RaiseAction):
+                            continue
+                        min_raise = round_state.board_states[i].raise_bounds(active, round_state.stacks)[0]
+                        legal_actions = round_state.board_states[i].legal_actions(active, round_state.stacks)
+                        if actions[i].amount < min_raise:
+                            game_log.append(self.name + ' did not meet minimum raise amount on board {}'.format(i+1))
+                            actions[i] = CallAction() if CallAction in legal_actions else CheckAction()
+                if opp_continue_cost <= opp_stack:
+                    return actions
+                else:
+                    game_log.append(self.name + " attempted net RaiseAction's which opponent cannot match")
+                    effective_stack = round_state.stacks[1-active]
+                    mod_actions = actions[:]
+                    for i in range(self.config.num_boards):
+                        if isinstance(actions[i], RaiseAction):
+                            raise_delta = actions[i].amount - round_state.board_states[i].pips[1-active]
+                            if effective_stack == 0:
+                                mod_actions[i] = CallAction()
+                            elif raise_delta > effective_stack:
+                                mod_actions[i] = RaiseAction(round_state.board_states[i].pips[1-active] + effective_stack)
+                                effective_stack = 0
+                            else:
+                                effective_stack -= raise_delta
+                    return mod_actions
+            else: # (attempted negative net raise or net raise larger than bankroll)
+                game_log.append(self.name + " attempted an illegal combination of RaiseAction's and/or CallAction's")
+        return self.default_actions(round_state)
+
     def query_board(self, board_state, clause, game_log, active, stacks):
         '''
         Parses one action from the pokerbot for a specific board.
         '''
         legal_actions = board_state.legal_actions(active, stacks) if isinstance(board_state, BoardState) else {CheckAction}
         action = DECODE[clause[1]]
-        if action in legal_actions:
-            if clause[1] == 'R':
-                amount = int(clause[2:])
+        if action not in legal_actions:  # an illegal action is reported as illegal, even if its amount or cards are misformatted
+            game_log.append(self.name + ' attempted illegal ' + action.__name__)
+            return CheckAction() if CheckAction in legal_actions else FoldAction()
+        if clause[1] == 'R':
+            action = action(int(clause[2:]))
+        elif clause[1] == 'A':
+            cards_strings = clause[2:].split(',')
+            action = action([eval7.Card(s) for s in cards_strings])
+        else:
+            action = action()
+        return self.check_board_action(board_state, action, game_log, active, stacks, legal_actions)
+
+    def check_board_action(self, board_state, action, game_log, active, stacks, legal_actions=None):
+        '''
+        Checks one action from the pokerbot against the legal moves on a specific board.
+        '''
+        if legal_actions is None:
+            legal_actions = board_state.legal_actions(active, stacks) if isinstance(board_state, BoardState) else {CheckAction}
+        if type(action) in legal_actions:
+            if isinstance(action, RaiseAction):
                 max_raise = board_state.raise_bounds(active, stacks)[1]
-                if board_state.pips[1-active] < amount <= max_raise:
-                    return action(amount)
-                elif board_state.pips[1-active] == amount:
+                if board_state.pips[1-active] < action.amount <= max_raise:
+                    return action
+                elif board_state.pips[1-active] == action.amount:
                     return CallAction()
-            elif clause[1] == 'A':
-                cards_strings = clause[2:].split(',')
-                cards = [eval7.Card(s) for s in cards_strings]
-                return action(cards)
             else:
-                return action()
-        game_log.append(self.name + ' attempted illegal ' + action.__name__)
+                return action
+        game_log.append(self.name + ' attempted illegal ' + type(action).__name__)
         return CheckAction() if CheckAction in legal_actions else FoldAction()
 
 
+class BoundedWriter():
+    '''
+    Log file which stops writing once PLAYER_LOG_SIZE_LIMIT is reached, keeping the last PLAYER_LOG_TAIL_SIZE bytes in memory.
+    Accepts both bytes and text, and is safe to write from the reader thread while the engine flushes or closes it.
+    '''
+
+    def __init__(self, filename):
+        self.name = filename
+        self.file = open(filename, 'wb')
+        self.lock = Lock()
+        self.bytes_written = 0
+        self.bytes_dropped = 0
+        self.last_bytes = b''
+
+    def write(self, output):
+        data = output.encode(errors='replace') if isinstance(output, str) else output
+        with self.lock:
+            self.last_bytes = (self.last_bytes + data)[-PLAYER_LOG_TAIL_SIZE:]
+            if self.file.closed:
+                pass
+            elif self.bytes_written < PLAYER_LOG_SIZE_LIMIT:
+                self.bytes_written += self.file.write(data)
+                if self.bytes_written >= PLAYER_LOG_SIZE_LIMIT:
+                    self.file.write(b'\nOutput truncated at PLAYER_LOG_SIZE_LIMIT\n')
+            else:
+                self.bytes_dropped += len(data)
+        return len(output)
+
+    def tail(self):
+        '''
+        Returns the most recent output as text.
+        '''
+        with self.lock:
+            return self.last_bytes.decode(errors='replace').rstrip()
+
+    def flush(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed and self.bytes_dropped > 0:
+                self.file.write('{} more bytes dropped\n'.format(self.bytes_dropped).encode())
+            self.file.close()
+
+
+class LocalPlayer(Player):
+    '''
+    Runs one player's Python pokerbot inside the engine process, without a subprocess or socket.
+    The pokerbot sees the same states its skeleton Runner would reconstruct, minus previous_state history.
+    '''
+
+    def __init__(self, name, path, config=DEFAULT_CONFIG):
+        super().__init__(name, path, config)
+        self.pokerbot = None
+        self.states = None
+        self.game_state = None
+        self.seat = 0
+        self.street = 0
+        self.hands = None
+        self.decks = None
+        self.round_flag = True
+
+    def build(self):
+        '''
+        Python pokerbots have nothing to build.
+        '''
+        pass
+
+    def run(self):
+        '''
+        Imports the pokerbot's player.py and constructs its Player.
+        '''
+        self.open_log()
+        path = os.path.abspath(self.path)
+        if not os.path.isfile(os.path.join(path, 'player.py')):
+            print(self.name, 'player.py not found - check PLAYER_PATH')
+            return
+        cwd = os.getcwd()
+        sys_path = list(sys.path)
+        old_modules = set(sys.modules)
+        try:
+            # the pokerbot expects to run from its own directory with its own skeleton package
+            os.chdir(path)
+            sys.path.insert(0, path)
+            spec = importlib.util.spec_from_file_location('pokerbot_' + self.name, os.path.join(path, 'player.py'))
+            module = importlib.util.module_from_spec(spec)
+            self.call_bot(spec.loader.exec_module, module)
+            self.states = sys.modules['skeleton.states']
+            self.pokerbot, _, _ = self.call_bot(module.Player)
+            self.game_state = self.states.GameState(0, 0, 0., 1)
+            print(self.name, 'loaded successfully')
+        except (OSError, KeyError, AttributeError):
+            print(self.name, 'failed to load - check', self.name + '.txt')
+            self.print_tail()
+        finally:
+            os.chdir(cwd)
+            sys.path[:] = sys_path
+            # forget the pokerbot's own modules so that the other player imports its own versions
+            for module_name in set(sys.modules) - old_modules:
+                module_file = getattr(sys.modules[module_name], '__file__', None) or ''
+                if module_name.split('.')[0] == 'skeleton' or os.path.abspath(module_file).startswith(path + os.sep):
+                    del sys.modules[module_name]
+
+    def new_game(self, config=None):
+        '''
+        Tells the pokerbot a new game is starting, keeping its module and imports loaded.
+        The new game may be played with a different config.
+        Returns False if the pokerbot cannot be reused, in which case it must be restarted.
+        '''
+        if self.pokerbot is None or self.game_clock <= 0.:
+            return False
+        self.open_log()
+        try:
+            self.call_bot(getattr(self.pokerbot, 'handle_new_game', lambda: None))
+        except OSError:
+            return False
+        self.game_state = self.states.GameState(0, 0, 0., 1)
+        self.round_flag = True
+        self.config = config or self.config
+        self.game_clock = self.config.starting_game_clock
+        self.bankroll = 0
+        self.round_num = 1
+        self.response_times = []
+        return True
+
+    def call_bot(self, method, *args):
+        '''
+        Calls into the pokerbot with its output captured.
+        Returns the result, the elapsed time and the CPU time used if GAME_CLOCK_MODE is 'cpu',
+        or raises OSError if the pokerbot crashed.
+        '''
+        stdout, stderr = sys.stdout, sys.stderr
+        sys.stdout = sys.stderr = self.output
+        try:
+            start_cpu_time = time.thread_time() if GAME_CLOCK_MODE == 'cpu' else None
+            start_time = time.perf_counter()
+            result = method(*args)
+            elapsed = time.perf_counter() - start_time
+            return result, elapsed, None if start_cpu_time is None else time.thread_time() - start_cpu_time
+        except Exception as exception:
+            traceback.print_exc()
+            raise OSError('pokerbot crashed') from exception
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+    def query(self, round_state, player_message, game_log):
+        '''
+        Requests NUM_BOARDS actions from the pokerbot by calling it directly.
+        At the end of the round, we hand the pokerbot its results instead.
+        '''
+        del player_message[1:]  # the pokerbot reads the engine state directly
+        active = round_state.button % 2 if isinstance(round_state, RoundState) else None
+        if self.pokerbot is not None and self.game_clock > 0.:
+            bot_actions = None
+            try:
+                self.game_state = self.game_state._replace(game_clock=self.game_clock)
+                if isinstance(round_state, TerminalState):
+                    deltas = round_state.deltas
+                    self.game_state = self.game_state._replace(bankroll=self.game_state.bankroll + deltas[self.seat],
+                                                               opp_bankroll=self.game_state.opp_bankroll + deltas[1-self.seat])
+                    terminal_state = self.terminal_view(round_state)
+                    _, elapsed, cpu_seconds = self.call_bot(self.pokerbot.handle_round_over, self.game_state, terminal_state, self.seat)
+                    self.game_state = self.game_state._replace(round_num=self.game_state.round_num + 1)
+                    self.round_flag = True
+                    self.record_response(round_state, '', elapsed, cpu_seconds)
+                    self.charge(elapsed, cpu_seconds)
+                    return self.default_actions(round_state)
+                elapsed, cpu_seconds = 0., None
+                if self.round_flag:
+                    self.round_flag = False
+                    _, elapsed, cpu_seconds = self.call_bot(self.pokerbot.handle_new_round, self.game_state, self.new_round_view(round_state, active), active)
+                bot_actions, get_actions_elapsed, get_actions_cpu_seconds = self.call_bot(self.pokerbot.get_actions, self.game_state, self.round_view(round_state), active)
+                elapsed += get_actions_elapsed
+                if get_actions_cpu_seconds is not None:
+                    cpu_seconds = (cpu_seconds or 0.) + get_actions_cpu_seconds
+                self.record_response(round_state, ''.join(ENCODE.get(type(action).__name__, '?') for action in bot_actions), elapsed, cpu_seconds)
+                self.charge(elapsed, cpu_seconds)
+                assert (len(bot_actions) == self.config.num_boards)
+                actions = [self.check_board_action(round_state.board_states[i], self.decode_action(bot_actions[i]), game_log, active, round_state.stacks)
+                    for i in range(self.config.num_boards)]
+                return self.check_actions(round_state, actions, game_log, active)
+            except socket.timeout:
+                error_message = self.name + ' ran out of time'
+                game_log.append(error_message)
+                print(error_message)
+                self.game_clock = 0.
+            except AssertionError:
+                error_message = self.name + ' did not submit ' + str(self.config.num_boards) + ' actions'
+                game_log.append(error_message)
+            except OSError:
+                error_message = self.name + ' crashed'
+                game_log.append(error_message)
+                print(error_message)
+                self.print_tail()
+                self.game_clock = 0.
+            except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+                error_message = self.name + ' response misformatted: ' + str(bot_actions)
+                game_log.append(error_message)
+        return self.default_actions(round_state)
+
+    def decode_action(self, action):
+        '''
+        Converts one action from the pokerbot's skeleton into the engine's action types.
+        '''
+        action_type = LOCAL_DECODE[type(action).__name__]
+        if action_type is RaiseAction:
+            return RaiseAction(int(action.amount))
+        if action_type is AssignAction:
+            return AssignAction([eval7.Card(card) for card in action.cards])
+        return action_type()
+
+    def new_round_view(self, round_state, active):
+        '''
+        Builds the pokerbot's view of a freshly dealt round, as the skeleton does on receiving its hand.
+        '''
+        self.seat = active
+        self.street = 0
+        self.hands = [[''] * (2*self.config.num_boards)] * 2
+        self.hands[active] = [str(card) for card in round_state.hands[active]]
+        self.decks = [[''] * 5 for i in range(self.config.num_boards)]
+        pips = [self.config.small_blind, self.config.big_blind]
+        board_states = [self.states.BoardState((i+1)*self.config.big_blind, pips, [[]]*2, self.decks[i], None) for i in range(self.config.num_boards)]
+        stacks = [self.config.starting_stack - self.config.num_boards*self.config.small_blind, self.config.starting_stack - self.config.num_boards*self.config.big_blind]
+        return self.states.RoundState(-2, 0, stacks, self.hands, board_states, None)
+
+    def round_view(self, round_state):
+        '''
+        Builds the pokerbot's view of the current round, hiding the opponent's cards.
+        '''
+        if round_state.street != self.street:
+            # boards which ended before this street are shown blank, as in the skeleton
+            self.street = round_state.street
+            self.decks = [[str(card) for card in board_state.deck.peek(self.street)] + [''] * (5 - self.street)
+                if isinstance(board_state, BoardState) else [''] * 5 for board_state in round_state.board_states]
+        board_states = [self.board_view(round_state.board_states[i], self.decks[i], False) for i in range(self.config.num_boards)]
+        return self.states.RoundState(round_state.button, round_state.street, list(round_state.stacks), self.hands, board_states, None)
+
+    def terminal_view(self, terminal_state):
+        '''
+        Builds the pokerbot's view of a finished round, revealing the opponent's cards at showdown.
+        '''
+        round_state = terminal_state.previous_state
+        decks = [[str(card) for card in board_state.previous_state.deck.peek(5)] if board_state.previous_state.reveal else self.decks[i]
+            for i, board_state in enumerate(round_state.board_states)]
+        board_states = [self.board_view(round_state.board_states[i], decks[i], True) for i in range(self.config.num_boards)]
+        round_view = self.states.RoundState(round_state.button, round_state.street, list(round_state.stacks), self.hands, board_states, None)
+        return self.states.TerminalState(list(terminal_state.deltas), round_view)
+
+    def board_view(self, board_state, deck, showdown):
+        '''
+        Builds the pokerbot's view of one board.
+        '''
+        if isinstance(board_state, TerminalState):
+            previous_state = board_state.previous_state
+            # the skeleton cannot evaluate showdowns, so it only knows the payoffs of folded boards
+            deltas = [0, 0] if previous_state.reveal else list(board_state.deltas)
+            return self.states.TerminalState(deltas, self.board_view(previous_state, deck, showdown))
+        hands = [[], []]
+        if board_state.hands is not None:
+            for seat in range(2):
+                if seat == self.seat or (showdown and board_state.reveal):
+                    hands[seat] = [str(card) for card in board_state.hands[seat]]
+                elif len(board_state.hands[seat]) > 0:
+                    hands[seat] = ['', '']
+        return self.states.BoardState(board_state.pot, list(board_state.pips), hands, deck, None, board_state.settled, board_state.reveal)
+
+
 class Game():
     '''
     Manages logging and the high-level game procedure.
+    A game may start at a later first_round, playing config.num_rounds rounds dealt as in that part of a longer game.
+    With rotate_log, each run writes its logs under the next unused numbered log_filename instead of overwriting.
     '''
 
-    def __init__(self):
-        self.log = ['6.176 MIT Pokerbots - ' + PLAYER_1_NAME + ' vs ' + PLAYER_2_NAME]
+    def __init__(self, seed=SEED, swap_seats=False, log_filename=GAME_LOG_FILENAME, config=DEFAULT_CONFIG, first_round=1,
+                 rotate_log=GAME_LOG_ROTATE):
+        self.log = None
+        self.base_log_filename = log_filename
+        self.log_filename = log_filename
+        self.rotate_log = rotate_log
+        self.config = config
+        self.journal = None
+        self.round_num = 0
         self.player_messages = [[], []]
+        self.seed = seed
+        self.swap_seats = swap_seats
+        self.first_round = first_round
+
+    def deal_random(self, round_num, stream):
+        '''
+        Returns the random number generator for one part of one round's deal.
+        Seeded games give every round and board its own stream, so a round's cards never depend on earlier rounds.
+        '''
+        if self.seed is None:
+            return random
+        return random.Random('{}:{}:{}'.format(self.seed, round_num, stream))
 
     def log_round_state(self, players, round_state):
         '''
         Incorporates RoundState information into the game log and player messages.
         '''
         if round_state.street == 0 and round_state.button == -2:
-            self.log.append('{} posts the blind of {} on each board'.format(players[0].name, SMALL_BLIND))
-            self.log.append('{} posts the blind of {} on each board'.format(players[1].name, BIG_BLIND))
+            self.log.append('{} posts the blind of {} on each board'.format(players[0].name, self.config.small_blind))
+            self.log.append('{} posts the blind of {} on each board'.format(players[1].name, self.config.big_blind))
             self.log.append('{} dealt {}'.format(players[0].name, PCARDS(round_state.hands[0])))
             self.log.append('{} dealt {}'.format(players[1].name, PCARDS(round_state.hands[1])))
-            self.player_messages[0] = ['T0.', 'P0', 'H' + CCARDS(round_state.hands[0])]
-            self.player_messages[1] = ['T0.', 'P1', 'H' + CCARDS(round_state.hands[1])]
+            # players who did not ack the last round, now in the other seat, still need its results
+            results = [self.player_messages[1-i][1:] if not self.needs_ack(players[i], self.round_num - 1) and players[i].game_clock > 0. else []
+                       for i in range(2)]
+            self.player_messages[0] = ['T0.'] + results[0] + ['P0', 'H' + CCARDS(round_state.hands[0])]
+            self.player_messages[1] = ['T0.'] + results[1] + ['P1', 'H' + CCARDS(round_state.hands[1])]
         elif round_state.street > 0 and round_state.button == 1:
             boards = [board_state.deck.peek(round_state.street) if isinstance(board_state, BoardState) else [] for board_state in round_state.board_states]
-            for i in range(NUM_BOARDS):
+            for i in range(self.config.num_boards):
                 log_message = ''
                 if isinstance(round_state.board_states[i], BoardState):
                     log_message += STREET_NAMES[round_state.street - 3] + ' ' + PCARDS(boards[i])
@@ -472,11 +1070,14 @@ class Game():
                     log_message += PVALUE(players[0].name, round_state.stacks[0])
                     log_message += PVALUE(players[1].name, round_state.stacks[1])
                     log_message += ' on board ' + str(i+1)
+                    if self.journal is not None:
+                        self.journal.record(self.round_num, journal.STREET, board=i, street=round_state.street, cards=boards[i],
+                                            pot=round_state.board_states[i].pot, stacks=round_state.stacks)
                 else:
                     log_message = 'Board {}'.format(i+1)
                     log_message += POTVAL(round_state.board_states[i].previous_state.pot)
                 self.log.append(log_message)
-            compressed_board = ';'.join([str(i+1) + 'B' + CCARDS(boards[i]) for i in range(NUM_BOARDS)])
+            compressed_board = ';'.join([str(i+1) + 'B' + CCARDS(boards[i]) for i in range(self.config.num_boards)])
             self.player_messages[0].append(compressed_board)
             self.player_messages[1].append(compressed_board)
 
@@ -484,15 +1085,29 @@ class Game():
         '''
         Incorporates action information into the game log and player messages.
         '''
-        codes = [self.log_board_action(name, actions[i], bet_overrides[i], i+1) for i in range(NUM_BOARDS)]
+        codes = [self.log_board_action(name, actions[i], bet_overrides[i], i+1) for i in range(self.config.num_boards)]
         code = ';'.join(codes)
         if 'A' in code:
             self.player_messages[active].append(code)
-            self.player_messages[1-active].append(';'.join([str(i+1) + 'A' for i in range(NUM_BOARDS)]))
+            self.player_messages[1-active].append(';'.join([str(i+1) + 'A' for i in range(self.config.num_boards)]))
         else:
             self.player_messages[0].append(code)
             self.player_messages[1].append(code)
 
+    def journal_actions(self, round_state, actions, active):
+        '''
+        Records the active player's actions on each live, unsettled board in the event journal.
+        '''
+        for i in range(self.config.num_boards):
+            board_state = round_state.board_states[i]
+            if isinstance(actions[i], AssignAction):
+                self.journal.record(self.round_num, journal.ASSIGN, seat=active, board=i, cards=actions[i].cards)
+            elif isinstance(board_state, BoardState) and not board_state.settled:
+                amount = actions[i].amount if isinstance(actions[i], RaiseAction) else 0
+                self.journal.record(self.round_num, journal.ACTION, seat=active, board=i, street=round_state.street,
+                                    code=ENCODE[type(actions[i]).__name__].encode(), amount=amount, pot=board_state.pot,
+                                    pips=board_state.pips, stacks=round_state.stacks)
+
     def log_board_action(self, name, action, bet_override, board_num):
         '''
         Incorporates action information from a single board into the game log.
@@ -521,13 +1136,19 @@ class Game():
         Incorporates TerminalState information from each board and the overall round into the game log and player messages.
         '''
         previous_round = round_state.previous_state
-        log_message_zero = [''] * NUM_BOARDS
-        log_message_one = [''] * NUM_BOARDS
-        for i in range(NUM_BOARDS):
+        log_message_zero = [''] * self.config.num_boards
+        log_message_one = [''] * self.config.num_boards
+        for i in range(self.config.num_boards):
             previous_board = previous_round.board_states[i].previous_state
+            if self.journal is not None:
+                self.journal.record(self.round_num, journal.PAYOFF, board=i, pot=previous_board.pot,
+                                    pips=previous_round.board_states[i].deltas)
             if previous_board.reveal:
                 self.log.append('{} shows {} on board {}'.format(players[0].name, PCARDS(previous_board.hands[0]), i+1))
                 self.log.append('{} shows {} on board {}'.format(players[1].name, PCARDS(previous_board.hands[1]), i+1))
+                if self.journal is not None:
+                    for seat in range(2):
+                        self.journal.record(self.round_num, journal.SHOW, seat=seat, board=i, cards=previous_board.hands[seat])
                 log_message_zero[i] = str(i+1) + 'O' + CCARDS(previous_board.hands[1])
                 log_message_one[i] = str(i+1) + 'O' + CCARDS(previous_board.hands[0])
             else:
@@ -537,39 +1158,154 @@ class Game():
         self.player_messages[1].append(';'.join(log_message_one))
         self.log.append('{} awarded {}'.format(players[0].name, round_state.deltas[0]))
         self.log.append('{} awarded {}'.format(players[1].name, round_state.deltas[1]))
+        if self.journal is not None:
+            self.journal.record(self.round_num, journal.PAYOFF, pips=round_state.deltas, stacks=previous_round.stacks)
         log_messages = ['D' + str(round_state.deltas[0]), 'D' + str(round_state.deltas[1])]
         self.player_messages[0].append(';'.join(log_messages))
         self.player_messages[1].append(';'.join(log_messages[::-1]))
 
-    def run_round(self, players):
+    def deal_round(self, players, round_num):
         '''
-        Runs one round of poker.
+        Deals the cards and posts the blinds for a new round. Returns its initial RoundState.
         '''
         deck = eval7.Deck()
-        deck.shuffle()
-        hands = [deck.deal(NUM_BOARDS*2), deck.deal(NUM_BOARDS*2)]
-        new_decks  = [SmallDeck(deck) for i in range(NUM_BOARDS)]
-        for new_deck in new_decks:
-            new_deck.shuffle()
-        stacks = [STARTING_STACK - NUM_BOARDS*SMALL_BLIND, STARTING_STACK - NUM_BOARDS*BIG_BLIND]
-        board_states = [BoardState((i+1)*BIG_BLIND, [SMALL_BLIND, BIG_BLIND], None, new_decks[i], None) for i in range(NUM_BOARDS)]
-        round_state = RoundState(-2, 0, stacks, hands, board_states, None)
+        self.deal_random(round_num, 'hands').shuffle(deck.cards)
+        hands = [deck.deal(self.config.num_boards*2), deck.deal(self.config.num_boards*2)]
+        new_decks  = [SmallDeck(deck) for i in range(self.config.num_boards)]
+        for i, new_deck in enumerate(new_decks):
+            self.deal_random(round_num, 'board' + str(i+1)).shuffle(new_deck.cards)
+        config = self.config
+        stacks = [config.starting_stack - config.num_boards*config.small_blind, config.starting_stack - config.num_boards*config.big_blind]
+        board_states = [BoardState((i+1)*config.big_blind, [config.small_blind, config.big_blind], None, new_decks[i], None, config=config) for i in range(config.num_boards)]
+        round_state = RoundState(-2, 0, stacks, hands, board_states, None, config)
+        self.round_num = round_num
+        if self.journal is not None:
+            # players start in their config.py order, swapped if swap_seats, and change seats every round
+            first_seat = (self.swap_seats + round_num - self.first_round) % 2
+            self.journal.record(round_num, journal.ROUND, seat=first_seat,
+                                amount=players[0].bankroll, stacks=stacks)
+            for seat in range(2):
+                for first in range(0, len(hands[seat]), 6):
+                    self.journal.record(round_num, journal.DEAL, seat=seat, cards=hands[seat][first:first+6])
+        return round_state
+
+    def needs_ack(self, player, round_num):
+        '''
+        Returns whether the player must acknowledge the end of the round, rather than receive its results with the next deal.
+        '''
+        return player.protocol < 3 or round_num >= self.first_round + self.config.num_rounds - 1
+
+    def forced_actions(self, round_state):
+        '''
+        Returns the checks the active player must make when it can only check on every board, or None if it has a choice.
+        The pokerbot is not asked for these, and learns of them from its next message.
+        '''
+        if AUTO_ADVANCE and all([legal_actions == {CheckAction} for legal_actions in round_state.legal_actions()]):
+            return [CheckAction()] * self.config.num_boards
+        return None
+
+    def proceed(self, players, round_state, actions):
+        '''
+        Logs the active player's actions and advances the round.
+        '''
+        active = round_state.button % 2
+        bet_overrides = [(round_state.board_states[i].pips == [0, 0]) if isinstance(round_state.board_states[i], BoardState) else None for i in range(self.config.num_boards)]
+        self.log_actions(players[active].name, actions, bet_overrides, active)
+        if self.journal is not None:
+            self.journal_actions(round_state, actions, active)
+        return round_state.proceed(actions)
+
+    def settle_round(self, players, round_state):
+        '''
+        Pays out the round once both players have acknowledged it.
+        '''
+        for player, delta in zip(players, round_state.deltas):
+            player.bankroll += delta
+            player.round_num += 1
+
+    def run_round(self, players, round_num):
+        '''
+        Runs one round of poker.
+        '''
+        round_state = self.deal_round(players, round_num)
         while not isinstance(round_state, TerminalState):
             self.log_round_state(players, round_state)
             active = round_state.button % 2
-            player = players[active]
-            actions = player.query(round_state, self.player_messages[active], self.log)
-            bet_overrides = [(round_state.board_states[i].pips == [0, 0]) if isinstance(round_state.board_states[i], BoardState) else None for i in range(NUM_BOARDS)]
-            self.log_actions(player.name, actions, bet_overrides, active)
-            round_state = round_state.proceed(actions)
+            actions = self.forced_actions(round_state)
+            if actions is None:
+                actions = players[active].query(round_state, self.player_messages[active], self.log)
+            round_state = self.proceed(players, round_state, actions)
         self.log_terminal_state(players, round_state)
-        for player, player_message, delta in zip(players, self.player_messages, round_state.deltas):
-            player.query(round_state, player_message, self.log)
-            player.bankroll += delta
+        for player, player_message in zip(players, self.player_messages):
+            if self.needs_ack(player, round_num):
+                player.query(round_state, player_message, self.log)
+        self.settle_round(players, round_state)
 
-    def run(self):
+    def log_clocks(self, players):
+        '''
+        Logs the CPU time each player was charged next to its response time, whose difference is
+        time spent waiting to be scheduled and in transit.
+        '''
+        for player in players:
+            measured = [(seconds, cpu_seconds) for _, _, _, _, seconds, cpu_seconds in player.response_times if cpu_seconds is not None]
+            wall_time = sum(seconds for seconds, _ in measured)
+            cpu_time = sum(cpu_seconds for _, cpu_seconds in measured)
+            line = '{} used {:.3f}s of CPU time in {:.3f}s of response time, a gap of {:.3f}s over {} of {} responses'.format(
+                player.name, cpu_time, wall_time, wall_time - cpu_time, len(measured), len(player.response_times))
+            self.log.append(line)
+            print(line)
+
+    def write_latencies(self, players):
+        '''
+        Writes every response time to a compact CSV file, and a percentile summary per player and street.
+        '''
+        with open(self.log_filename + '_latency.csv', 'w') as latency_file:
+            latency_file.write('player,round,street,boards,actions,ms,cpu_ms\n')
+            for player in players:
+                for round_num, phase, boards, codes, seconds, cpu_seconds in player.response_times:
+                    cpu_ms = '' if cpu_seconds is None else '{:.3f}'.format(1000 * cpu_seconds)
+                    latency_file.write('{},{},{},{},{},{:.3f},{}\n'.format(player.name, round_num, phase, boards, codes, 1000 * seconds, cpu_ms))
+        summary = []
+        for player in players:
+            summary.append('{:<10} {:>6} {:>9} {:>9} {:>9} {:>9}'.format(player.name, 'count', 'p50 ms', 'p95 ms', 'p99 ms', 'total s'))
+            for phase in LATENCY_PHASES + ['All']:
+                times = sorted(seconds for _, response_phase, _, _, seconds, _ in player.response_times if phase in (response_phase, 'All'))
+                if len(times) == 0:
+                    continue
+                percentile = lambda p: 1000 * times[min(len(times) - 1, int(p * len(times)))]
+                summary.append('{:<10} {:>6} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.3f}'.format(
+                    phase, len(times), percentile(.5), percentile(.95), percentile(.99), sum(times)))
+            summary.append('')
+        with open(self.log_filename + '_latency.txt', 'w') as summary_file:
+            summary_file.write('\n'.join(summary))
+        print('\n'.join(summary))
+
+    def open_logs(self):
+        '''
+        Opens the game log, and the event journal if EVENT_JOURNAL is set.
+        '''
+        if self.rotate_log:
+            self.log_filename = rotated_log_filename(self.base_log_filename, GAME_LOG_COMPRESSION)
+        self.log = GameLog(self.log_filename, GAME_LOG_COMPRESSION)
+        print('Writing', self.log.name)
+        if EVENT_JOURNAL:
+            self.journal = journal.EventJournal(self.log_filename + '.journal', [PLAYER_1_NAME, PLAYER_2_NAME])
+        self.log.append('6.176 MIT Pokerbots - ' + PLAYER_1_NAME + ' vs ' + PLAYER_2_NAME)
+
+    def log_round_start(self, players, round_num):
+        self.log.append('')
+        self.log.append('Round #' + str(round_num) + STATUS(players))
+
+    def close_logs(self):
+        self.log.close()
+        if self.journal is not None:
+            self.journal.close()
+
+    def run(self, players=None):
         '''
         Runs one game of poker.
+        Players which are already running, e.g. from a previous game, may be passed in and are left running.
+        Returns each player's final bankroll, keyed by name.
         '''
         print('   __  _____________  ___       __           __        __    ')
         print('  /  |/  /  _/_  __/ / _ \\___  / /_____ ____/ /  ___  / /____')
@@ -577,27 +1313,41 @@ class Game():
         print('/_/  /_/___/ /_/   /_/   \\___/_/\\_\\\\__/_/ /_.__/\\___/\\__/___/')
         print()
         print('Starting the Pokerbots engine...')
-        players = [
-            Player(PLAYER_1_NAME, PLAYER_1_PATH),
-            Player(PLAYER_2_NAME, PLAYER_2_PATH)
-        ]
-        for player in players:
-            player.build()
-            player.run()
-        for round_num in range(1, NUM_ROUNDS + 1):
-            self.log.append('')
-            self.log.append('Round #' + str(round_num) + STATUS(players))
-            self.run_round(players)
+        warm = players is not None
+        if not warm:
+            player_class = LocalPlayer if HEADLESS else Player
+            players = [
+                player_class(PLAYER_1_NAME, PLAYER_1_PATH, self.config),
+                player_class(PLAYER_2_NAME, PLAYER_2_PATH, self.config)
+            ]
+            for player in players:
+                player.build()
+                player.run()
+        if self.swap_seats:  # the other player receives the first seat's cards
             players = players[::-1]
-        self.log.append('')
-        self.log.append('Final' + STATUS(players))
+        if self.seed is not None:
+            print('Dealing with seed', self.seed)
+        self.open_logs()
+        try:
+            for round_num in range(self.first_round, self.first_round + self.config.num_rounds):
+                self.log_round_start(players, round_num)
+                self.run_round(players, round_num)
+                players = players[::-1]
+            self.log.append('')
+            self.log.append('Final' + STATUS(players))
+            if GAME_CLOCK_MODE == 'cpu':
+                self.log_clocks(players)
+        finally:
+            self.close_logs()
         print('Final' + STATUS(players))
         for player in players:
-            player.stop()
-        name = GAME_LOG_FILENAME + '.txt'
-        print('Writing', name)
-        with open(name, 'w') as log_file:
-            log_file.write('\n'.join(self.log))
+            if warm:
+                player.write_log()
+            else:
+                player.stop()
+        if LOG_LATENCY:
+            self.write_latencies(players)
+        return {player.name: player.bankroll for player in players}
 
 
 if __name__ == '__main__':
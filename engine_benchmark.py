@@ -0,0 +1,243 @@
+'''
+Measures the throughput of engine.py by playing seeded games between built-in trivial pokerbots,
+which spend almost no time thinking, so nearly all of the time measured is the engine's own.
+Results can be saved as a JSON baseline, and later runs are compared against it.
+'''
+from contextlib import redirect_stdout
+import tempfile
+import argparse
+import shutil
+import json
+import time
+import sys
+import os
+
+sys.path.append(os.getcwd())
+import engine
+
+SKELETON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), 'skeletons', 'python_skeleton'))
+# a pokerbot with one trivial strategy, which assigns its cards in the order they were dealt
+TRIVIAL_BOT = '''
+import random
+import sys
+sys.path.insert(0, {skeleton!r})
+from skeleton.actions import FoldAction, CallAction, CheckAction, RaiseAction, AssignAction
+from skeleton.bot import Bot
+from skeleton.runner import parse_args, run_bot
+
+STRATEGY = {strategy!r}
+
+
+class Player(Bot):
+    def __init__(self):
+        self.random = random.Random(STRATEGY)
+
+    def handle_new_round(self, game_state, round_state, active):
+        pass
+
+    def handle_round_over(self, game_state, terminal_state, active):
+        pass
+
+    def get_actions(self, game_state, round_state, active):
+        actions = []
+        for i, legal_actions in enumerate(round_state.legal_actions()):
+            if AssignAction in legal_actions:
+                actions.append(AssignAction(round_state.hands[active][2*i:2*i+2]))
+            elif STRATEGY == 'random':
+                action = self.random.choice(sorted(legal_actions, key=lambda action: action.__name__))
+                if action is RaiseAction:
+                    min_raise, max_raise = round_state.board_states[i].raise_bounds(round_state.button, round_state.stacks)
+                    action = RaiseAction(self.random.randint(min_raise, max_raise))
+                else:
+                    action = action()
+                actions.append(action)
+            elif STRATEGY == 'call' and CallAction in legal_actions:
+                actions.append(CallAction())
+            elif CheckAction in legal_actions:
+                actions.append(CheckAction())
+            else:
+                actions.append(FoldAction())
+        return actions
+
+
+if __name__ == '__main__':
+    run_bot(Player(), parse_args())
+'''
+STRATEGIES = ['check', 'call', 'random']
+MATCHUPS = ['check-call', 'call-call', 'random-random']
+# where the engine spends its time, each measured around the outermost call of these functions
+# rounds covers everything else, and the time spent in the pokerbots
+SECTIONS = {
+    'round': [(engine.Game, 'run_round')],
+    'proceed': [(engine.RoundState, 'proceed')],
+    'query': [(engine.Player, 'query')],
+    'logging': [(engine.Game, name) for name in ['log_round_start', 'log_round_state', 'log_actions', 'journal_actions', 'log_terminal_state']],
+    'deal': [(engine.Game, 'deal_round')],
+}
+
+
+class Profile():
+    '''
+    Accumulates the time spent in each section and on the socket, and the bytes sent and received.
+    '''
+
+    def __init__(self):
+        self.seconds = {section: 0. for section in list(SECTIONS) + ['socket']}
+        self.depth = {section: 0 for section in SECTIONS}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def wrap(self, function, section):
+        def timed(*args, **kwargs):
+            if self.depth[section] > 0:
+                return function(*args, **kwargs)
+            self.depth[section] += 1
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.seconds[section] += time.perf_counter() - start_time
+                self.depth[section] -= 1
+        return timed
+
+    def install(self):
+        '''
+        Replaces the engine functions in SECTIONS, and the socket files the engine opens, with timed versions.
+        Returns a function which restores the originals.
+        '''
+        originals = []
+        for section, functions in SECTIONS.items():
+            for owner, name in functions:
+                originals.append((owner, name, getattr(owner, name)))
+                setattr(owner, name, self.wrap(getattr(owner, name), section))
+        originals.append((engine, 'open_socketfile', engine.open_socketfile))
+        open_socketfile = engine.open_socketfile
+        engine.open_socketfile = lambda client_socket: TimedFile(open_socketfile(client_socket), self)
+        def uninstall():
+            for owner, name, function in originals:
+                setattr(owner, name, function)
+        return uninstall
+
+
+class TimedFile():
+    '''
+    Wraps a socket file, counting the time spent in it and the bytes passing through.
+    '''
+
+    def __init__(self, socketfile, profile):
+        self.socketfile = socketfile
+        self.profile = profile
+
+    def write(self, message):
+        start_time = time.perf_counter()
+        self.socketfile.write(message)
+        self.profile.seconds['socket'] += time.perf_counter() - start_time
+        self.profile.bytes_sent += len(message)
+
+    def flush(self):
+        start_time = time.perf_counter()
+        self.socketfile.flush()
+        self.profile.seconds['socket'] += time.perf_counter() - start_time
+
+    def readline(self):
+        start_time = time.perf_counter()
+        line = self.socketfile.readline()
+        self.profile.seconds['socket'] += time.perf_counter() - start_time
+        self.profile.bytes_received += len(line)
+        return line
+
+    def close(self):
+        self.socketfile.close()
+
+
+def make_bots(directory):
+    '''
+    Writes one pokerbot directory per trivial strategy. Returns their paths, keyed by strategy.
+    '''
+    paths = {}
+    for strategy in STRATEGIES:
+        path = os.path.join(directory, strategy)
+        os.makedirs(path)
+        with open(os.path.join(path, 'player.py'), 'w') as player_file:
+            player_file.write(TRIVIAL_BOT.format(skeleton=SKELETON_PATH, strategy=strategy))
+        with open(os.path.join(path, 'commands.json'), 'w') as commands_file:
+            json.dump({'build': [], 'run': ['python3', 'player.py']}, commands_file)
+        paths[strategy] = path
+    return paths
+
+
+def measure(matchup, paths, rounds, seed, directory):
+    '''
+    Plays one seeded game of the matchup through the engine and returns its throughput metrics.
+    '''
+    engine.PLAYER_1_PATH, engine.PLAYER_2_PATH = [paths[strategy] for strategy in matchup.split('-')]
+    engine.HEADLESS = False  # headless players have no socket to measure
+    config = engine.DEFAULT_CONFIG._replace(num_rounds=rounds, starting_game_clock=1e6)
+    profile = Profile()
+    uninstall = profile.install()
+    try:
+        game = engine.Game(seed, log_filename=os.path.join(directory, matchup), config=config)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            start_time = time.perf_counter()
+            game.run()
+            seconds = time.perf_counter() - start_time
+    finally:
+        uninstall()
+    # starting and stopping the pokerbots is left out
+    result = {
+        'rounds_per_second': rounds / profile.seconds['round'],
+        'bytes_sent_per_round': profile.bytes_sent / rounds,
+        'bytes_received_per_round': profile.bytes_received / rounds,
+        'total_seconds': seconds,
+    }
+    for section in list(SECTIONS) + ['socket']:
+        result[section + '_us_per_round'] = 1e6 * profile.seconds[section] / rounds
+    return result
+
+
+def print_results(results, baseline):
+    print('{:<16} {:<26} {:>12} {:>12} {:>8}'.format('matchup', 'metric', 'value', 'baseline', 'change'))
+    for matchup, metrics in results.items():
+        for metric, value in metrics.items():
+            line = '{:<16} {:<26} {:>12.1f}'.format(matchup, metric, value)
+            if matchup in baseline and metric in baseline[matchup]:
+                previous = baseline[matchup][metric]
+                change = '{:+.1f}%'.format(100 * (value - previous) / previous) if previous else ''
+                line += ' {:>12.1f} {:>8}'.format(previous, change)
+            print(line)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python3 engine_benchmark.py')
+    parser.add_argument('--rounds', type=int, default=2000, help='Number of rounds per game, defaults to 2000')
+    parser.add_argument('--repeats', type=int, default=3, help='Number of games per matchup, of which the fastest is reported, defaults to 3')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the deals, defaults to 1')
+    parser.add_argument('--matchups', nargs='+', default=MATCHUPS, help='Strategy pairs to play, from ' + ', '.join(STRATEGIES) + ', defaults to ' + ' '.join(MATCHUPS))
+    parser.add_argument('--baseline', type=str, default='engine_benchmark.json', help='JSON baseline to compare against, defaults to engine_benchmark.json')
+    parser.add_argument('--save', action='store_true', help='Save the results as the new baseline')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    directory = tempfile.mkdtemp(prefix='pokerbots')
+    working_directory = os.getcwd()
+    try:
+        paths = make_bots(directory)
+        os.chdir(directory)  # the pokerbots' output files go next to their game logs
+        results = {}
+        for matchup in args.matchups:  # keep the fastest repeat, which is the least disturbed by other processes
+            repeats = [measure(matchup, paths, args.rounds, args.seed, directory) for _ in range(args.repeats)]
+            results[matchup] = max(repeats, key=lambda result: result['rounds_per_second'])
+    finally:
+        os.chdir(working_directory)
+        shutil.rmtree(directory, ignore_errors=True)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+    if args.save:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print('Saved baseline to', args.baseline)
@@ -8,6 +8,8 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import statistics
 import itertools
+import gzip
+import lzma
 
 # assumes playing "A" vs "B"
 GAME_LOG_FILE = 'game_log.txt'
@@ -316,7 +318,9 @@ total_aggressions = {0: {A: 0, B: 0}, 3: {A: 0, B: 0}, 4: {A: 0, B: 0}, 5: {A: 0
 rounds_data = []
 
 # read in game log file
-f = open(GAME_LOG_FILE)
+# the engine may write gzip or lzma compressed logs
+log_opener = gzip.open if GAME_LOG_FILE.endswith('.gz') else lzma.open if GAME_LOG_FILE.endswith('.xz') else open
+f = log_opener(GAME_LOG_FILE, 'rt')
 loglines = f.readlines()
 
 # output file
@@ -12,6 +12,8 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import statistics
 import itertools
+import gzip
+import lzma
 
 import os
 
@@ -344,7 +346,9 @@ for filename in os.listdir(directory):
 	rounds_data = []
 
 	# read in game log file
-	f = open(GAME_LOG_FILE)
+	# the engine may write gzip or lzma compressed logs
+	log_opener = gzip.open if GAME_LOG_FILE.endswith('.gz') else lzma.open if GAME_LOG_FILE.endswith('.xz') else open
+	f = log_opener(GAME_LOG_FILE, 'rt')
 	loglines = f.readlines()
 
 	# output file
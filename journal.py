@@ -0,0 +1,94 @@
+'''
+Binary event journal written by the engine alongside the text game log.
+Every record has the same 40 byte layout, so journals can be memory-mapped and read without parsing text.
+'''
+from collections import namedtuple
+import struct
+import mmap
+
+# header: magic, then the names of the first and second player in config.py
+HEADER = struct.Struct('<4s32s32s')
+MAGIC = b'PBJ2'
+# record: round, kind, seat, board, street, action code, six card codes, raise amount or bankroll, pot, two pips, two stacks
+RECORD = struct.Struct('<IBbbBc6sxi5i')
+# the same layout for numpy.memmap(path, dtype=NUMPY_DTYPE, offset=HEADER.size)
+NUMPY_DTYPE = [('round_num', '<u4'), ('kind', 'u1'), ('seat', 'i1'), ('board', 'i1'), ('street', 'u1'),
+               ('code', 'S1'), ('cards', 'u1', (6,)), ('pad', 'V1'), ('amount', '<i4'), ('pot', '<i4'),
+               ('pips', '<i4', (2,)), ('stacks', '<i4', (2,))]
+
+# kinds of record
+ROUND = 0    # seat: index of the player in seat 0 this round, amount: that player's bankroll, stacks: after the blinds
+DEAL = 1     # seat, cards: the six cards dealt to the seat
+ASSIGN = 2   # seat, board, cards: the two cards assigned to the board
+ACTION = 3   # seat, board, street, code (F, C, K or R), amount: raise target, pot, pips and stacks before the action
+STREET = 4   # board, street, cards: the community cards so far, pot, stacks
+SHOW = 5     # seat, board, cards: the two cards shown at showdown
+PAYOFF = 6   # board (-1 for the whole round), pot, pips: each seat's winnings on the board, or bankroll deltas for the round
+KIND_NAMES = ['ROUND', 'DEAL', 'ASSIGN', 'ACTION', 'STREET', 'SHOW', 'PAYOFF']
+
+NO_CARD = 255
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+
+Event = namedtuple('Event', ['round_num', 'kind', 'seat', 'board', 'street', 'code', 'cards', 'amount', 'pot', 'pips', 'stacks'])
+
+
+def card_code(card):
+    '''
+    Encodes an eval7.Card as an integer from 0 to 51.
+    '''
+    return 4 * card.rank + card.suit
+
+
+def card_string(code):
+    '''
+    Decodes an integer card code into the engine's common format, e.g. 'Ts'.
+    '''
+    return RANKS[code // 4] + SUITS[code % 4]
+
+
+class EventJournal():
+    '''
+    Appends fixed size event records to a journal file.
+    '''
+
+    def __init__(self, filename, names):
+        self.file = open(filename, 'wb')
+        self.file.write(HEADER.pack(MAGIC, names[0].encode()[:32], names[1].encode()[:32]))
+
+    def record(self, round_num, kind, seat=-1, board=-1, street=0, code=b'-', cards=(), amount=0, pot=0, pips=(0, 0), stacks=(0, 0)):
+        '''
+        Appends one event. Cards are eval7.Card objects; missing cards are stored as NO_CARD.
+        '''
+        codes = bytes([card_code(card) for card in cards] + [NO_CARD] * (6 - len(cards)))
+        self.file.write(RECORD.pack(round_num, kind, seat, board, street, code, codes, amount, pot, pips[0], pips[1], stacks[0], stacks[1]))
+
+    def close(self):
+        self.file.close()
+
+
+def read_journal(filename):
+    '''
+    Memory-maps a journal. Returns the player names and a list of its events, with cards as integer codes.
+    '''
+    with open(filename, 'rb') as journal_file:
+        with mmap.mmap(journal_file.fileno(), 0, access=mmap.ACCESS_READ) as journal_map:
+            magic, name_0, name_1 = HEADER.unpack_from(journal_map)
+            if magic != MAGIC:
+                raise ValueError(filename + ' is not an event journal')
+            view = memoryview(journal_map)[HEADER.size:]
+            events = [Event(round_num, kind, seat, board, street, code.decode(), tuple(card for card in cards if card != NO_CARD),
+                            amount, pot, (pip_0, pip_1), (stack_0, stack_1))
+                      for round_num, kind, seat, board, street, code, cards, amount, pot, pip_0, pip_1, stack_0, stack_1
+                      in RECORD.iter_unpack(view)]
+            view.release()
+    return [name_0.rstrip(b'\0').decode(), name_1.rstrip(b'\0').decode()], events
+
+
+if __name__ == '__main__':
+    import sys
+    names, events = read_journal(sys.argv[1])
+    print('Journal of', names[0], 'vs', names[1])
+    for event in events:
+        print(event.round_num, KIND_NAMES[event.kind], event.seat, event.board, event.street, event.code,
+              ' '.join(map(card_string, event.cards)), event.amount, event.pot, event.pips, event.stacks)
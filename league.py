@@ -0,0 +1,182 @@
+'''
+Plays a round-robin league between every pokerbot in the repository on a pool of worker processes.
+Every ordered pairing plays the same seeded deals, so each deal is played once from either seat.
+Results are cached by the hashes of both pokerbots' files and the seed, so only pairings involving
+changed pokerbots are played again, and a ratings table is printed from all results.
+'''
+from contextlib import redirect_stdout
+import multiprocessing
+import itertools
+import argparse
+import hashlib
+import math
+import json
+import sys
+import os
+
+sys.path.append(os.getcwd())
+import engine
+import build_cache
+from config import *
+
+# directories never searched for pokerbots
+SKIPPED_DIRECTORIES = {'.git', '__pycache__', 'skeletons', 'logs'}
+
+
+def discover(root):
+    '''
+    Returns the path, relative to root, of every directory holding a commands.json, without looking inside pokerbots.
+    '''
+    bots = []
+    for directory, directories, files in os.walk(root):
+        if 'commands.json' in files and os.path.abspath(directory) != os.path.abspath(root):
+            bots.append(os.path.relpath(directory, root))
+            directories[:] = []
+        else:
+            directories[:] = sorted(d for d in directories if d not in SKIPPED_DIRECTORIES and not d.startswith('.'))
+    return sorted(bots)
+
+
+def bot_hash(path):
+    '''
+    Hashes every file of a pokerbot apart from its build output, as the build cache tells them apart.
+    '''
+    digest = hashlib.sha256()
+    try:
+        with open(os.path.join(path, 'commands.json')) as json_file:
+            declared = json.load(json_file).get('artifacts', ())
+    except (OSError, ValueError, AttributeError):
+        declared = ()
+    build_cache.hash_files(digest, path, declared)
+    return digest.hexdigest()[:16]
+
+
+def result_key(hashes, seed):
+    return '{}:{}:{}'.format(hashes[0], hashes[1], seed)
+
+
+def load_results(path):
+    '''
+    Returns the cached results of earlier league runs, unless they were played under a different match config.
+    '''
+    try:
+        with open(path) as results_file:
+            cache = json.load(results_file)
+    except (OSError, ValueError):
+        return {}
+    return cache['results'] if cache.get('config') == list(engine.DEFAULT_CONFIG) else {}
+
+
+def save_results(path, results):
+    with open(path + '.tmp', 'w') as results_file:
+        json.dump({'config': list(engine.DEFAULT_CONFIG), 'results': results}, results_file, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def play_game(task):
+    '''
+    Runs one game of a pairing in its own directory with fresh pokerbots. Returns the task and the pairing's chips won.
+    '''
+    key, paths, match_dir, seed = task
+    engine.PLAYER_1_PATH, engine.PLAYER_2_PATH = paths
+    os.makedirs(match_dir, exist_ok=True)
+    os.chdir(match_dir)
+    with open('engine_output.txt', 'w') as output, redirect_stdout(output):
+        bankrolls = engine.Game(seed).run()
+    return task, [bankrolls[PLAYER_1_NAME], bankrolls[PLAYER_2_NAME]]
+
+
+def ratings(bots, games):
+    '''
+    Fits Bradley-Terry strengths to the wins in games, a list of (bot, opponent, chips, opponent chips), with ties as half wins.
+    Each bot also gets one win and one loss against a virtual average opponent, so unbeaten bots have finite ratings.
+    Returns Elo-scaled ratings keyed by bot.
+    '''
+    wins = {bot: 1. for bot in bots}
+    meetings = {}
+    for bot, opponent, chips, opponent_chips in games:
+        wins[bot] += 1. if chips > opponent_chips else .5 if chips == opponent_chips else 0.
+        wins[opponent] += 1. if opponent_chips > chips else .5 if chips == opponent_chips else 0.
+        pair = tuple(sorted((bot, opponent)))
+        meetings[pair] = meetings.get(pair, 0) + 1
+    strengths = {bot: 1. for bot in bots}
+    for _ in range(200):
+        for bot in bots:
+            denominator = 2. / (strengths[bot] + 1.)
+            for (first, second), count in meetings.items():
+                if bot in (first, second):
+                    opponent = second if bot == first else first
+                    denominator += count / (strengths[bot] + strengths[opponent])
+            strengths[bot] = wins[bot] / denominator
+    return {bot: 400. * math.log10(strength) for bot, strength in strengths.items()}
+
+
+def print_table(bots, results, keys):
+    '''
+    Prints each bot's rating, games, wins and mean chips per game over the results of the current pairings.
+    '''
+    games = []
+    for (bot, opponent), pairing_keys in keys.items():
+        games.extend((bot, opponent, results[key][0], results[key][1]) for key in pairing_keys if key in results)
+    rating = ratings(bots, games)
+    print('{:<50} {:>7} {:>6} {:>6} {:>10}'.format('bot', 'rating', 'games', 'wins', 'chips/game'))
+    for bot in sorted(bots, key=lambda bot: -rating[bot]):
+        chips = [chips for first, _, chips, _ in games if first == bot] + [chips for _, second, _, chips in games if second == bot]
+        won = sum(chips > opponent_chips for first, _, chips, opponent_chips in games if first == bot)
+        won += sum(chips > opponent_chips for _, second, opponent_chips, chips in games if second == bot)
+        mean = sum(chips) / len(chips) if chips else 0.
+        print('{:<50} {:>7.0f} {:>6} {:>6} {:>10.1f}'.format(bot, rating[bot], len(chips), won, mean))
+
+
+def run_league(bots, game_num, workers, out_dir, seed):
+    '''
+    Plays game_num seeded games of every ordered pairing of bots whose result is not cached, then prints the ratings table.
+    '''
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    results_path = os.path.join(out_dir, 'results.json')
+    results = load_results(results_path)
+    hashes = {bot: bot_hash(bot) for bot in bots}
+    seeds = ['{}:{}'.format(seed, i) for i in range(1, game_num + 1)]
+    keys = {}
+    tasks = []
+    for bot, opponent in itertools.permutations(bots, 2):
+        keys[(bot, opponent)] = [result_key((hashes[bot], hashes[opponent]), game_seed) for game_seed in seeds]
+        for key, game_seed in zip(keys[(bot, opponent)], seeds):
+            if key not in results:
+                game_name = '{}_vs_{}_{}'.format(bot.lstrip(os.sep), opponent.lstrip(os.sep), game_seed)
+                match_dir = os.path.join(out_dir, 'games', game_name.replace(os.sep, '.').replace(':', '_'))
+                tasks.append((key, (os.path.abspath(bot), os.path.abspath(opponent)), match_dir, game_seed))
+    print('Playing', len(tasks), 'of', len(keys) * game_num, 'games, the rest are cached')
+    if tasks:
+        with multiprocessing.Pool(workers) as pool:
+            for finished, (task, chips) in enumerate(pool.imap_unordered(play_game, tasks), 1):
+                results[task[0]] = chips
+                save_results(results_path, results)
+                print('[{}/{}] {} finished'.format(finished, len(tasks), os.path.basename(task[2])) + ''.join(
+                    engine.PVALUE(name, value) for name, value in zip((PLAYER_1_NAME, PLAYER_2_NAME), chips)))
+            pool.close()
+            pool.join()
+    print()
+    print_table(bots, results, keys)
+
+
+def parse_args():
+    '''
+    Parses arguments choosing the pokerbots and the size of the league.
+    '''
+    parser = argparse.ArgumentParser(prog='python3 league.py')
+    parser.add_argument('--bots', nargs='+', default=None, help='Pokerbot directories to play, defaults to every directory with a commands.json outside skeletons')
+    parser.add_argument('--exclude', nargs='+', default=[], help='Pokerbot directories to leave out')
+    parser.add_argument('--games', type=int, default=2, help='Number of seeded games per ordered pairing, defaults to 2')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of games to run at once, defaults to the CPU count')
+    parser.add_argument('--out-dir', type=str, default='league', help='Directory holding the results cache and one subdirectory per game, defaults to league')
+    parser.add_argument('--seed', type=int, default=SEED if SEED is not None else 0, help='Base seed of the deals, defaults to SEED in config.py or 0')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    bots = [os.path.normpath(bot) for bot in (args.bots or discover('.'))]
+    bots = [bot for bot in bots if bot not in {os.path.normpath(bot) for bot in args.exclude}]
+    run_league(bots, args.games, args.workers, args.out_dir, args.seed)
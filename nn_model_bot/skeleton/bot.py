@@ -7,6 +7,22 @@ class Bot():
     '''
     The base class for a pokerbot.
     '''
+    # set PONDER to True to have run_bot start a pondering worker, see skeleton/ponder.py
+    PONDER = False
+    ponderer = None
+
+    def handle_new_game(self):
+        '''
+        Called when the engine starts another game without restarting the pokerbot.
+        Override this to reset anything that should not carry over between games.
+
+        Arguments:
+        Nothing.
+
+        Returns:
+        Nothing.
+        '''
+        pass
 
     def handle_new_round(self, game_state, round_state, active):
         '''
@@ -50,3 +66,32 @@ class Bot():
         Your actions.
         '''
         raise NotImplementedError('get_actions')
+
+    def ponder_tasks(self, game_state, round_state, active):
+        '''
+        Called after your actions are sent, if PONDER is True. Optional.
+        Returns the work for the pondering worker to do while the engine waits on your opponent,
+        as a list of (key, args) tasks, most useful first. The worker calls ponder(*args) for each task
+        and stores the result under key, where get_actions can look it up with self.ponderer.get(key).
+
+        Arguments:
+        game_state: the GameState object.
+        round_state: the RoundState object.
+        active: your player's index.
+
+        Returns:
+        Your tasks.
+        '''
+        return []
+
+    def ponder(self, *args):
+        '''
+        Called in the pondering worker process with the args of one task. Optional.
+
+        Arguments:
+        The task's args.
+
+        Returns:
+        The task's result.
+        '''
+        return None
@@ -5,13 +5,15 @@ from skeleton.actions import FoldAction, CallAction, CheckAction, RaiseAction, A
 from skeleton.states import GameState, TerminalState, RoundState, BoardState
 from skeleton.states import NUM_ROUNDS, STARTING_STACK, BIG_BLIND, SMALL_BLIND, NUM_BOARDS
 from skeleton.bot import Bot
+from skeleton.budget import ComputeBudget
+from skeleton.equity import Estimate, anytime_estimate
 from skeleton.runner import parse_args, run_bot
+from skeleton.log import log, DEBUG, WARNING
 
 import eval7
 import random
 import time
 
-import sys, os
 
 class Game:
     def __init__(self):
@@ -49,25 +51,16 @@ class Player(Bot):
         self.sampling_duration_total = 0
         self.round = Round()
 
-        self._MONTE_CARLO_ITERS = 100
+        self.budget = ComputeBudget()  # chooses the number of Monte Carlo iterations from the game clock left
+        self.TARGET_STDERR = 0.03  # standard error at which a win probability estimate is precise enough, so clear-cut spots stop sampling early
         self.RANDOMIZATION_ON = False  # whether to randomize ordering of holes to avoid deterministic exploitation
 
-        # self.enablePrint()
-        self.blockPrint()
+        # log.set_level(DEBUG)
+        log.set_level(WARNING)
 
         # random.seed(10)
 
 
-
-
-    # Disable
-    def blockPrint(self):
-        sys.stdout = open(os.devnull, 'w')
-
-    # Restore
-    def enablePrint(self):
-        sys.stdout = sys.__stdout__
-
     def allocate_cards(self, my_cards):
         '''
         Method that allocates our cards at the beginning of a round. Method
@@ -79,8 +72,8 @@ class Player(Bot):
         my_cards: a list of the 6 cards given to us at round start
         '''
 
-        print("Allocating cards")
-        print()
+        log.debug("Allocating cards")
+        log.debug()
 
         ranks = {}
 
@@ -127,14 +120,14 @@ class Player(Bot):
             cards = [allocation[2*i], allocation[2*i + 1]]
             self.board_allocations[i] = cards #record our allocations
 
-        print("Calculating strength")
-        print("Calculating strength")
-        print("Calculating strength")
+        log.debug("Calculating strength")
+        log.debug("Calculating strength")
+        log.debug("Calculating strength")
 
         board_strengths = {}
 
         for i in range(1, 4):
-            self.round.boards[i].strength_per_street[0] = self.calculate_strength(self.board_allocations[i-1], my_cards, [], self._MONTE_CARLO_ITERS)
+            self.round.boards[i].strength_per_street[0] = self.budget.estimate(lambda iters, deadline: self.calculate_strength(self.board_allocations[i-1], my_cards, [], iters, self.TARGET_STDERR, deadline), 0, BIG_BLIND + SMALL_BLIND).strength
             board_strengths[frozenset(self.board_allocations[i-1])] = self.round.boards[i].strength_per_street[0]
 
         self.board_allocations.sort(key=lambda x: board_strengths[frozenset(x)])
@@ -150,14 +143,18 @@ class Player(Bot):
                 self.board_allocations[1] = self.board_allocations[0]
                 self.board_allocations[0] = temp
 
-    def calculate_strength(self, hole_cards, my_cards, community_cards, iters):
+    def calculate_strength(self, hole_cards, my_cards, community_cards, iters, target_stderr=None, deadline=None):
         '''
         A Monte Carlo method meant to estimate the win probability of a pair of 
-        hole cards. Simlulates 'iters' games and determines the win rates of our cards
+        hole cards. Simlulates up to 'iters' games and determines the win rates of our cards
 
         Arguments:
         hole: a list of our two hole cards
         iters: a integer that determines how many Monte Carlo samples to take
+        target_stderr: optional standard error at which to stop sampling early
+        deadline: optional time.perf_counter() value at which to stop sampling early
+
+        Returns an Estimate of our win probability, its standard error and the number of samples taken.
         '''
         self.round.calculate_strength_called += 1
 
@@ -174,48 +171,47 @@ class Player(Bot):
         for card in community_cards: #remove cards that we know about! they shouldn't come up in simulations
             deck.cards.remove(card)
 
-        score = 0
+        def outcomes(): # 1 for each win, 1/2 for each tie, 0 for each loss
+            for _ in range(iters): #take up to 'iters' samples
+
+                _COMM = 5 - len(community_cards) #the number of cards we need to draw
+                _OPP = 2
 
-        for _ in range(iters): #take 'iters' samples
+                draw = deck.sample(_COMM + _OPP)
 
-            _COMM = 5 - len(community_cards) #the number of cards we need to draw
-            _OPP = 2
+                opp_hole = draw[: _OPP]
+                hidden_community = draw[_OPP: ]
 
-            draw = deck.sample(_COMM + _OPP)
+                our_hand = hole_cards + community_cards + hidden_community #the two showdown hands
+                opp_hand = opp_hole + community_cards + hidden_community
 
-            opp_hole = draw[: _OPP]
-            hidden_community = draw[_OPP: ]
+                our_key = frozenset(our_hand)
+                opp_key = frozenset(opp_hand)
 
-            our_hand = hole_cards + community_cards + hidden_community #the two showdown hands
-            opp_hand = opp_hole + community_cards + hidden_community
+                if our_key not in self.round.eval_hand_memo:
+                    our_hand_value = eval7.evaluate(our_hand) #the ranks of our hands (only useful for comparisons)
+                    self.round.eval_hand_memo[our_key] = our_hand_value
+                    self.round.eval_count += 1
+                else:
+                    our_hand_value = self.round.eval_hand_memo[our_key]
 
-            our_key = frozenset(our_hand)
-            opp_key = frozenset(opp_hand)
+                if opp_key not in self.round.eval_hand_memo:
+                    opp_hand_value = eval7.evaluate(opp_hand)
+                    self.round.eval_hand_memo[opp_key] = opp_hand_value
+                    self.round.eval_count += 1
+                else:
+                    opp_hand_value = self.round.eval_hand_memo[opp_key]
 
-            if our_key not in self.round.eval_hand_memo:
-                our_hand_value = eval7.evaluate(our_hand) #the ranks of our hands (only useful for comparisons)
-                self.round.eval_hand_memo[our_key] = our_hand_value
-                self.round.eval_count += 1
-            else:
-                our_hand_value = self.round.eval_hand_memo[our_key]
+                if our_hand_value > opp_hand_value: #we win!
+                    yield 1.
 
-            if opp_key not in self.round.eval_hand_memo:
-                opp_hand_value = eval7.evaluate(opp_hand)
-                self.round.eval_hand_memo[opp_key] = opp_hand_value
-                self.round.eval_count += 1
-            else:
-                opp_hand_value = self.round.eval_hand_memo[opp_key]
+                elif our_hand_value == opp_hand_value: #we tie.
+                    yield .5
 
-            if our_hand_value > opp_hand_value: #we win!
-                score += 2
-            
-            elif our_hand_value == opp_hand_value: #we tie.
-                score += 1
-            
-            else: #we lost....
-                score += 0
-        
-        hand_strength = score / (2 * iters) #this is our win probability!
+                else: #we lost....
+                    yield 0.
+
+        estimate = anytime_estimate(outcomes(), iters, target_stderr, deadline) #this is our win probability!
 
         sampling_duration = time.time() - start_sampling_time
 
@@ -223,7 +219,20 @@ class Player(Bot):
 
         # print("sampling duration", sampling_duration)
 
-        return hand_strength
+        return estimate
+
+    def handle_new_game(self):
+        '''
+        Called when the engine reuses this pokerbot for another game.
+
+        Arguments:
+        Nothing.
+
+        Returns:
+        Nothing.
+        '''
+        self.sampling_duration_total = 0
+        self.round = Round()
 
     def handle_new_round(self, game_state, round_state, active):
         '''
@@ -239,8 +248,8 @@ class Player(Bot):
         '''
         self.round = Round()
 
-        print("New round!")
-        print()
+        log.debug("New round!")
+        log.debug()
         my_bankroll = game_state.bankroll  # the total number of chips you've gained or lost from the beginning of the game to the start of this round
         opp_bankroll = game_state.opp_bankroll # ^but for your opponent
         game_clock = game_state.game_clock  # the total number of seconds your bot has left to play this game
@@ -248,6 +257,7 @@ class Player(Bot):
         my_cards = round_state.hands[active]  # your six cards at the start of the round
         big_blind = bool(active)  # True if you are the big blind
         
+        self.budget.start_round(game_state)
         self.allocate_cards(my_cards) #our old allocation strategy
 
     def handle_round_over(self, game_state, terminal_state, active):
@@ -262,57 +272,58 @@ class Player(Bot):
         Returns:
         Nothing.
         '''
-        print("Round over!")
-        print()
+        log.debug("Round over!")
+        log.debug()
         my_delta = terminal_state.deltas[active]  # your bankroll change from this round
         opp_delta = terminal_state.deltas[1-active] # your opponent's bankroll change from this round 
         previous_state = terminal_state.previous_state  # RoundState before payoffs
         street = previous_state.street  # 0, 3, 4, or 5 representing when this round ended
         i = 1
-        print("My remaining stack is", previous_state.stacks[active])
-        print()
-
-        for terminal_board_state in previous_state.board_states:
-            print("Board", i)
-            previous_board_state = terminal_board_state.previous_state
-            my_cards = previous_board_state.hands[active]  # your cards
-            opp_cards = previous_board_state.hands[1-active]  # opponent's cards or [] if not revealed
-            community_cards = previous_board_state.deck
-            my_cards = [card for card in my_cards if card]
-            opp_cards = [card for card in opp_cards if card]
-            community_cards = [card for card in community_cards if card]
-            print("My cards are", my_cards)
-            print("Opp cards are", opp_cards)
-            print("Comm cards are", community_cards)
-
-            # someone folded before showdown
-            if not opp_cards or not my_cards:
-                if terminal_board_state.deltas[active] > terminal_board_state.deltas[1 - active]:
-                    print("Opponent folded, so I win on this board", terminal_board_state.deltas[active])
-                else:
-                    print("I folded, so I gain nothing on this board")
-            # showdown winner
-            else:
-                my_cards = [eval7.Card(card) for card in my_cards if card]
-                opp_cards = [eval7.Card(card) for card in opp_cards if card]
-                community_cards = [eval7.Card(card) for card in community_cards if card]
-
-                my_hand = eval7.evaluate(my_cards + community_cards)
-                opp_hand = eval7.evaluate(opp_cards + community_cards)
-
-                if my_hand > opp_hand:
-                    print("I win on this showdown board", previous_board_state.pot)
-                elif opp_hand > my_hand:
-                    print("I lost on this showdown board, so I gain nothing on this showdown board")
+        log.debug("My remaining stack is", previous_state.stacks[active])
+        log.debug()
+
+        if log.level <= DEBUG:  # the walk over the boards, showdown evaluations included, only feeds the debug output
+            for terminal_board_state in previous_state.board_states:
+                log.debug("Board", i)
+                previous_board_state = terminal_board_state.previous_state
+                my_cards = previous_board_state.hands[active]  # your cards
+                opp_cards = previous_board_state.hands[1-active]  # opponent's cards or [] if not revealed
+                community_cards = previous_board_state.deck
+                my_cards = [card for card in my_cards if card]
+                opp_cards = [card for card in opp_cards if card]
+                community_cards = [card for card in community_cards if card]
+                log.debug("My cards are", my_cards)
+                log.debug("Opp cards are", opp_cards)
+                log.debug("Comm cards are", community_cards)
+
+                # someone folded before showdown
+                if not opp_cards or not my_cards:
+                    if terminal_board_state.deltas[active] > terminal_board_state.deltas[1 - active]:
+                        log.debug("Opponent folded, so I win on this board", terminal_board_state.deltas[active])
+                    else:
+                        log.debug("I folded, so I gain nothing on this board")
+                # showdown winner
                 else:
-                    print("Tie, so I gain on this showdown board", previous_board_state.pot // 2)
-            print()
-            i += 1
-
-        print("I win on this round total:", my_delta)
-        print("Eval called", self.round.eval_count)
-        print("calculate_strength called", self.round.calculate_strength_called)
-        print()
+                    my_cards = [eval7.Card(card) for card in my_cards if card]
+                    opp_cards = [eval7.Card(card) for card in opp_cards if card]
+                    community_cards = [eval7.Card(card) for card in community_cards if card]
+
+                    my_hand = eval7.evaluate(my_cards + community_cards)
+                    opp_hand = eval7.evaluate(opp_cards + community_cards)
+
+                    if my_hand > opp_hand:
+                        log.debug("I win on this showdown board", previous_board_state.pot)
+                    elif opp_hand > my_hand:
+                        log.debug("I lost on this showdown board, so I gain nothing on this showdown board")
+                    else:
+                        log.debug("Tie, so I gain on this showdown board", previous_board_state.pot // 2)
+                log.debug()
+                i += 1
+
+        log.debug("I win on this round total:", my_delta)
+        log.debug("Eval called", self.round.eval_count)
+        log.debug("calculate_strength called", self.round.calculate_strength_called)
+        log.debug()
         
         self.board_allocations = [[], [], []] #reset our variables at the end of every round!
         self.hole_strengths = [0, 0, 0]
@@ -321,8 +332,8 @@ class Player(Bot):
         round_num = game_state.round_num #Monte Carlo takes a lot of time, we use this to adjust!
 
         if round_num == NUM_ROUNDS:
-            print("Time remaining after all rounds:", game_clock)
-            print("Total sampling duration:", self.sampling_duration_total)
+            log.info("Time remaining after all rounds:", game_clock)
+            log.info("Total sampling duration:", self.sampling_duration_total)
         
 
     def get_actions(self, game_state, round_state, active):
@@ -339,8 +350,8 @@ class Player(Bot):
         Your actions.
         '''
 
-        print("*** get_actions called ***")
-        print()
+        log.debug("*** get_actions called ***")
+        log.debug()
         legal_actions = round_state.legal_actions()  # the actions you are allowed to take
         street = round_state.street  # 0, 3, 4, or 5 representing pre-flop, flop, turn, or river respectively
         my_cards = round_state.hands[active]  # your cards across all boards
@@ -351,175 +362,180 @@ class Player(Bot):
         my_stack = round_state.stacks[active]  # the number of chips you have remaining
         opp_stack = round_state.stacks[1-active]  # the number of chips your opponent has remaining
         stacks = [my_stack, opp_stack]
-        print("Before choosing board actions, my stack is", my_stack)
-        print()
+        log.debug("Before choosing board actions, my stack is", my_stack)
+        log.debug()
         net_upper_raise_bound = round_state.raise_bounds()[1] # max raise across 3 boards
         net_cost = 0 # keep track of the net additional amount you are spending across boards this round
 
         round = self.round
         if street != round.current_street:
-            print("New street")
+            log.debug("New street")
             # do stuff on new betting round? setup?
             round.current_street = street
 
         my_actions = [None] * NUM_BOARDS
         for i in range(NUM_BOARDS):
-            print("~ Currently solving board", i+1, " ~")
+            log.debug("~ Currently solving board", i+1, " ~")
             if isinstance(round_state.board_states[i], TerminalState):
-                print("This board is Terminal.")
-                print("!!!!")
+                log.debug("This board is Terminal.")
+                log.debug("!!!!")
             elif round_state.board_states[i].settled:
-                print("This board is settled, can only check.")
-                print("!!!!")
+                log.debug("This board is settled, can only check.")
+                log.debug("!!!!")
 
             board = round.boards[i+1]
 
             hole_cards = self.board_allocations[i]
 
             if AssignAction in legal_actions[i]:
-                print("Assigning preferred hole cards")
+                log.debug("Assigning preferred hole cards")
                 my_actions[i] = AssignAction(hole_cards) #add to our actions
 
             elif isinstance(round_state.board_states[i], TerminalState): #make sure the game isn't over at this board
-                print("At a terminal state")
+                log.debug("At a terminal state")
                 my_actions[i] = CheckAction() #check if it is
 
             # round of active play
             else: #do we add more resources?
 
-                print("Hole cards on this board are", hole_cards)
-                print("Visible community cards are", [card for card in board_cards[i] if card])
-                print()
+                log.debug("Hole cards on this board are", hole_cards)
+                if log.level <= DEBUG:
+                    log.debug("Visible community cards are", [card for card in board_cards[i] if card])
+                log.debug()
                 visible_community_cards = [card for card in board_cards[i] if card]
 
                 if board.strength_per_street[round.current_street]:
-                    print("Avoided recalculating")
+                    log.debug("Avoided recalculating")
                     strength = board.strength_per_street[round.current_street]
                 else:
-                    print("Calculating strength")
-                    strength = self.calculate_strength(self.board_allocations[i], my_cards, visible_community_cards, self._MONTE_CARLO_ITERS)
+                    log.debug("Calculating strength")
+                    # the last street's strength weighs how close this decision is, and stands in for it when the clock is low
+                    prior = next((board.strength_per_street[s] for s in (4, 3, 0) if s < round.current_street and board.strength_per_street[s]), None)
+                    pot = round_state.board_states[i].pot + my_pips[i] + opp_pips[i]
+                    fallback = Estimate(prior, None, 0) if prior else None
+                    strength = self.budget.estimate(lambda iters, deadline: self.calculate_strength(self.board_allocations[i], my_cards, visible_community_cards, iters, self.TARGET_STDERR, deadline), street, pot, prior, fallback).strength
                     board.strength_per_street[round.current_street] = strength
 
-                print("Calculated strength of hole cards and board is", strength)
-                print()
+                log.debug("Calculated strength of hole cards and board is", strength)
+                log.debug()
 
-                print("Round of active play")
-                print("Our stack has", my_stack - net_cost)
+                log.debug("Round of active play")
+                log.debug("Our stack has", my_stack - net_cost)
                 board_cont_cost = continue_cost[i] #we need to pay this to keep playing
                 board_total = round_state.board_states[i].pot #amount before we started betting
                 pot_total = my_pips[i] + opp_pips[i] + board_total #total money in the pot right now
-                print("Old pot has", round_state.board_states[i].pot, ", my pips are", my_pips[i], ", opponent pips are", opp_pips[i])
-                print("Pot total is", pot_total)
-                print("Continue cost is", board_cont_cost)
+                log.debug("Old pot has", round_state.board_states[i].pot, ", my pips are", my_pips[i], ", opponent pips are", opp_pips[i])
+                log.debug("Pot total is", pot_total)
+                log.debug("Continue cost is", board_cont_cost)
                 min_raise, max_raise = round_state.board_states[i].raise_bounds(active, round_state.stacks)
-                print("Min raise is", min_raise, ", max raise is", max_raise)
+                log.debug("Min raise is", min_raise, ", max raise is", max_raise)
                 # strength = self.hole_strengths[i]
                 # print("Current street is", street)
 
                 if street < 3: #pre-flop
                     raise_amount = int(my_pips[i] + board_cont_cost + 0.4 * (pot_total + board_cont_cost)) #play a little conservatively pre-flop
-                    print("Desired pre-flop raise amount is", raise_amount)
+                    log.debug("Desired pre-flop raise amount is", raise_amount)
                 else:
                     raise_amount = int(my_pips[i] + board_cont_cost + 0.75 * (pot_total + board_cont_cost)) #raise the stakes deeper into the game
-                    print("Desired post-flop raise amount is", raise_amount)
+                    log.debug("Desired post-flop raise amount is", raise_amount)
 
 
                 raise_amount = max([min_raise, raise_amount]) #make sure we have a valid raise
                 raise_amount = min([max_raise, raise_amount])
 
-                print("After bounding raise_amount, desired raise amount is", raise_amount)
+                log.debug("After bounding raise_amount, desired raise amount is", raise_amount)
 
                 raise_cost = raise_amount - my_pips[i] #how much it costs to make that raise
 
-                print("This raise will cost", raise_cost)
+                log.debug("This raise will cost", raise_cost)
 
-                print()
+                log.debug()
 
                 if RaiseAction in legal_actions[i] and (raise_cost <= my_stack - net_cost): #raise if we can and if we can afford it
-                    print("Commit action is Raise because we can afford the full desired raise, raising to",raise_amount, ", costing", raise_cost)
+                    log.debug("Commit action is Raise because we can afford the full desired raise, raising to",raise_amount, ", costing", raise_cost)
                     commit_action = RaiseAction(raise_amount)
                     commit_cost = raise_cost
 
                 elif CallAction in legal_actions[i] and (board_cont_cost <= my_stack - net_cost):  # call if we can afford it!:
-                    print("Commit action is Call, can't afford full raise, paying", board_cont_cost)
+                    log.debug("Commit action is Call, can't afford full raise, paying", board_cont_cost)
                     commit_action = CallAction()
                     commit_cost = board_cont_cost  # the cost to call is board_cont_cost
 
                 elif CheckAction in legal_actions[i]:  # try to check if we can
-                    print("Commit action is Check")
+                    log.debug("Commit action is Check")
                     commit_action = CheckAction()
                     commit_cost = 0
 
                 else:  # we have to fold
-                    print("Commit action is Fold")
+                    log.debug("Commit action is Fold")
                     commit_action = FoldAction()
                     commit_cost = 0
 
-                print()
+                log.debug()
 
-                print("###########")
+                log.debug("###########")
                 if board_cont_cost > 0: #our opp raised!!! we must respond
-                    print("Opponent has raised. We must respond. Continue cost is", board_cont_cost)
+                    log.debug("Opponent has raised. We must respond. Continue cost is", board_cont_cost)
                     if board_cont_cost > 5: #<--- parameters to tweak.
-                        print("Continue cost > 5 so we are intimidated.")
+                        log.debug("Continue cost > 5 so we are intimidated.")
                         _INTIMIDATION = 0.15
                         strength = max([0, strength - _INTIMIDATION]) #if our opp raises a lot, be cautious!
-                        print("New strength is", strength)
+                        log.debug("New strength is", strength)
 
 
                     pot_odds = board_cont_cost / (pot_total + board_cont_cost)
-                    print("Pot odds are", pot_odds)
-                    print("Strength is", strength)
+                    log.debug("Pot odds are", pot_odds)
+                    log.debug("Strength is", strength)
 
                     if strength >= pot_odds: #Positive Expected Value!! at least call!!
-                        print("Positive EV because strength >= pot odds")
+                        log.debug("Positive EV because strength >= pot odds")
 
                         if strength > 0.5 and random.random() < strength: #raise sometimes, more likely if our hand is strong
-                            print("High strength, so we then CommitAction with probability strength, costing", commit_cost)
-                            print("CommitActioning")
+                            log.debug("High strength, so we then CommitAction with probability strength, costing", commit_cost)
+                            log.debug("CommitActioning")
                             my_actions[i] = commit_action
                             net_cost += commit_cost
 
                         else:  # try to call if we don't raise
-                            print("We'll just call because because not that high strength and outside of probability strength")
+                            log.debug("We'll just call because because not that high strength and outside of probability strength")
                             if (board_cont_cost <= my_stack - net_cost):  # we call because we can afford it and it's +EV
-                                print("Calling, costing", board_cont_cost)
+                                log.debug("Calling, costing", board_cont_cost)
                                 my_actions[i] = CallAction()
                                 net_cost += board_cont_cost
 
                             else:  # we can't afford to call :(  should have managed our stack better
-                                print("Wanted to call but can't, Folding")
+                                log.debug("Wanted to call but can't, Folding")
                                 my_actions[i] = FoldAction()
                                 net_cost += 0
                     
                     else: #Negative Expected Value!!! FOLD!!!
-                        print("Negative EV, so folding")
+                        log.debug("Negative EV, so folding")
                         my_actions[i] = FoldAction()
                         net_cost += 0
                 
                 else: #board_cont_cost == 0, we control the action
-                    print("We control the action.")
+                    log.debug("We control the action.")
 
                     if random.random() < strength: #raise sometimes, more likely if our hand is strong
-                        print("We CommitAction with probability strength, costing", commit_cost)
-                        print("CommitActioning")
+                        log.debug("We CommitAction with probability strength, costing", commit_cost)
+                        log.debug("CommitActioning")
                         my_actions[i] = commit_action
                         net_cost += commit_cost
 
                     else: #just check otherwise
-                        print("Outside probability strength, so just Checking")
+                        log.debug("Outside probability strength, so just Checking")
                         my_actions[i] = CheckAction()
                         net_cost += 0
-                print("###########")
+                log.debug("###########")
 
-            print()
-            print("Done with this board")
-            print()
+            log.debug()
+            log.debug("Done with this board")
+            log.debug()
 
-        print("At end of action, stack size is", my_stack - net_cost)
-        print("Done with this action")
-        print()
-        print()
+        log.debug("At end of action, stack size is", my_stack - net_cost)
+        log.debug("Done with this action")
+        log.debug()
+        log.debug()
 
         return my_actions
 
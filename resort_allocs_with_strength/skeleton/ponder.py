@@ -0,0 +1,88 @@
+'''
+Pondering worker, which runs a pokerbot's speculative work in a forked process while the engine waits on the opponent.
+'''
+import multiprocessing
+import os
+
+
+def serve(pokerbot, connection, parent_connection):
+    '''
+    Runs in the worker process. Calls pokerbot.ponder for each task in the newest list received, most useful first,
+    and sends back each result under its task's key and the round it was asked for. A new list replaces the tasks not yet started.
+    '''
+    parent_connection.close()  # so that the worker sees end of file once the pokerbot exits
+    os.nice(10)  # the pokerbot's own decisions come first when both want the CPU
+    tasks = []
+    round_num = 0
+    while True:
+        if not tasks or connection.poll():
+            try:
+                round_num, tasks = connection.recv()
+            except (EOFError, OSError):
+                return
+            tasks.reverse()
+            continue
+        key, args = tasks.pop()
+        try:
+            connection.send((round_num, key, pokerbot.ponder(*args)))
+        except (BrokenPipeError, OSError):
+            return
+
+
+class Ponderer():
+    '''
+    Handle on a pondering worker forked from a pokerbot, and the results it has sent back for the current round.
+    The worker has its own copy of the pokerbot, taken when it was started.
+    '''
+
+    def __init__(self, pokerbot):
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.get_context('fork').Process(target=serve, args=(pokerbot, child_connection, self.connection), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.results = {}
+        # counts calls to clear, so results of tasks from an earlier round can be told apart and dropped
+        self.round_num = 0
+
+    def collect(self):
+        '''
+        Stores the results the worker has sent back since the last call, dropping those from earlier rounds.
+        '''
+        try:
+            while self.connection.poll():
+                round_num, key, value = self.connection.recv()
+                if round_num == self.round_num:
+                    self.results[key] = value
+        except (EOFError, OSError):
+            pass
+
+    def submit(self, tasks):
+        '''
+        Replaces the worker's unstarted tasks with tasks, a list of (key, args) pairs, skipping keys already done.
+        '''
+        self.collect()
+        try:
+            self.connection.send((self.round_num, [(key, args) for key, args in tasks if key not in self.results]))
+        except (BrokenPipeError, OSError):
+            pass
+
+    def get(self, key, default=None):
+        '''
+        Returns the result of the task with key if the worker has finished it, or default.
+        '''
+        self.collect()
+        return self.results.get(key, default)
+
+    def clear(self):
+        '''
+        Cancels the worker's unstarted tasks and forgets every result, including those of tasks still running.
+        '''
+        self.round_num += 1
+        self.results.clear()
+        self.submit([])
+
+    def stop(self):
+        self.connection.close()
+        self.process.join(1.)
+        if self.process.is_alive():
+            self.process.terminate()
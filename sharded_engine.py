@@ -0,0 +1,132 @@
+'''
+Plays one seeded match between the two pokerbots in config.py as several shorter shards on a pool of worker processes.
+Shard k plays its own consecutive block of rounds, dealt exactly as in the full match, with fresh pokerbots
+and its share of the game clock. The shards' game logs are merged into one log for the whole match.
+Pokerbots see each shard as a game of its own starting from round 1, so only per-round results carry over.
+'''
+from contextlib import redirect_stdout
+import multiprocessing
+import statistics
+import argparse
+import random
+import re
+import sys
+import os
+
+sys.path.append(os.getcwd())
+import engine
+from engine_multi_games import init_worker, start_players, build_players
+from config import *
+
+NAMES = '|'.join(re.escape(name) for name in (PLAYER_1_NAME, PLAYER_2_NAME))
+BANKROLL = re.compile(', ({}) \\((-?\\d+)\\)'.format(NAMES))
+
+
+def make_shards(shard_num, out_dir, seed):
+    '''
+    Splits NUM_ROUNDS into shard_num blocks. Returns one (shard number, directory, seed, first round, number of rounds) task per shard.
+    '''
+    tasks = []
+    first_round = 1
+    for i in range(shard_num):
+        num_rounds = NUM_ROUNDS // shard_num + (i < NUM_ROUNDS % shard_num)
+        if num_rounds > 0:
+            tasks.append((i + 1, os.path.join(out_dir, 'shard_{}'.format(i + 1)), seed, first_round, num_rounds))
+        first_round += num_rounds
+    return tasks
+
+
+def play_shard(task):
+    '''
+    Runs one shard in its own directory with freshly started pokerbots. Returns the task and the final bankrolls.
+    '''
+    shard, match_dir, seed, first_round, num_rounds = task
+    os.makedirs(match_dir, exist_ok=True)
+    os.chdir(match_dir)
+    config = engine.DEFAULT_CONFIG._replace(num_rounds=num_rounds, starting_game_clock=STARTING_GAME_CLOCK * num_rounds / NUM_ROUNDS)
+    # the first player sits in the first seat on odd rounds of the full match
+    swap_seats = (first_round % 2 == 0)
+    with open('engine_output.txt', 'w') as output, redirect_stdout(output):
+        players = start_players(config)
+        try:
+            bankrolls = engine.Game(seed, swap_seats, config=config, first_round=first_round, rotate_log=False).run(players)
+        finally:
+            for player in players:
+                player.stop()
+    return task, bankrolls
+
+
+def merge_logs(tasks, out_dir):
+    '''
+    Joins the shards' game logs into one log, offsetting each shard's bankrolls by those won in earlier shards.
+    Returns the merged log's name and each player's result in every round.
+    '''
+    opener, extension = engine.GAME_LOG_OPENERS[GAME_LOG_COMPRESSION]
+    offsets = {PLAYER_1_NAME: 0, PLAYER_2_NAME: 0}
+    starts = []  # each round's bankrolls at its start
+    offset_bankroll = lambda match: ', {} ({})'.format(match.group(1), int(match.group(2)) + offsets[match.group(1)])
+    with opener(os.path.join(out_dir, GAME_LOG_FILENAME + extension), 'wt') as merged:
+        for shard, match_dir, _, _, _ in sorted(tasks):
+            with opener(os.path.join(match_dir, GAME_LOG_FILENAME + extension), 'rt') as shard_log:
+                lines = shard_log.read().split('\n')
+            end = next(i for i, line in enumerate(lines) if line.startswith('Final'))
+            if shard == 1:
+                merged.write(lines[0])
+            for line in lines[1:end-1]:  # the line before Final is blank
+                if line.startswith('Round #'):
+                    line = BANKROLL.sub(offset_bankroll, line)
+                    starts.append({name: int(bankroll) for name, bankroll in BANKROLL.findall(line)})
+                merged.write('\n' + line)
+            final = {name: int(bankroll) for name, bankroll in BANKROLL.findall(lines[end])}
+            for name in offsets:
+                offsets[name] += final[name]
+        merged.write('\n\nFinal' + ''.join(engine.PVALUE(name, offsets[name]) for name in (PLAYER_1_NAME, PLAYER_2_NAME)))
+    ends = starts[1:] + [offsets]
+    deltas = [{name: end[name] - start[name] for name in offsets} for start, end in zip(starts, ends)]
+    return merged.name, deltas
+
+
+def run_sharded(shard_num, workers, out_dir, seed=SEED):
+    '''
+    Plays one match as shard_num shards on a pool of workers and prints the merged result and per-round statistics.
+    '''
+    if seed is None:
+        seed = random.randrange(2**32)  # every shard must deal from the same match
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = make_shards(shard_num, out_dir, seed)
+    paths = (os.path.abspath(PLAYER_1_PATH), os.path.abspath(PLAYER_2_PATH))
+    commands = build_players(paths, out_dir)
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=paths + (commands,)) as pool:
+        for task, bankrolls in pool.imap_unordered(play_shard, tasks):
+            print('Shard {} (rounds {}-{}) finished'.format(task[0], task[3], task[3] + task[4] - 1)
+                  + ''.join([engine.PVALUE(name, bankrolls[name]) for name in (PLAYER_1_NAME, PLAYER_2_NAME)]))
+        pool.close()
+        pool.join()
+    log_name, deltas = merge_logs(tasks, out_dir)
+    print()
+    print('Merged', len(tasks), 'shards of seed', seed, 'into', log_name)
+    summary = {}
+    for name in (PLAYER_1_NAME, PLAYER_2_NAME):
+        results = [delta[name] for delta in deltas]
+        stdev = statistics.stdev(results) if len(results) > 1 else 0.
+        summary[name] = {'total': sum(results), 'mean': statistics.mean(results), 'stderr': stdev / len(results) ** 0.5}
+        print('{} total: {}, per round mean: {:.3f}, stderr: {:.3f}'.format(name, summary[name]['total'], summary[name]['mean'], summary[name]['stderr']))
+    return summary
+
+
+def parse_args():
+    '''
+    Parses arguments controlling the number of shards and how many run at once.
+    '''
+    parser = argparse.ArgumentParser(prog='python3 sharded_engine.py')
+    parser.add_argument('--shards', type=int, default=os.cpu_count(), help='Number of shards to split NUM_ROUNDS into, defaults to the CPU count')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of shards to run at once, defaults to the CPU count')
+    parser.add_argument('--out-dir', type=str, default='shards', help='Directory holding one subdirectory per shard and the merged log, defaults to shards')
+    parser.add_argument('--seed', type=int, default=SEED, help='Seed of the match, defaults to SEED in config.py or a random seed')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    run_sharded(args.shards, args.workers, args.out_dir, args.seed)
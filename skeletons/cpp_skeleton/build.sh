@@ -1,4 +1,5 @@
 #!/bin/bash
+set -e
 
 mkdir -p build
 cd build
@@ -25,6 +25,18 @@ class Player(Bot):
         '''
         pass
 
+    def handle_new_game(self):
+        '''
+        Called when the engine reuses this pokerbot for another game. Optional.
+
+        Arguments:
+        Nothing.
+
+        Returns:
+        Nothing.
+        '''
+        pass
+
     def handle_new_round(self, game_state, round_state, active):
         '''
         Called when a new round starts. Called NUM_ROUNDS times.
@@ -0,0 +1,106 @@
+'''
+Compute budget scheduler, which turns the game clock left into a number of Monte Carlo samples for each decision.
+'''
+import time
+from .states import NUM_ROUNDS, BIG_BLIND
+
+# relative share of a round's time given to one board's estimate on each street
+STREET_WEIGHTS = {0: 2., 3: 1.5, 4: 1., 5: 1.}
+
+
+class ComputeBudget():
+    '''
+    Spreads the game clock left, minus a reserve, evenly over the rounds left, and each round's share over
+    its estimates by street, pot size and closeness. The cost of a sample is learned from the estimates made,
+    so the budget follows the bot's own speed. When the clock is too low for min_samples, allot returns 0 samples
+    and the bot should use a cheap lookup instead.
+    '''
+
+    def __init__(self, min_samples=20, max_samples=1000, reserve=2., num_rounds=NUM_ROUNDS):
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.reserve = reserve
+        self.num_rounds = num_rounds
+        self.seconds_per_weight = 0.
+        # weight of the estimates made in a typical round, and in this one so far
+        self.round_weight = 3 * sum(STREET_WEIGHTS.values())
+        self.weight_so_far = 0.
+        self.typical_pot = 6 * BIG_BLIND
+        # running means of samples, seconds, samples squared and samples times seconds, for cost = fixed + per_sample * samples
+        self.moments = None
+
+    def start_round(self, game_state):
+        '''
+        Shares the clock left among the rounds left. Call it from handle_new_round.
+        '''
+        if self.weight_so_far > 0.:
+            self.round_weight = 0.9 * self.round_weight + 0.1 * self.weight_so_far
+        self.weight_so_far = 0.
+        rounds_left = max(1, self.num_rounds - game_state.round_num + 1)
+        seconds = max(0., game_state.game_clock - self.reserve) / rounds_left
+        self.seconds_per_weight = seconds / self.round_weight
+
+    def cost(self, samples):
+        '''
+        Returns the predicted seconds taken by an estimate with this many samples.
+        '''
+        if self.moments is None:
+            return 50e-6 * samples
+        mean_samples, mean_seconds, mean_squares, mean_products = self.moments
+        variance = mean_squares - mean_samples ** 2
+        if variance < 1.:  # every estimate used about the same number of samples
+            return mean_seconds * samples / max(mean_samples, 1.)
+        per_sample = max(0., (mean_products - mean_samples * mean_seconds) / variance)
+        fixed = max(0., mean_seconds - per_sample * mean_samples)
+        return fixed + per_sample * samples
+
+    def allot(self, street, pot, prior=None):
+        '''
+        Returns the number of samples and seconds to spend on one board's estimate this street, or 0 samples if the clock is too low.
+        Bigger pots get more samples, and so do estimates whose prior, such as the last street's win probability, is close to 1/2.
+        '''
+        weight = STREET_WEIGHTS.get(street, 1.)
+        self.weight_so_far += weight
+        self.typical_pot = 0.95 * self.typical_pot + 0.05 * pot
+        importance = min(3., max(.5, pot / self.typical_pot))
+        if prior is not None:
+            importance *= 1.5 - min(1., 2 * abs(prior - .5))
+        seconds = self.seconds_per_weight * weight * importance
+        if seconds < self.cost(self.min_samples):
+            return 0, seconds
+        low, high = self.min_samples, self.max_samples
+        while low < high:  # the most samples whose predicted cost fits
+            middle = (low + high + 1) // 2
+            if self.cost(middle) <= seconds:
+                low = middle
+            else:
+                high = middle - 1
+        return low, seconds
+
+    def record(self, samples, seconds):
+        '''
+        Learns the cost of samples from an estimate which took seconds.
+        '''
+        point = (samples, seconds, samples * samples, samples * seconds)
+        if self.moments is None:
+            self.moments = point
+        else:
+            self.moments = tuple(0.9 * mean + 0.1 * value for mean, value in zip(self.moments, point))
+
+    def estimate(self, sampler, street, pot, prior=None, fallback=None):
+        '''
+        Calls sampler with the number of samples this estimate can afford and a deadline twice its share of time away,
+        after which an anytime sampler should stop, and records how long it took. A result with a samples field, such as
+        an equity.Estimate, is recorded with the samples it actually used. Returns fallback instead if the clock is too low,
+        or samples with min_samples and no deadline if there is no fallback.
+        '''
+        samples, seconds = self.allot(street, pot, prior)
+        start_time = time.perf_counter()
+        deadline = start_time + 2 * seconds
+        if samples == 0:
+            if fallback is not None:
+                return fallback
+            samples, deadline = self.min_samples, None
+        result = sampler(samples, deadline)
+        self.record(getattr(result, 'samples', samples), time.perf_counter() - start_time)
+        return result
@@ -2,12 +2,22 @@
 The infrastructure for interacting with the engine.
 '''
 import argparse
-import socket
 from .actions import FoldAction, CallAction, CheckAction, RaiseAction, AssignAction
 from .states import GameState, TerminalState, RoundState, BoardState
 from .states import STARTING_STACK, BIG_BLIND, SMALL_BLIND, NUM_BOARDS
 from .bot import Bot
+from .transport import connect
+from .ponder import Ponderer
 
+# the highest engine protocol version this runner understands
+PROTOCOL_VERSION = 3
+# the stacks every round starts from, copied for each round
+NEW_ROUND_STACKS = [STARTING_STACK - NUM_BOARDS*SMALL_BLIND, STARTING_STACK - NUM_BOARDS*BIG_BLIND]
+BOARD_PREFIXES = [str(i+1) for i in range(NUM_BOARDS)]
+CODES = {FoldAction: 'F', CallAction: 'C', CheckAction: 'K'}
+# decoded betting clauses such as '1K;2C;3R12', which repeat across messages and rounds
+ACTION_CACHE = {}
+ACTION_CACHE_SIZE = 1 << 16
 
 class Runner():
     '''
@@ -34,16 +44,14 @@ class Runner():
         '''
         codes = [''] * NUM_BOARDS
         for i in range(NUM_BOARDS):
-            if isinstance(actions[i], AssignAction):
-                codes[i] = str(i+1) + 'A' + ','.join(actions[i].cards)
-            elif isinstance(actions[i], FoldAction):
-                codes[i] = str(i+1) + 'F'
-            elif isinstance(actions[i], CallAction):
-                codes[i] = str(i+1) + 'C'
-            elif isinstance(actions[i], CheckAction):
-                codes[i] = str(i+1) + 'K'
+            action = actions[i]
+            code = CODES.get(type(action))
+            if code is not None:
+                codes[i] = BOARD_PREFIXES[i] + code
+            elif isinstance(action, AssignAction):
+                codes[i] = BOARD_PREFIXES[i] + 'A' + ','.join(action.cards)
             else:  # isinstance(action, RaiseAction)
-                codes[i] = str(i+1) + 'R' + str(actions[i].amount)
+                codes[i] = BOARD_PREFIXES[i] + 'R' + str(action.amount)
         code = ';'.join(codes)
         self.socketfile.write(code + '\n')
         self.socketfile.flush()
@@ -57,25 +65,29 @@ class Runner():
         active = 0
         round_flag = True
         for packet in self.receive():
-            for clause in packet:
-                if clause[0] == 'T':
+            version = None
+            for clause in packet:  # ordered by how often each clause is sent
+                code = clause[0]
+                if code == 'T':
                     game_state = GameState(game_state.bankroll, game_state.opp_bankroll, float(clause[1:]), game_state.round_num)
-                elif clause[0] == 'P':
+                elif code == '1':
+                    round_state = parse_multi_code(clause, round_state, active)
+                elif code == 'P':
                     active = int(clause[1:])
-                elif clause[0] == 'H':
+                elif code == 'H':
                     cards = clause[1:].split(',')
                     hands = [[], []]
                     hands[active] = cards
                     hands[1-active] = ['']*(2*NUM_BOARDS)
-                    deck = ["", "", "", "", ""]
-                    pips = [SMALL_BLIND, BIG_BLIND]
-                    board_states = [BoardState((i+1)*BIG_BLIND, pips, [[]]*2, deck, None) for i in range(NUM_BOARDS)]
-                    stacks = [STARTING_STACK - NUM_BOARDS*SMALL_BLIND, STARTING_STACK - NUM_BOARDS*BIG_BLIND]
-                    round_state = RoundState(-2, 0, stacks, hands, board_states, None)
+                    # built fresh each round, so that a bot which changes its states in place can't change later rounds
+                    board_states = [BoardState((i+1)*BIG_BLIND, [SMALL_BLIND, BIG_BLIND], [[], []], ["", "", "", "", ""], None) for i in range(NUM_BOARDS)]
+                    round_state = RoundState(-2, 0, list(NEW_ROUND_STACKS), hands, board_states, None)
                     if round_flag:
+                        if self.pokerbot.ponderer is not None:  # last round's results can never be asked for again
+                            self.pokerbot.ponderer.clear()
                         self.pokerbot.handle_new_round(game_state, round_state, active)
                         round_flag = False
-                elif clause[0] == 'D':
+                elif code == 'D':
                     assert isinstance(round_state, TerminalState)
                     subclauses = clause.split(';')
                     delta = int(subclauses[0][1:])
@@ -88,16 +100,26 @@ class Runner():
                     self.pokerbot.handle_round_over(game_state, round_state, active)
                     game_state = GameState(game_state.bankroll, game_state.opp_bankroll, game_state.game_clock, game_state.round_num + 1)
                     round_flag = True
-                elif clause[0] == 'Q':
+                elif code == 'Q':
                     return
-                elif clause[0] == '1':
-                    round_state = parse_multi_code(clause, round_state, active)
-            if round_flag:  # ack the engine
+                elif code == 'V':
+                    version = min(int(clause[1:]), PROTOCOL_VERSION)
+                elif code == 'N':
+                    game_state = GameState(0, 0, 0., 1)
+                    round_state = None
+                    round_flag = True
+                    self.pokerbot.handle_new_game()
+            if version is not None:  # agree on a protocol version with the engine
+                self.socketfile.write('V' + str(version) + '\n')
+                self.socketfile.flush()
+            elif round_flag:  # ack the engine
                 self.send([CheckAction()]*NUM_BOARDS)
             else:
                 assert active == round_state.button % 2
                 actions = self.pokerbot.get_actions(game_state, round_state, active)
                 self.send(actions)
+                if self.pokerbot.ponderer is not None:
+                    self.pokerbot.ponderer.submit(self.pokerbot.ponder_tasks(game_state, round_state, active))
 
 
 def parse_multi_code(clause, round_state, active):
@@ -135,25 +157,41 @@ def parse_multi_code(clause, round_state, active):
         round_state = RoundState(round_state.button, round_state.street, round_state.stacks, round_state.hands, new_board_states, round_state.previous_state)
         return TerminalState([0, 0], round_state)
     else:
-        actions = [None] * NUM_BOARDS
-        for i in range(NUM_BOARDS):
-            subclause = subclauses[i]
-            leftover = subclause[2:]
-            if subclause[1] == 'F':
-                actions[i] = FoldAction()
-            elif subclause[1] == 'C':
-                actions[i] = CallAction()
-            elif subclause[1] == 'K':
-                actions[i] = CheckAction()
-            elif subclause[1] == 'R':
-                actions[i] = RaiseAction(int(leftover))
-            elif subclause[1] == 'A':
-                cards = leftover.split(',')
-                if leftover == "":
-                    actions[i] = AssignAction(["", ""])
-                else:
-                    actions[i] = AssignAction(cards)
-        return round_state.proceed(actions)
+        return round_state.proceed(decode_actions(clause, subclauses))
+
+def decode_actions(clause, subclauses):
+    '''
+    Decodes the actions of one clause, looking up betting clauses decoded before.
+    Assignments hold card lists, which the states share, so they are decoded afresh every time.
+    '''
+    actions = ACTION_CACHE.get(clause)
+    if actions is not None:
+        return actions
+    actions = [None] * NUM_BOARDS
+    cacheable = True
+    for i in range(NUM_BOARDS):
+        subclause = subclauses[i]
+        leftover = subclause[2:]
+        if subclause[1] == 'F':
+            actions[i] = FoldAction()
+        elif subclause[1] == 'C':
+            actions[i] = CallAction()
+        elif subclause[1] == 'K':
+            actions[i] = CheckAction()
+        elif subclause[1] == 'R':
+            actions[i] = RaiseAction(int(leftover))
+        elif subclause[1] == 'A':
+            cacheable = False
+            cards = leftover.split(',')
+            if leftover == "":
+                actions[i] = AssignAction(["", ""])
+            else:
+                actions[i] = AssignAction(cards)
+    if cacheable:
+        if len(ACTION_CACHE) >= ACTION_CACHE_SIZE:
+            ACTION_CACHE.clear()
+        ACTION_CACHE[clause] = actions = tuple(actions)
+    return actions
 
 def parse_args():
     '''
@@ -161,7 +199,9 @@ def parse_args():
     '''
     parser = argparse.ArgumentParser(prog='python3 player.py')
     parser.add_argument('--host', type=str, default='localhost', help='Host to connect to, defaults to localhost')
-    parser.add_argument('port', type=int, help='Port on host to connect to')
+    parser.add_argument('port', type=int, nargs='?', help='Port on host to connect to')
+    parser.add_argument('--unix', type=str, help='Unix domain socket to connect to instead of a port')
+    parser.add_argument('--framing', choices=['line', 'length'], default='line', help='Message framing, defaults to line')
     return parser.parse_args()
 
 def run_bot(pokerbot, args):
@@ -169,13 +209,18 @@ def run_bot(pokerbot, args):
     Runs the pokerbot.
     '''
     assert isinstance(pokerbot, Bot)
+    if pokerbot.PONDER:  # forked before connecting, so the worker holds no engine socket
+        pokerbot.ponderer = Ponderer(pokerbot)
     try:
-        sock = socket.create_connection((args.host, args.port))
+        sock, socketfile = connect(args)
     except OSError:
-        print('Could not connect to {}:{}'.format(args.host, args.port))
+        print('Could not connect to {}'.format(args.unix or '{}:{}'.format(args.host, args.port)))
+        if pokerbot.ponderer is not None:
+            pokerbot.ponderer.stop()
         return
-    socketfile = sock.makefile('rw')
     runner = Runner(pokerbot, socketfile)
     runner.run()
     socketfile.close()
     sock.close()
+    if pokerbot.ponderer is not None:
+        pokerbot.ponderer.stop()
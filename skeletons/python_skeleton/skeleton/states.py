@@ -13,7 +13,10 @@ BIG_BLIND = 2
 SMALL_BLIND = 1
 NUM_BOARDS = 3
 
-class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'previous_state', 'settled', 'reveal'], defaults=[False, True])):
+MatchConfig = namedtuple('MatchConfig', ['num_boards', 'num_rounds', 'starting_stack', 'big_blind', 'small_blind'])
+DEFAULT_CONFIG = MatchConfig(NUM_BOARDS, NUM_ROUNDS, STARTING_STACK, BIG_BLIND, SMALL_BLIND)
+
+class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'previous_state', 'settled', 'reveal', 'config'], defaults=[False, True, DEFAULT_CONFIG])):
     '''
     Encodes the game tree for one board within a round.
     '''
@@ -51,7 +54,7 @@ class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'pre
         active = button % 2
         continue_cost = self.pips[1-active] - self.pips[active]
         max_contribution = min(stacks[active], stacks[1-active] + continue_cost)
-        min_contribution = min(max_contribution, continue_cost + max(continue_cost, BIG_BLIND))
+        min_contribution = min(max_contribution, continue_cost + max(continue_cost, self.config.big_blind))
         return (self.pips[active] + min_contribution, self.pips[active] + max_contribution)
 
     def proceed(self, action, button, street):
@@ -65,32 +68,32 @@ class BoardState(namedtuple('_BoardState', ['pot', 'pips', 'hands', 'deck', 'pre
             if self.hands is not None:
                 opp_hands = self.hands[1-active]
                 new_hands[1-active] = opp_hands
-            return BoardState(self.pot, self.pips, new_hands, self.deck, self)
+            return BoardState(self.pot, self.pips, new_hands, self.deck, self, config=self.config)
         if isinstance(action, FoldAction):
             new_pot = self.pot + sum(self.pips)
             winnings = [0, new_pot] if active == 0 else [new_pot, 0]
-            return TerminalState(winnings, BoardState(new_pot, [0, 0], self.hands, self.deck, self, True, False))
+            return TerminalState(winnings, BoardState(new_pot, [0, 0], self.hands, self.deck, self, True, False, self.config))
         if isinstance(action, CallAction):
             if button == 0: # sb calls bb
-                return BoardState(self.pot, [BIG_BLIND] * 2, self.hands, self.deck, self)
+                return BoardState(self.pot, [self.config.big_blind] * 2, self.hands, self.deck, self, config=self.config)
             # both players acted
             new_pips = list(self.pips)
             contribution = new_pips[1-active] - new_pips[active]
             new_pips[active] += contribution
-            return BoardState(self.pot, new_pips, self.hands, self.deck, self, True)
+            return BoardState(self.pot, new_pips, self.hands, self.deck, self, True, config=self.config)
         if isinstance(action, CheckAction):
             if (street == 0 and button > 0) or button > 1:  # both players acted
-                return BoardState(self.pot, self.pips, self.hands, self.deck, self, True, self.reveal)
+                return BoardState(self.pot, self.pips, self.hands, self.deck, self, True, self.reveal, self.config)
             # let opponent act
-            return BoardState(self.pot, self.pips, self.hands, self.deck, self, self.settled, self.reveal)
+            return BoardState(self.pot, self.pips, self.hands, self.deck, self, self.settled, self.reveal, self.config)
         # isinstance(action, RaiseAction)
         new_pips = list(self.pips)
         contribution = action.amount - new_pips[active]
         new_pips[active] += contribution
-        return BoardState(self.pot, new_pips, self.hands, self.deck, self)
+        return BoardState(self.pot, new_pips, self.hands, self.deck, self, config=self.config)
 
 
-class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands', 'board_states', 'previous_state'])):
+class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands', 'board_states', 'previous_state', 'config'], defaults=[DEFAULT_CONFIG])):
     '''
     Encodes the game tree for one round of poker.
     '''
@@ -99,7 +102,7 @@ class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands
         Compares the players' hands and computes payoffs.
         '''
         terminal_board_states = [board_state.showdown() if isinstance(board_state, BoardState) else board_state for board_state in self.board_states]
-        return TerminalState([0, 0], RoundState(self.button, self.street, self.stacks, self.hands, terminal_board_states, self))
+        return TerminalState([0, 0], RoundState(self.button, self.street, self.stacks, self.hands, terminal_board_states, self, self.config))
 
 
     def legal_actions(self):
@@ -125,29 +128,29 @@ class RoundState(namedtuple('_RoundState', ['button', 'street', 'stacks', 'hands
         '''
         Resets the players' pips on each board and advances the game tree to the next round of betting.
         '''
-        new_pots = [0]*NUM_BOARDS
-        for i in range(NUM_BOARDS):
+        new_pots = [0]*self.config.num_boards
+        for i in range(self.config.num_boards):
             if isinstance(self.board_states[i], BoardState):
                 new_pots[i] = self.board_states[i].pot + sum(self.board_states[i].pips)
-        new_board_states = [BoardState(new_pots[i], [0, 0], self.board_states[i].hands, self.board_states[i].deck, self.board_states[i]) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(NUM_BOARDS)]
+        new_board_states = [BoardState(new_pots[i], [0, 0], self.board_states[i].hands, self.board_states[i].deck, self.board_states[i], config=self.config) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(self.config.num_boards)]
         all_terminal = [isinstance(board_state, TerminalState) for board_state in new_board_states]
         if self.street == 5 or all(all_terminal):
-            return RoundState(self.button, 5, self.stacks, self.hands, new_board_states, self).showdown()
+            return RoundState(self.button, 5, self.stacks, self.hands, new_board_states, self, self.config).showdown()
         new_street = 3 if self.street == 0 else self.street + 1        
-        return RoundState(1, new_street, self.stacks, self.hands, new_board_states, self)
+        return RoundState(1, new_street, self.stacks, self.hands, new_board_states, self, self.config)
 
     def proceed(self, actions):
         '''
         Advances the game tree by one tuple of actions performed by the active player across all boards.
         '''
-        new_board_states = [self.board_states[i].proceed(actions[i], self.button, self.street) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(NUM_BOARDS)]
+        new_board_states = [self.board_states[i].proceed(actions[i], self.button, self.street) if isinstance(self.board_states[i], BoardState) else self.board_states[i] for i in range(self.config.num_boards)]
         active = self.button % 2
         new_stacks = list(self.stacks)
         contribution = 0
-        for i in range(NUM_BOARDS):
+        for i in range(self.config.num_boards):
             if isinstance(new_board_states[i], BoardState) and isinstance(self.board_states[i], BoardState):
                 contribution += new_board_states[i].pips[active] - self.board_states[i].pips[active]
         new_stacks[active] -= contribution
         settled = [(isinstance(board_state, TerminalState) or board_state.settled) for board_state in new_board_states]
-        state = RoundState(self.button + 1, self.street, new_stacks, self.hands, new_board_states, self)
+        state = RoundState(self.button + 1, self.street, new_stacks, self.hands, new_board_states, self, self.config)
         return state.proceed_street() if all(settled) else state
@@ -0,0 +1,243 @@
+'''
+Compact round state for fast simulation and search.
+Unlike RoundState, CompactRoundState is updated in place with make and restored with unmake,
+so a playout allocates no new states and keeps no previous_state chain.
+'''
+from array import array
+import eval7
+from .actions import FoldAction, CallAction, CheckAction, RaiseAction, AssignAction
+from .states import TerminalState, DEFAULT_CONFIG
+
+
+class CompactRoundState():
+    '''
+    Encodes one round of poker in flat arrays. Board i's pips are pips[2*i] and pips[2*i+1],
+    and the cards a player assigned to board i are hands[2*i+player].
+    Legal actions, raise bounds and payoffs are identical to RoundState's.
+    '''
+    __slots__ = ['config', 'button', 'street', 'stacks', 'pips', 'pots', 'settled', 'folded', 'winnings', 'hands', 'boards', 'deltas', 'history']
+
+    def __init__(self, boards=None, history=True, config=DEFAULT_CONFIG):
+        '''
+        Starts a round after the blinds are posted. boards holds the five eval7.Card's of each board,
+        which are only needed to compute payoffs at showdown. history=False saves the cost of recording
+        undo information, but then unmake cannot be used. Each undo record holds the button, the street,
+        the mover's stack and the old values of only the boards the move changed.
+        '''
+        self.config = config
+        num_boards = config.num_boards
+        self.button = -2
+        self.street = 0
+        self.stacks = array('i', [config.starting_stack - num_boards*config.small_blind, config.starting_stack - num_boards*config.big_blind])
+        self.pips = array('i', [config.small_blind, config.big_blind] * num_boards)
+        self.pots = array('i', [(i+1)*config.big_blind for i in range(num_boards)])
+        self.settled = bytearray(num_boards)
+        self.folded = bytearray(num_boards)
+        self.winnings = array('i', [0, 0] * num_boards)
+        self.hands = [None] * (2*num_boards)
+        self.boards = boards
+        self.deltas = None
+        self.history = [] if history else None
+
+    @classmethod
+    def from_round_state(cls, round_state, boards=None, history=True):
+        '''
+        Copies a RoundState, such as the one passed to get_actions, into a new CompactRoundState.
+        '''
+        state = cls(boards, history, round_state.config)
+        state.button = round_state.button
+        state.street = round_state.street
+        state.stacks[0], state.stacks[1] = round_state.stacks
+        for i, board_state in enumerate(round_state.board_states):
+            if isinstance(board_state, TerminalState):
+                state.winnings[2*i], state.winnings[2*i+1] = board_state.deltas
+                state.pips[2*i] = state.pips[2*i+1] = 0
+                state.folded[i] = 1
+                state.settled[i] = 1
+                board_state = board_state.previous_state
+            else:
+                state.pips[2*i], state.pips[2*i+1] = board_state.pips
+                state.settled[i] = board_state.settled
+            state.pots[i] = board_state.pot
+            if board_state.hands is not None:
+                for player in range(2):
+                    state.hands[2*i+player] = board_state.hands[player] or None
+        return state
+
+    @property
+    def is_terminal(self):
+        return self.deltas is not None
+
+    def board_legal_actions(self, i):
+        '''
+        Returns a set which corresponds to the active player's legal moves on board i.
+        '''
+        active = self.button % 2
+        if self.folded[i]:
+            return {CheckAction}
+        if self.hands[2*i+active] is None:
+            return {AssignAction}
+        if self.settled[i]:
+            return {CheckAction}
+        continue_cost = self.pips[2*i+1-active] - self.pips[2*i+active]
+        if continue_cost == 0:
+            bets_forbidden = (self.stacks[0] == 0 or self.stacks[1] == 0)
+            return {CheckAction} if bets_forbidden else {CheckAction, RaiseAction}
+        raises_forbidden = (continue_cost == self.stacks[active] or self.stacks[1-active] == 0)
+        return {FoldAction, CallAction} if raises_forbidden else {FoldAction, CallAction, RaiseAction}
+
+    def legal_actions(self):
+        '''
+        Returns a list of sets which correspond to the active player's legal moves on each board.
+        '''
+        return [self.board_legal_actions(i) for i in range(self.config.num_boards)]
+
+    def board_raise_bounds(self, i):
+        '''
+        Returns a tuple of the minimum and maximum legal raises on board i.
+        '''
+        active = self.button % 2
+        continue_cost = self.pips[2*i+1-active] - self.pips[2*i+active]
+        max_contribution = min(self.stacks[active], self.stacks[1-active] + continue_cost)
+        min_contribution = min(max_contribution, continue_cost + max(continue_cost, self.config.big_blind))
+        return (self.pips[2*i+active] + min_contribution, self.pips[2*i+active] + max_contribution)
+
+    def raise_bounds(self):
+        '''
+        Returns a tuple of the minimum and maximum legal raises summed across boards.
+        '''
+        active = self.button % 2
+        net_continue_cost = 0
+        net_pips_unsettled = 0
+        for i in range(self.config.num_boards):
+            if not self.settled[i]:
+                net_continue_cost += self.pips[2*i+1-active] - self.pips[2*i+active]
+                net_pips_unsettled += self.pips[2*i+active]
+        return (0, net_pips_unsettled + min(self.stacks[active], self.stacks[1-active] + net_continue_cost))
+
+    def make(self, actions):
+        '''
+        Advances the round in place by one list of actions performed by the active player across all boards.
+        The actions must be legal.
+        '''
+        button = self.button
+        active = button % 2
+        pips, pots, settled, folded = self.pips, self.pots, self.settled, self.folded
+        # whether a check ends this street's betting on its board, since both players have acted
+        check_settles = (self.street == 0 and button > 0) or button > 1
+        saved = None
+        if self.history is not None:
+            saved = []  # the boards this move changes, as they were before it
+            saved_boards = 0  # bit i is set once board i is saved
+            self.history.append((button, self.street, self.stacks[active], saved))
+        big_blind = self.config.big_blind
+        contribution = 0
+        for i in range(self.config.num_boards):
+            if folded[i]:
+                continue
+            action = actions[i]
+            action_type = type(action)
+            if saved is not None and (check_settles or action_type is not CheckAction):
+                saved.append(self.saved_board(i, active))
+                saved_boards |= 1 << i
+            if action_type is AssignAction:
+                self.hands[2*i+active] = action.cards
+                settled[i] = 0
+            elif action_type is FoldAction:
+                pot = pots[i] + pips[2*i] + pips[2*i+1]
+                pots[i] = pot
+                self.winnings[2*i+1-active] = pot
+                pips[2*i] = pips[2*i+1] = 0
+                folded[i] = 1
+                settled[i] = 1
+            elif action_type is CallAction:
+                if button == 0:  # sb calls bb
+                    contribution += big_blind - pips[2*i+active]
+                    pips[2*i] = pips[2*i+1] = big_blind
+                    settled[i] = 0
+                else:  # both players acted
+                    contribution += pips[2*i+1-active] - pips[2*i+active]
+                    pips[2*i+active] = pips[2*i+1-active]
+                    settled[i] = 1
+            elif action_type is CheckAction:
+                if check_settles:
+                    settled[i] = 1
+            else:  # RaiseAction
+                contribution += action.amount - pips[2*i+active]
+                pips[2*i+active] = action.amount
+                settled[i] = 0
+        self.stacks[active] -= contribution
+        self.button = button + 1
+        if all(settled):
+            if saved is not None:  # a new street or the showdown changes every board still in play
+                for i in range(self.config.num_boards):
+                    if not folded[i] and not saved_boards >> i & 1:
+                        saved.append(self.saved_board(i, active))
+            self.proceed_street()
+
+    def saved_board(self, i, active):
+        '''
+        Returns everything a move by active can change on board i, which must not have been folded.
+        '''
+        return (i, self.pips[2*i], self.pips[2*i+1], self.pots[i], self.settled[i],
+                self.winnings[2*i], self.winnings[2*i+1], self.hands[2*i+active])
+
+    def proceed_street(self):
+        '''
+        Resets the players' pips on each board and advances to the next round of betting, or to the showdown.
+        '''
+        for i in range(self.config.num_boards):
+            if not self.folded[i]:
+                self.pots[i] += self.pips[2*i] + self.pips[2*i+1]
+                self.pips[2*i] = self.pips[2*i+1] = 0
+                self.settled[i] = 0
+        if self.street == 5 or all(self.folded):
+            self.street = 5
+            self.showdown()
+        else:
+            self.street = 3 if self.street == 0 else self.street + 1
+            self.button = 1
+
+    def showdown(self):
+        '''
+        Compares the players' hands on each board still in play and computes the round's payoffs.
+        Boards are split evenly if their cards or either hand are unknown.
+        '''
+        net_winnings = [0, 0]
+        for i in range(self.config.num_boards):
+            if not self.folded[i]:
+                hand_0, hand_1 = self.hands[2*i], self.hands[2*i+1]
+                if self.boards is None or hand_0 is None or hand_1 is None:
+                    score_0 = score_1 = 0
+                else:
+                    score_0 = eval7.evaluate(self.boards[i][:5] + list(hand_0))
+                    score_1 = eval7.evaluate(self.boards[i][:5] + list(hand_1))
+                if score_0 > score_1:
+                    self.winnings[2*i], self.winnings[2*i+1] = self.pots[i], 0
+                elif score_0 < score_1:
+                    self.winnings[2*i], self.winnings[2*i+1] = 0, self.pots[i]
+                else:  # split the pot
+                    self.winnings[2*i] = self.winnings[2*i+1] = self.pots[i] // 2
+            net_winnings[0] += self.winnings[2*i]
+            net_winnings[1] += self.winnings[2*i+1]
+        starting_stack = self.config.starting_stack
+        self.deltas = [self.stacks[0] + net_winnings[0] - starting_stack, self.stacks[1] + net_winnings[1] - starting_stack]
+
+    def unmake(self):
+        '''
+        Undoes the last make.
+        '''
+        self.button, self.street, stack, saved = self.history.pop()
+        active = self.button % 2
+        self.stacks[active] = stack
+        pips, winnings = self.pips, self.winnings
+        for i, pip_0, pip_1, pot, settled, winnings_0, winnings_1, hand in saved:
+            pips[2*i] = pip_0
+            pips[2*i+1] = pip_1
+            self.pots[i] = pot
+            self.settled[i] = settled
+            self.folded[i] = 0  # only boards in play are saved
+            winnings[2*i] = winnings_0
+            winnings[2*i+1] = winnings_1
+            self.hands[2*i+active] = hand
+        self.deltas = None
@@ -0,0 +1,53 @@
+'''
+Connections to the engine over TCP or Unix domain sockets, with newline or length-prefixed framing.
+'''
+import socket
+import struct
+
+
+class FramedFile():
+    '''
+    Socket file which sends each message as a 4 byte length followed by the message, instead of ending it with a newline.
+    Messages are written and read as text lines, like a socket.makefile('rw').
+    '''
+    HEADER = struct.Struct('>I')
+
+    def __init__(self, sock):
+        self.file = sock.makefile('rwb')
+        self.buffer = []
+
+    def write(self, text):
+        self.buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        frames = [message.encode() for message in ''.join(self.buffer).splitlines()]
+        self.buffer = []
+        self.file.write(b''.join([self.HEADER.pack(len(frame)) + frame for frame in frames]))
+        self.file.flush()
+
+    def readline(self):
+        header = self.file.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            return ''
+        return self.file.read(self.HEADER.unpack(header)[0]).decode() + '\n'
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.file.close()
+
+
+def connect(args):
+    '''
+    Connects to the engine as described by the parsed arguments. Returns the socket and a file to read and write messages.
+    '''
+    if args.unix is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(args.unix)
+    else:
+        sock = socket.create_connection((args.host, args.port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    socketfile = FramedFile(sock) if args.framing == 'length' else sock.makefile('rw')
+    return sock, socketfile
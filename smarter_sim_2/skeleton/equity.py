@@ -0,0 +1,42 @@
+'''
+Anytime equity estimation, which stops sampling once an estimate is precise enough or its time is up.
+'''
+from collections import namedtuple
+import time
+
+Estimate = namedtuple('Estimate', ['strength', 'stderr', 'samples'])
+
+
+def standard_error(total, squares, samples):
+    '''
+    Returns the standard error of the mean of samples outcomes with the given sum and sum of squares.
+    One win and one loss are added, so a short run of identical outcomes is not taken as certain.
+    '''
+    mean = (total + 1.) / (samples + 2)
+    variance = (squares + 1.) / (samples + 2) - mean * mean
+    return (variance / samples) ** 0.5
+
+
+def anytime_estimate(outcomes, max_samples, target_stderr=None, deadline=None, batch_size=16):
+    '''
+    Averages outcomes, an iterable of results between 0 and 1 such as 1 for a win, 1/2 for a tie and 0 for a loss.
+    After every batch_size outcomes, stops if the standard error is at most target_stderr or time.perf_counter()
+    has passed deadline, and always stops after max_samples. Returns an Estimate of the mean, its standard error
+    and the number of outcomes used.
+    '''
+    total = squares = 0.
+    samples = 0
+    for outcome in outcomes:
+        total += outcome
+        squares += outcome * outcome
+        samples += 1
+        if samples >= max_samples:
+            break
+        if samples % batch_size == 0:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if target_stderr is not None and standard_error(total, squares, samples) <= target_stderr:
+                break
+    if samples == 0:
+        return Estimate(.5, .5, 0)
+    return Estimate(total / samples, standard_error(total, squares, samples), samples)
@@ -0,0 +1,74 @@
+'''
+Measures the round trip time of one engine message and reply for each transport and framing in config.py.
+The engine side uses engine.py's sockets, and the pokerbot side uses the Python skeleton's transport.
+'''
+import subprocess
+import argparse
+import time
+import sys
+import os
+
+sys.path.append(os.getcwd())
+import engine
+from config import *
+
+SKELETON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), 'skeletons', 'python_skeleton'))
+# a pokerbot which checks on every board as fast as it can
+ECHO_BOT = '''
+import sys
+sys.path.insert(0, {!r})
+from skeleton.runner import parse_args
+from skeleton.transport import connect
+sock, socketfile = connect(parse_args())
+while socketfile.readline().strip() != 'Q':
+    socketfile.write('1K;2K;3K\\n')
+    socketfile.flush()
+socketfile.close()
+'''.format(SKELETON_PATH)
+# a typical message in the middle of a round
+MESSAGE = 'T29.512 1C;2R12;3K 1K;2C;3K 1B7h,2c,Jd;2B7h,2c,Jd,As;3B9s,9d,3c\n'
+
+
+def measure(transport, framing, num_messages):
+    '''
+    Sends num_messages messages to an echo bot over one transport and framing. Returns the sorted round trip times in seconds.
+    '''
+    engine.TRANSPORT, engine.FRAMING = transport, framing
+    server_socket, address = engine.open_server()
+    with server_socket:
+        server_socket.settimeout(CONNECT_TIMEOUT)
+        server_socket.listen()
+        proc = subprocess.Popen([sys.executable, '-c', ECHO_BOT] + address)
+        client_socket, _ = server_socket.accept()
+    with client_socket:
+        socketfile = engine.open_socketfile(client_socket)
+    times = []
+    for _ in range(num_messages):
+        start_time = time.perf_counter()
+        socketfile.write(MESSAGE)
+        socketfile.flush()
+        socketfile.readline()
+        times.append(time.perf_counter() - start_time)
+    socketfile.write('Q\n')
+    socketfile.close()
+    proc.wait()
+    if transport == 'unix':
+        os.remove(address[1])
+        os.rmdir(os.path.dirname(address[1]))
+    return sorted(times)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python3 transport_benchmark.py')
+    parser.add_argument('--messages', type=int, default=20000, help='Number of round trips per transport, defaults to 20000')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    print('{:<10} {:<8} {:>9} {:>9} {:>9}'.format('transport', 'framing', 'mean us', 'p50 us', 'p99 us'))
+    for transport in ['tcp', 'unix']:
+        for framing in ['line', 'length']:
+            times = measure(transport, framing, args.messages)
+            print('{:<10} {:<8} {:>9.1f} {:>9.1f} {:>9.1f}'.format(transport, framing, 1e6 * sum(times) / len(times),
+                  1e6 * times[len(times) // 2], 1e6 * times[int(.99 * len(times))]))
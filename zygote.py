@@ -0,0 +1,203 @@
+'''
+Zygote launcher for Python pokerbots.
+A zygote is a process started once per bot directory which imports player.py and constructs its Player,
+then forks a ready copy of itself for every match instead of starting a new interpreter.
+The engine talks to each zygote over a Unix domain socket, passing the forked pokerbot's output pipe along with its arguments.
+'''
+import subprocess
+import tempfile
+import socket
+import signal
+import shutil
+import atexit
+import array
+import json
+import traceback
+import time
+import sys
+import os
+
+# zygotes started by this process, keyed by bot directory
+ZYGOTES = {}
+
+
+def can_fork(commands):
+    '''
+    Returns whether a pokerbot's run command is the standard Python one, which a zygote can stand in for.
+    '''
+    return len(commands['run']) == 2 and commands['run'][0].startswith('python') and commands['run'][1] == 'player.py'
+
+
+def send_request(sock, args, fd):
+    sock.sendmsg([json.dumps(args).encode() + b'\n'], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', [fd]))])
+
+
+def receive_request(sock):
+    fds = array.array('i')
+    data, ancdata, _, _ = sock.recvmsg(65536, socket.CMSG_LEN(fds.itemsize))
+    for _, _, cdata in ancdata:
+        fds.frombytes(cdata[:len(cdata) - len(cdata) % fds.itemsize])
+    return json.loads(data.decode()), fds[0]
+
+
+class ZygoteChild():
+    '''
+    Stands in for the subprocess.Popen of a pokerbot forked by a zygote, which is not a child of the engine.
+    '''
+
+    def __init__(self, pid, stdout):
+        self.pid = pid
+        self.stdout = stdout
+
+    def poll(self):
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return 0
+        return None
+
+    def wait(self, timeout=None):
+        end_time = None if timeout is None else time.perf_counter() + timeout
+        while self.poll() is None:
+            if end_time is not None and time.perf_counter() > end_time:
+                raise subprocess.TimeoutExpired('zygote child ' + str(self.pid), timeout)
+            time.sleep(0.01)
+        return 0
+
+    def kill(self):
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class Zygote():
+    '''
+    Starts and talks to the zygote of one bot directory.
+    '''
+
+    def __init__(self, path, python, timeout):
+        self.directory = tempfile.mkdtemp(prefix='pokerbots')
+        self.address = os.path.join(self.directory, 'zygote.sock')
+        self.log_path = os.path.join(self.directory, 'zygote.txt')
+        with open(self.log_path, 'wb') as log_file:
+            self.process = subprocess.Popen([python, os.path.abspath(__file__), 'serve', self.address],
+                                            stdout=log_file, stderr=subprocess.STDOUT, cwd=path)
+        end_time = time.perf_counter() + timeout
+        while not os.path.exists(self.address):
+            if self.process.poll() is not None or time.perf_counter() > end_time:
+                self.stop()
+                raise OSError('zygote for ' + path + ' did not start')
+            time.sleep(0.01)
+
+    def fork(self, args):
+        '''
+        Forks a pokerbot which runs with args. Returns its ZygoteChild.
+        '''
+        read_fd, write_fd = os.pipe()
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as control_socket:
+                control_socket.connect(self.address)
+                send_request(control_socket, args, write_fd)
+                pid = int(control_socket.makefile('r').readline())
+        except (OSError, ValueError):
+            os.close(read_fd)
+            raise OSError('zygote did not fork')
+        finally:
+            os.close(write_fd)
+        return ZygoteChild(pid, os.fdopen(read_fd, 'rb'))
+
+    def output(self):
+        with open(self.log_path, 'rb') as log_file:
+            return log_file.read().decode(errors='replace')
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def spawn(path, commands, args, timeout):
+    '''
+    Forks a pokerbot from the zygote of its directory, starting the zygote if needed. Returns its ZygoteChild.
+    '''
+    path = os.path.abspath(path)
+    if path not in ZYGOTES or ZYGOTES[path].process.poll() is not None:
+        ZYGOTES[path] = Zygote(path, commands['run'][0], timeout)
+    return ZYGOTES[path].fork(args)
+
+
+def stop_all():
+    '''
+    Stops every zygote started by this process.
+    '''
+    for zygote in ZYGOTES.values():
+        zygote.stop()
+    ZYGOTES.clear()
+
+
+atexit.register(stop_all)
+
+
+def serve(address):
+    '''
+    Runs a zygote in the current bot directory, forking a pokerbot for every request until the engine exits.
+    '''
+    sys.path.insert(0, os.getcwd())
+    import player
+    pokerbot = player.Player()
+    engine_pid = os.getppid()
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # forked pokerbots are reaped automatically
+    server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server_socket.bind(address + '.tmp')
+    os.rename(address + '.tmp', address)  # the engine waits for the address to appear
+    server_socket.listen()
+    server_socket.settimeout(1.)
+    while os.getppid() == engine_pid:
+        try:
+            control_socket, _ = server_socket.accept()
+        except socket.timeout:
+            continue
+        with control_socket:
+            args, fd = receive_request(control_socket)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                server_socket.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                os.dup2(fd, 1)
+                os.dup2(fd, 2)
+                os.close(fd)
+                reseed()
+                sys.argv = ['player.py'] + args
+                status = 0
+                try:
+                    player.run_bot(pokerbot, player.parse_args())
+                except BaseException:
+                    traceback.print_exc()
+                    status = 1
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(status)  # never return into the zygote's loop
+            os.close(fd)
+            control_socket.sendall((str(pid) + '\n').encode())
+
+
+def reseed():
+    '''
+    Gives a forked pokerbot its own random numbers, since it would otherwise repeat its zygote's.
+    '''
+    import random
+    random.seed()
+    if 'numpy' in sys.modules:
+        sys.modules['numpy'].random.seed()
+    if 'torch' in sys.modules:
+        sys.modules['torch'].seed()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == 'serve':
+        serve(sys.argv[2])